@@ -0,0 +1,3 @@
+"""
+Benchmarks de ingestão do typesense_dgb com dados sintéticos.
+"""
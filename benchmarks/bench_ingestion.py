@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark das etapas de ingestão do typesense_dgb com dados sintéticos.
+
+Mede, para cada etapa, documentos por segundo e pico de memória alocada pelo
+Python (tracemalloc): processamento do dataset, preparação linha a linha,
+colunar e Arrow, serialização JSONL e indexação completa contra um cliente
+falso.
+
+Usage:
+    # Executa com 20 mil documentos
+    python benchmarks/bench_ingestion.py --docs 20000
+
+    # Grava os resultados como baseline
+    python benchmarks/bench_ingestion.py --docs 20000 --output baseline.json
+
+    # Compara com o baseline e falha se alguma etapa ficar >20% mais lenta
+    python benchmarks/bench_ingestion.py --docs 20000 --baseline baseline.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path[:0] = [str(Path(__file__).resolve().parents[1] / "src")]
+
+from typesense_dgb.indexer import (  # noqa: E402
+    index_documents,
+    prepare_arrow_documents,
+    prepare_document,
+    prepare_documents,
+)
+from typesense_dgb.jsonl import SUCCESS_LINE, dumps_jsonl  # noqa: E402
+from typesense_dgb.utils import add_derived_columns, parse_dates  # noqa: E402
+
+try:
+    from benchmarks.synthetic import generate_raw_dataframe, to_arrow
+except ImportError:  # executado como script: python benchmarks/bench_ingestion.py
+    from synthetic import generate_raw_dataframe, to_arrow
+
+
+class _FakeDocuments:
+    """Endpoint de documentos que aceita todo import sem rede."""
+
+    def import_(self, payload: bytes, params: dict[str, Any]) -> str:
+        return "\n".join([SUCCESS_LINE] * (payload.count(b"\n") + 1))
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.documents = _FakeDocuments()
+
+    def retrieve(self) -> dict[str, Any]:
+        return {"num_documents": 0, "fields": []}
+
+
+class _FakeCollections:
+    def __getitem__(self, name: str) -> _FakeCollection:
+        return _FakeCollection()
+
+
+class FakeClient:
+    """Cliente Typesense mínimo para medir a indexação sem servidor."""
+
+    def __init__(self) -> None:
+        self.collections = _FakeCollections()
+
+
+def measure(name: str, num_docs: int, func: Callable[[], Any]) -> dict[str, Any]:
+    """
+    Mede o tempo de func e, numa segunda execução, o pico de memória alocada.
+
+    O tracemalloc deixa as alocações bem mais lentas, por isso o tempo é
+    medido numa execução sem ele. Buffers do Arrow não aparecem no pico.
+
+    Returns:
+        Resultado com stage, docs, seconds, docs_per_second e peak_mb
+    """
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "stage": name,
+        "docs": num_docs,
+        "seconds": round(seconds, 4),
+        "docs_per_second": round(num_docs / seconds, 1) if seconds else None,
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def run_benchmarks(
+    num_docs: int, batch_size: int = 1000, seed: int = 0, row_limit: int = 5000
+) -> list[dict[str, Any]]:
+    """
+    Gera os dados sintéticos e mede cada etapa da ingestão.
+
+    Args:
+        num_docs: Documentos sintéticos
+        batch_size: Tamanho do batch da indexação (default: 1000)
+        seed: Semente do gerador (default: 0)
+        row_limit: Máximo de linhas na etapa prepare_document, que é lenta
+            (default: 5000)
+
+    Returns:
+        Lista de resultados por etapa (ver measure)
+    """
+    raw = generate_raw_dataframe(num_docs, seed=seed)
+    table = to_arrow(raw)
+    processed = add_derived_columns(parse_dates(raw.copy()))
+    documents = prepare_documents(processed)
+    rows = processed.head(row_limit)
+
+    return [
+        measure(
+            "process", num_docs, lambda: add_derived_columns(parse_dates(raw.copy()))
+        ),
+        measure(
+            "prepare_document",
+            len(rows),
+            lambda: [prepare_document(row) for _, row in rows.iterrows()],
+        ),
+        measure("prepare_documents", num_docs, lambda: prepare_documents(processed)),
+        measure(
+            "prepare_arrow_documents", num_docs, lambda: prepare_arrow_documents(table)
+        ),
+        measure("serialize", num_docs, lambda: dumps_jsonl(documents)),
+        measure(
+            "index",
+            num_docs,
+            lambda: index_documents(FakeClient(), processed, batch_size=batch_size),
+        ),
+    ]
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float
+) -> list[str]:
+    """
+    Compara a vazão de cada etapa com o baseline.
+
+    Returns:
+        Mensagens das etapas mais lentas que baseline * (1 - tolerance)
+    """
+    reference = {result["stage"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = reference.get(result["stage"])
+        if not previous or not previous["docs_per_second"]:
+            continue
+        ratio = result["docs_per_second"] / previous["docs_per_second"]
+        if ratio < 1 - tolerance:
+            regressions.append(
+                f"{result['stage']}: {result['docs_per_second']:.0f} docs/s "
+                f"({ratio:.0%} do baseline {previous['docs_per_second']:.0f} docs/s)"
+            )
+    return regressions
+
+
+def format_table(results: list[dict[str, Any]]) -> str:
+    """Formata os resultados como tabela de texto."""
+    lines = [f"{'etapa':<26}{'docs':>9}{'segundos':>11}{'docs/s':>12}{'pico MB':>10}"]
+    for result in results:
+        lines.append(
+            f"{result['stage']:<26}{result['docs']:>9}{result['seconds']:>11.3f}"
+            f"{result['docs_per_second'] or 0:>12.0f}{result['peak_mb']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark das etapas de ingestão com dados sintéticos"
+    )
+    parser.add_argument(
+        "--docs", type=int, default=20000, help="Documentos sintéticos (default: 20000)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Tamanho do batch da indexação (default: 1000)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Semente do gerador (default: 0)"
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Grava os resultados em JSON"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="JSON de uma execução anterior para detectar regressões",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Queda de vazão tolerada em relação ao baseline (default: 0.2)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_benchmarks(args.docs, batch_size=args.batch_size, seed=args.seed)
+    print(format_table(results))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressões de desempenho:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("\nSem regressões em relação ao baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Gerador de dados sintéticos no formato do dataset govbrnews.
+
+Produz DataFrames "crus", como saem de load_dataset(...).to_pandas(): datas
+como strings (com formatos mistos), textos de tamanho realista, arrays de
+tags e campos opcionais com uma taxa configurável de nulos.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+AGENCIES = [
+    "mec",
+    "saude",
+    "fazenda",
+    "mre",
+    "mma",
+    "mcti",
+    "planalto",
+    "agricultura",
+    "defesa",
+    "cidades",
+]
+
+CATEGORIES = ["Notícias", "Educação", "Saúde", "Economia", "Meio Ambiente"]
+
+WORDS = (
+    "governo federal ministério programa nacional brasil investimento saúde "
+    "educação recursos municípios estados população projeto desenvolvimento "
+    "sustentável política pública serviço atendimento milhões anúncio ação "
+    "região segurança tecnologia inovação ciência pesquisa infraestrutura "
+    "obras rodovias energia agricultura familiar exportações emprego renda"
+).split()
+
+TAGS = [
+    "educação",
+    "saúde",
+    "vacinação",
+    "economia",
+    "meio ambiente",
+    "ciência",
+    "infraestrutura",
+    "segurança",
+    "cultura",
+    "esporte",
+]
+
+# Campos de texto que podem vir nulos ou vazios
+OPTIONAL_TEXT_FIELDS = [
+    "image",
+    "category",
+    "summary",
+    "subtitle",
+    "editorial_lead",
+    "theme_1_level_1_code",
+    "theme_1_level_1_label",
+    "theme_1_level_2_code",
+    "theme_1_level_2_label",
+    "theme_1_level_3_code",
+    "theme_1_level_3_label",
+    "most_specific_theme_code",
+    "most_specific_theme_label",
+]
+
+# Data de referência (2025-06-30 12:00 UTC) e janela de publicação (~5 anos)
+REFERENCE_TS = 1751284800
+WINDOW_SECONDS = 5 * 365 * 86400
+
+
+def _texts(rng: np.random.Generator, num_docs: int, mean_words: int) -> list[str]:
+    """Textos com número de palavras em distribuição log-normal."""
+    lengths = np.maximum(rng.lognormal(np.log(mean_words), 0.5, num_docs), 1)
+    ends = np.cumsum(lengths.astype("int64"))
+    words = np.array(WORDS, dtype=object)[rng.integers(0, len(WORDS), ends[-1])]
+    return [" ".join(text) for text in np.split(words, ends[:-1])]
+
+
+def _with_nulls(
+    rng: np.random.Generator, values: list, null_rate: float
+) -> list[object]:
+    """Substitui valores por None (e alguns por string vazia) na taxa pedida."""
+    draws = rng.random(len(values))
+    return [
+        None if draw < null_rate * 0.8 else "" if draw < null_rate else value
+        for value, draw in zip(values, draws)
+    ]
+
+
+def _dates(
+    rng: np.random.Generator, timestamps: np.ndarray, mixed_rate: float
+) -> list[str]:
+    """
+    Datas ISO 8601 em UTC-3; uma fração usa segundos fracionários.
+
+    O pandas infere o formato pela primeira data, então o formato minoritário
+    reproduz o custo (e as perdas) de um dataset com formatos mistos.
+    """
+    local = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert("-03:00")
+    plain = local.strftime("%Y-%m-%dT%H:%M:%S-03:00")
+    fractional = local.strftime("%Y-%m-%dT%H:%M:%S.%f-03:00")
+    mixed = rng.random(len(timestamps)) < mixed_rate
+    mixed[0] = False
+    return np.where(mixed, fractional, plain).tolist()
+
+
+def generate_raw_dataframe(
+    num_docs: int,
+    seed: int = 0,
+    null_rate: float = 0.1,
+    mixed_date_rate: float = 0.05,
+    content_words: int = 600,
+) -> pd.DataFrame:
+    """
+    Gera um DataFrame sintético com o formato cru do govbrnews.
+
+    Args:
+        num_docs: Número de documentos
+        seed: Semente do gerador aleatório (default: 0)
+        null_rate: Fração de valores nulos/vazios nos campos opcionais (default: 0.1)
+        mixed_date_rate: Fração de datas em formato alternativo (default: 0.05)
+        content_words: Número médio de palavras do conteúdo (default: 600)
+
+    Returns:
+        DataFrame com as colunas do dataset govbrnews
+    """
+    rng = np.random.default_rng(seed)
+    published = REFERENCE_TS - rng.integers(0, WINDOW_SECONDS, num_docs)
+    extracted = published + rng.integers(60, 3 * 86400, num_docs)
+
+    ids = [
+        f"{high:016x}{low:016x}"
+        for high, low in rng.integers(0, 2**63, (num_docs, 2)).tolist()
+    ]
+    data = {
+        "unique_id": ids,
+        "agency": rng.choice(AGENCIES, num_docs).tolist(),
+        "published_at": _dates(rng, published, mixed_date_rate),
+        "extracted_at": pd.to_datetime(extracted, unit="s")
+        .strftime("%Y-%m-%d %H:%M:%S")
+        .tolist(),
+        "title": _texts(rng, num_docs, 12),
+        "url": [f"https://www.gov.br/noticias/{doc_id}" for doc_id in ids],
+        "content": _texts(rng, num_docs, content_words),
+    }
+
+    for field in OPTIONAL_TEXT_FIELDS:
+        if field == "category":
+            values = rng.choice(CATEGORIES, num_docs).tolist()
+        elif field.endswith("_code"):
+            values = [f"{code:02d}" for code in rng.integers(1, 30, num_docs)]
+        elif field == "image":
+            values = [f"https://www.gov.br/imagens/{doc_id}.jpg" for doc_id in ids]
+        else:
+            values = _texts(rng, num_docs, 25)
+        data[field] = _with_nulls(rng, values, null_rate)
+
+    tags = []
+    for count, draw in zip(rng.integers(0, 8, num_docs), rng.random(num_docs)):
+        row = rng.choice(TAGS, count).tolist()
+        # Algumas tags com espaços extras, vazias ou longas demais (texto colado)
+        if draw < 0.05:
+            row += ["  ", " " + TAGS[0] + " ", "x" * 150]
+        tags.append(None if draw > 1 - null_rate else row)
+    data["tags"] = tags
+
+    return pd.DataFrame(data)
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Converte o DataFrame cru para a tabela Arrow equivalente ao cache do HF."""
+    return pa.Table.from_pandas(df, preserve_index=False)
@@ -11,13 +11,38 @@ Usage:
     # Carga incremental (últimos 7 dias)
     python scripts/load_data.py --mode incremental --days 7
 
+    # Sincronização: envia só documentos novos/alterados e remove os apagados
+    python scripts/load_data.py --mode sync
+
+    # Carga incremental lendo do cache local do dataset processado
+    python scripts/load_data.py --mode incremental --days 7 --cache-dir ~/.cache/typesense-dgb
+
+    # Carga completa direto do Arrow memory-mapped (menor pico de memória)
+    python scripts/load_data.py --mode full --force --arrow
+
     # Carga completa forçada (sobrescreve dados existentes)
     python scripts/load_data.py --mode full --force
+
+    # Carga completa em streaming (memória limitada ao tamanho do bloco)
+    python scripts/load_data.py --mode full --force --stream
+
+    # Reload completo sem indisponibilidade (nova coleção + troca do alias)
+    python scripts/load_data.py --mode full --blue-green
+
+    # Grava as métricas por etapa em JSON e no formato do Prometheus
+    python scripts/load_data.py --mode incremental --metrics-output metrics.json --prometheus-output load.prom
+
+    # Profile de CPU (cProfile) ou de memória (tracemalloc) por etapa
+    python scripts/load_data.py --mode full --force --profile cpu --profile-dir profiles
+
+    # Grava também o snapshot de contagens dos dashboards em JSON
+    python scripts/load_data.py --mode incremental --stats-output news_stats.json
 """
 
 import argparse
 import logging
 import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 
@@ -32,12 +57,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from typesense_dgb import (
+    NewsStats,
+    PipelineMetrics,
+    RetryPolicy,
+    TypesenseCluster,
+    blue_green_reload,
     create_collection,
     download_and_process_dataset,
     index_documents,
+    iter_arrow_batches,
+    sync_documents,
     wait_for_typesense,
+    write_stats,
 )
 from typesense_dgb.indexer import run_test_queries
+from typesense_dgb.profiling import create_profiler
+from typesense_dgb.stats import collection_stats, write_stats_json
+from typesense_dgb.sync import DEFAULT_MANIFEST_PATH
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -58,15 +94,39 @@ Exemplos:
 
   # Carga incremental (últimos 30 dias)
   python load_data.py --mode incremental --days 30
+
+  # Sincronização: envia só documentos novos/alterados e remove os apagados
+  python load_data.py --mode sync --manifest /data/sync_manifest.sqlite
+
+  # Carga incremental lendo do cache local do dataset processado
+  python load_data.py --mode incremental --days 7 --cache-dir ~/.cache/typesense-dgb
+
+  # Carga completa direto do Arrow memory-mapped (menor pico de memória)
+  python load_data.py --mode full --force --arrow
+
+  # Carga completa em streaming (memória limitada ao tamanho do bloco)
+  python load_data.py --mode full --force --stream
+
+  # Reload completo sem indisponibilidade (nova coleção + troca do alias)
+  python load_data.py --mode full --blue-green
+
+  # Grava as métricas por etapa em JSON e no formato do Prometheus
+  python load_data.py --metrics-output metrics.json --prometheus-output load.prom
+
+  # Profile de CPU (cProfile) ou de memória (tracemalloc) por etapa
+  python load_data.py --mode full --force --profile memory --profile-dir profiles
+
+  # Grava também o snapshot de contagens dos dashboards em JSON
+  python load_data.py --mode incremental --stats-output news_stats.json
         """,
     )
 
     parser.add_argument(
         "--mode",
         type=str,
-        choices=["full", "incremental"],
+        choices=["full", "incremental", "sync"],
         default="full",
-        help='Modo de carga: "full" carrega tudo, "incremental" carrega dados recentes (default: full)',
+        help='Modo de carga: "full" carrega tudo, "incremental" carrega dados recentes, "sync" envia só o que mudou desde a última carga (default: full)',
     )
 
     parser.add_argument(
@@ -79,17 +139,181 @@ Exemplos:
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Força modo full em coleções não vazias (use com cuidado!)",
+        help="Força modo full em coleções não vazias e, no modo sync, remoções acima do limite (use com cuidado!)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Processa e indexa o dataset em blocos, sem carregá-lo inteiro em memória",
+    )
+
+    parser.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Indexa direto das fatias Arrow memory-mapped do dataset, sem pandas",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Diretório do cache Parquet do dataset processado (reaproveitado enquanto a revisão não mudar)",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Número de imports simultâneos no Typesense (default: 1)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos que preparam os documentos em paralelo (default: 1)",
+    )
+
+    parser.add_argument(
+        "--adaptive-batch",
+        action="store_true",
+        help="Ajusta o tamanho dos batches pela latência e tamanho dos documentos",
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Reenvios por batch em falhas transitórias; 0 desativa (default: 3)",
+    )
+
+    parser.add_argument(
+        "--dead-letter",
+        type=str,
+        default=None,
+        help="Arquivo JSONL onde gravar documentos rejeitados pelo Typesense",
+    )
+
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=DEFAULT_MANIFEST_PATH,
+        help=f"Manifesto de fingerprints do modo sync (default: {DEFAULT_MANIFEST_PATH})",
+    )
+
+    parser.add_argument(
+        "--blue-green",
+        action="store_true",
+        help="No modo full, indexa numa coleção nova e troca o alias ao final",
+    )
+
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=2,
+        help="Versões mantidas após o reload blue/green, incluindo a atual (default: 2)",
+    )
+
+    parser.add_argument(
+        "--metrics-output",
+        type=str,
+        default=None,
+        help="Arquivo JSON onde gravar as métricas por etapa da carga",
+    )
+
+    parser.add_argument(
+        "--prometheus-output",
+        type=str,
+        default=None,
+        help="Arquivo onde gravar as métricas no formato de texto do Prometheus",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        choices=["cpu", "memory"],
+        default=None,
+        help="Executa a carga com cProfile (cpu) ou tracemalloc (memory) e grava relatórios por etapa",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=".",
+        help="Diretório dos arquivos de profile (default: diretório atual)",
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Linhas por etapa nos relatórios de profile (default: 20)",
+    )
+
+    parser.add_argument(
+        "--no-stats",
+        action="store_true",
+        help="Não atualiza o snapshot de contagens por facet (coleção news_stats)",
+    )
+
+    parser.add_argument(
+        "--stats-output",
+        type=str,
+        default=None,
+        help="Arquivo JSON onde gravar também o snapshot de contagens por facet",
     )
 
     return parser.parse_args()
 
 
+def write_metrics(metrics: PipelineMetrics, args: argparse.Namespace) -> None:
+    """Registra o resumo das métricas e grava os arquivos pedidos."""
+    metrics.log_summary()
+    logger.info(f"Métricas: {metrics.to_json(indent=None)}")
+    if args.metrics_output:
+        Path(args.metrics_output).write_text(metrics.to_json())
+    if args.prometheus_output:
+        Path(args.prometheus_output).write_text(metrics.to_prometheus())
+
+
+def update_stats(client, stats: NewsStats | None, args: argparse.Namespace) -> None:
+    """
+    Grava o snapshot de contagens dos dashboards.
+
+    Usa as contagens do pipeline quando ele viu o dataset inteiro; senão
+    (incremental, Arrow ou indexação pulada) recalcula a partir da coleção.
+    Uma falha aqui não invalida a carga, só deixa o snapshot anterior.
+    """
+    try:
+        if stats is None:
+            logger.info("Calculando snapshot de contagens a partir da coleção...")
+            stats = collection_stats(client)
+        write_stats(client, stats)
+        if args.stats_output:
+            write_stats_json(stats, args.stats_output)
+    except Exception as e:
+        logger.error(f"Falha ao atualizar o snapshot de contagens: {e}")
+
+
 def main() -> None:
     """Main function."""
+    args = parse_arguments()
+    metrics = PipelineMetrics()
+    profiler = (
+        create_profiler(args.profile, metrics, top=args.profile_top)
+        if args.profile
+        else None
+    )
+    if profiler is not None:
+        logger.info(f"Profile de {args.profile} ativado (ver --profile-dir)")
+        if args.profile == "cpu" and (args.workers > 1 or args.concurrency > 1):
+            logger.warning(
+                "Com --workers/--concurrency > 1, preparação e imports rodam em "
+                "outros processos/threads e ficam fora do profile de CPU"
+            )
+        profiler.start()
     try:
-        args = parse_arguments()
-
         logger.info("=" * 80)
         logger.info("Iniciando carregamento de dados GovBR News no Typesense")
         logger.info(f"Modo: {args.mode}")
@@ -103,14 +327,92 @@ def main() -> None:
             logger.error("Não foi possível conectar ao Typesense")
             sys.exit(1)
 
-        # Cria coleção
-        create_collection(client)
+        # Num cluster (TYPESENSE_NODES), os imports vão direto para o líder
+        if len(client.config.nodes) > 1:
+            cluster = TypesenseCluster()
+            cluster.check()
+            target = cluster.write_node()
+            logger.info(
+                f"Cluster com {len(cluster.nodes)} nós; escritas em {target.url}"
+                f"{' (líder)' if target.leader else ''}"
+            )
+            client = cluster.client_for(target)
 
-        # Baixa e processa dataset
-        df = download_and_process_dataset(mode=args.mode, days=args.days)
+        if args.blue_green and args.mode != "full":
+            logger.error("--blue-green só pode ser usado com --mode full")
+            sys.exit(1)
+
+        # Cria coleção (no blue/green a coleção versionada é criada no reload)
+        if not args.blue_green:
+            create_collection(client)
+
+        if args.arrow and (args.mode == "sync" or args.cache_dir):
+            logger.error("--arrow não pode ser usado com --mode sync ou --cache-dir")
+            sys.exit(1)
+
+        # Contagens dos dashboards calculadas no pipeline quando ele vê o
+        # dataset inteiro (full e sync)
+        stats = (
+            NewsStats()
+            if args.mode != "incremental" and not args.arrow and not args.no_stats
+            else None
+        )
+
+        # Baixa e processa dataset (o modo sync compara o dataset completo)
+        if args.arrow:
+            df = iter_arrow_batches(mode=args.mode, days=args.days, metrics=metrics)
+        else:
+            df = download_and_process_dataset(
+                mode="full" if args.mode == "sync" else args.mode,
+                days=args.days,
+                stream=args.stream,
+                cache_dir=args.cache_dir,
+                metrics=metrics,
+                stats=stats,
+            )
+
+        index_kwargs = {
+            "concurrency": args.concurrency,
+            "adaptive_batching": args.adaptive_batch,
+            "retry_policy": (
+                RetryPolicy(max_retries=args.max_retries)
+                if args.max_retries > 0
+                else None
+            ),
+            "dead_letter_path": args.dead_letter,
+            "workers": args.workers,
+            "metrics": metrics,
+        }
 
         # Indexa documentos
-        index_documents(client, df, mode=args.mode, force=args.force)
+        if args.blue_green:
+            reload_stats = blue_green_reload(
+                client,
+                df,
+                keep_versions=args.keep_versions,
+                replace_legacy=args.force,
+                **index_kwargs,
+            )
+            if not reload_stats["swapped"]:
+                logger.error("Nova versão reprovada na validação; alias mantido")
+                sys.exit(1)
+        elif args.mode == "sync":
+            sync_documents(
+                client,
+                df,
+                manifest_path=args.manifest,
+                max_delete_ratio=1.0 if args.force else 0.1,
+                **index_kwargs,
+            )
+        else:
+            index_stats = index_documents(
+                client, df, mode=args.mode, force=args.force, **index_kwargs
+            )
+            if index_stats.get("skipped"):
+                stats = None
+
+        if not args.no_stats:
+            update_stats(client, stats, args)
 
         # Executa consultas de teste
         run_test_queries(client)
@@ -123,6 +425,13 @@ def main() -> None:
         logger.error(f"Falha no carregamento de dados: {e}")
         sys.exit(1)
 
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            for path in profiler.dump(args.profile_dir):
+                logger.info(f"Profile gravado em {path}")
+        write_metrics(metrics, args)
+
 
 if __name__ == "__main__":
     main()
@@ -2,40 +2,113 @@
 Typesense DGB - Módulo para indexação e busca de notícias do governo brasileiro.
 
 Este módulo fornece funcionalidades para:
-- Conexão com servidores Typesense
+- Conexão com servidores Typesense (nó único ou cluster, com health check)
 - Criação e gerenciamento de coleções
 - Download e processamento do dataset govbrnews
 - Indexação de documentos
+- Sincronização incremental por fingerprint de conteúdo
+- Métricas por etapa da carga (JSON e Prometheus)
+- Busca com cache de resultados
+- Séries temporais de contagem (semanal, mensal e anual) via facets
+- Snapshot pré-calculado de contagens por facet para dashboards
 """
 
+from typesense_dgb.async_client import AsyncTypesenseClient
+from typesense_dgb.batching import AdaptiveBatchSizer
 from typesense_dgb.client import get_client, wait_for_typesense
+from typesense_dgb.cluster import TypesenseCluster
 from typesense_dgb.collection import (
     COLLECTION_NAME,
     COLLECTION_SCHEMA,
+    cleanup_collection_versions,
     create_collection,
     delete_collection,
+    get_alias_target,
     list_collections,
+    point_alias,
+    versioned_collection_name,
+)
+from typesense_dgb.dataset import (
+    download_and_process_dataset,
+    iter_arrow_batches,
+    required_columns,
+)
+from typesense_dgb.indexer import (
+    index_documents,
+    index_documents_async,
+    prepare_arrow_documents,
+    prepare_document,
+    prepare_documents,
+    validate_collection,
+)
+from typesense_dgb.metrics import PipelineMetrics
+from typesense_dgb.reload import blue_green_reload
+from typesense_dgb.retry import RetryPolicy
+from typesense_dgb.search import (
+    CachedSearchClient,
+    MultiSearchExecutor,
+    invalidate_search_caches,
+)
+from typesense_dgb.stats import NewsStats, get_stats, write_stats
+from typesense_dgb.sync import SyncManifest, sync_documents
+from typesense_dgb.temporal import monthly_counts, weekly_counts, yearly_counts
+from typesense_dgb.utils import (
+    calculate_published_week,
+    calculate_published_week_series,
+    datetime_to_timestamp_series,
 )
-from typesense_dgb.dataset import download_and_process_dataset
-from typesense_dgb.indexer import index_documents, prepare_document
-from typesense_dgb.utils import calculate_published_week
 
 __version__ = "1.0.0"
 __all__ = [
     # Client
     "get_client",
     "wait_for_typesense",
+    "AsyncTypesenseClient",
+    "TypesenseCluster",
     # Collection
     "COLLECTION_NAME",
     "COLLECTION_SCHEMA",
     "create_collection",
     "delete_collection",
     "list_collections",
+    "get_alias_target",
+    "point_alias",
+    "versioned_collection_name",
+    "cleanup_collection_versions",
     # Dataset
     "download_and_process_dataset",
+    "required_columns",
+    "iter_arrow_batches",
     # Indexer
     "index_documents",
+    "index_documents_async",
     "prepare_document",
+    "prepare_documents",
+    "prepare_arrow_documents",
+    "validate_collection",
+    "AdaptiveBatchSizer",
+    "RetryPolicy",
+    # Metrics
+    "PipelineMetrics",
+    # Search
+    "CachedSearchClient",
+    "MultiSearchExecutor",
+    "invalidate_search_caches",
+    # Reload
+    "blue_green_reload",
+    # Sync
+    "sync_documents",
+    "SyncManifest",
+    # Temporal
+    "weekly_counts",
+    "monthly_counts",
+    "yearly_counts",
+    # Stats
+    "NewsStats",
+    "write_stats",
+    "get_stats",
     # Utils
     "calculate_published_week",
+    "calculate_published_week_series",
+    "datetime_to_timestamp_series",
 ]
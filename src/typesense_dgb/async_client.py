@@ -0,0 +1,215 @@
+"""
+Cliente Typesense assíncrono - Conexão via sessão HTTP assíncrona (aiohttp).
+
+Requer a dependência opcional ``aiohttp`` (``pip install typesense-dgb[async]``).
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any
+
+from typesense.api_call import ApiCall
+
+from typesense_dgb.jsonl import dumps_jsonl
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - dependência opcional
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+def _stringify_params(params: dict[str, Any] | None) -> dict[str, str]:
+    """Converte parâmetros para strings aceitas na query string do Typesense."""
+    stringified = {}
+    for key, value in (params or {}).items():
+        if isinstance(value, bool):
+            stringified[key] = "true" if value else "false"
+        elif isinstance(value, (list, tuple)):
+            stringified[key] = ",".join(str(item) for item in value)
+        else:
+            stringified[key] = str(value)
+    return stringified
+
+
+class AsyncTypesenseClient:
+    """
+    Cliente Typesense assíncrono com pool de conexões e limite de concorrência.
+
+    Deve ser usado como context manager assíncrono:
+
+        async with AsyncTypesenseClient() as client:
+            results = await client.search("news", {"q": "saúde", "query_by": "title"})
+
+    Args:
+        host: Host do servidor Typesense (default: TYPESENSE_HOST env var ou 'localhost')
+        port: Porta do servidor (default: TYPESENSE_PORT env var ou '8108')
+        api_key: Chave de API (default: TYPESENSE_API_KEY env var)
+        protocol: Protocolo de conexão (default: 'http')
+        timeout: Timeout de cada requisição em segundos (default: 10)
+        max_connections: Tamanho máximo do pool de conexões HTTP (default: 100)
+        max_concurrency: Número máximo de requisições simultâneas (default: 8)
+
+    Raises:
+        ImportError: Se aiohttp não estiver instalado
+        ValueError: Se api_key não for fornecida
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: str | None = None,
+        api_key: str | None = None,
+        protocol: str = "http",
+        timeout: int = 10,
+        max_connections: int = 100,
+        max_concurrency: int = 8,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncTypesenseClient requer aiohttp: pip install typesense-dgb[async]"
+            )
+
+        host = host or os.getenv("TYPESENSE_HOST", "localhost")
+        port = port or os.getenv("TYPESENSE_PORT", "8108")
+        api_key = api_key or os.getenv(
+            "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
+        )
+
+        if not api_key:
+            raise ValueError("TYPESENSE_API_KEY deve ser configurada")
+
+        self.base_url = f"{protocol}://{host}:{port}"
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "AsyncTypesenseClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Abre a sessão HTTP compartilhada (idempotente)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                headers={ApiCall.API_KEY_HEADER_NAME: self.api_key},
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        """Fecha a sessão HTTP."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: str | bytes | None = None,
+        as_json: bool = True,
+    ) -> Any:
+        """
+        Executa uma requisição respeitando o limite de concorrência.
+
+        Raises:
+            TypesenseClientError: Subclasse correspondente ao status HTTP de erro
+        """
+        await self.open()
+        async with self._semaphore:
+            async with self._session.request(
+                method, path, params=_stringify_params(params), data=body
+            ) as response:
+                text = await response.text()
+
+        if not 200 <= response.status < 300:
+            try:
+                message = json.loads(text).get("message", "API error.")
+            except (ValueError, AttributeError):
+                message = "API error."
+            raise ApiCall.get_exception(response.status)(response.status, message)
+
+        return json.loads(text) if as_json else text
+
+    async def health(self) -> bool:
+        """Retorna True se o servidor responder ok em /health."""
+        try:
+            result = await self._request("GET", "/health")
+            return bool(result.get("ok"))
+        except Exception as e:
+            logger.debug(f"Health check falhou: {e}")
+            return False
+
+    async def retrieve_collection(self, collection_name: str) -> dict[str, Any]:
+        """Retorna as informações de uma coleção."""
+        return await self._request("GET", f"/collections/{collection_name}")
+
+    async def search(
+        self, collection_name: str, search_params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Executa uma busca na coleção."""
+        return await self._request(
+            "GET",
+            f"/collections/{collection_name}/documents/search",
+            params=search_params,
+        )
+
+    async def import_documents_raw(
+        self,
+        collection_name: str,
+        payload: str | bytes,
+        params: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Importa um payload JSONL já serializado e retorna a resposta bruta.
+
+        Args:
+            collection_name: Nome da coleção
+            payload: Documentos em JSONL
+            params: Parâmetros do import (default: {'action': 'upsert'})
+
+        Returns:
+            Resposta JSONL do Typesense, uma linha por documento
+        """
+        return await self._request(
+            "POST",
+            f"/collections/{collection_name}/documents/import",
+            params=params or {"action": "upsert"},
+            body=payload,
+            as_json=False,
+        )
+
+    async def import_documents(
+        self,
+        collection_name: str,
+        documents: list[dict[str, Any]] | str | bytes,
+        params: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Importa documentos em JSONL.
+
+        Args:
+            collection_name: Nome da coleção
+            documents: Lista de documentos ou payload JSONL já serializado
+            params: Parâmetros do import (default: {'action': 'upsert'})
+
+        Returns:
+            Lista com o resultado de cada linha importada
+        """
+        if not isinstance(documents, (str, bytes)):
+            documents = dumps_jsonl(documents)
+
+        text = await self.import_documents_raw(collection_name, documents, params)
+        return [json.loads(line) for line in text.splitlines() if line]
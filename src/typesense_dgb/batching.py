@@ -0,0 +1,129 @@
+"""
+Divisão em batches e dimensionamento adaptativo para imports no Typesense.
+"""
+
+import logging
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+def iter_batches(
+    data: pd.DataFrame | pa.Table | Iterable[pd.DataFrame] | Iterable[pa.Table],
+    batch_size: int,
+) -> Iterator[pd.DataFrame | pa.Table | list]:
+    """
+    Divide um DataFrame ou tabela Arrow, ou um iterador deles (ou de listas
+    de documentos), em fatias de batch_size. Fatias de tabelas Arrow não
+    copiam os dados.
+    """
+    chunks = [data] if isinstance(data, (pd.DataFrame, pa.Table)) else data
+    for chunk in chunks:
+        for start in range(0, len(chunk), batch_size):
+            if isinstance(chunk, pa.Table):
+                yield chunk.slice(start, batch_size)
+            elif isinstance(chunk, list):
+                yield chunk[start : start + batch_size]
+            else:
+                yield chunk.iloc[start : start + batch_size]
+
+
+class AdaptiveBatchSizer:
+    """
+    Ajusta o número de documentos por batch no estilo AIMD.
+
+    Cada batch é limitado por um orçamento de bytes (target_bytes) e por
+    docs_per_batch. Após cada import, docs_per_batch cresce de forma aditiva
+    enquanto a latência e a taxa de erros ficam dentro do alvo, e é reduzido
+    de forma multiplicativa quando o servidor fica lento ou começa a falhar.
+
+    Args:
+        initial_docs: Documentos por batch no início (default: 1000)
+        target_bytes: Tamanho máximo do payload de um batch (default: 5 MiB)
+        target_latency: Latência alvo de um import em segundos (default: 2.0)
+        min_docs: Limite inferior de documentos por batch (default: 50)
+        max_docs: Limite superior de documentos por batch (default: 10000)
+        increase_step: Incremento aditivo em documentos (default: 100)
+        decrease_factor: Fator multiplicativo de redução (default: 0.5)
+        max_error_rate: Taxa de erros por batch acima da qual reduz (default: 0.05)
+    """
+
+    def __init__(
+        self,
+        initial_docs: int = 1000,
+        target_bytes: int = 5 * 1024 * 1024,
+        target_latency: float = 2.0,
+        min_docs: int = 50,
+        max_docs: int = 10000,
+        increase_step: int = 100,
+        decrease_factor: float = 0.5,
+        max_error_rate: float = 0.05,
+    ) -> None:
+        self.target_bytes = target_bytes
+        self.target_latency = target_latency
+        self.min_docs = min_docs
+        self.max_docs = max_docs
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.docs_per_batch = min(max(initial_docs, min_docs), max_docs)
+
+    def is_full(self, num_documents: int, num_bytes: int, next_bytes: int) -> bool:
+        """
+        Indica se o batch atual deve ser enviado antes de receber a próxima linha.
+
+        Args:
+            num_documents: Documentos já no batch
+            num_bytes: Bytes já no batch
+            next_bytes: Tamanho da próxima linha
+        """
+        if num_documents == 0:
+            return False
+        return (
+            num_documents >= self.docs_per_batch
+            or num_bytes + next_bytes > self.target_bytes
+        )
+
+    def _decrease(self) -> None:
+        self.docs_per_batch = max(
+            self.min_docs, int(self.docs_per_batch * self.decrease_factor)
+        )
+
+    def record(self, num_documents: int, latency: float, num_errors: int) -> None:
+        """
+        Ajusta docs_per_batch a partir do resultado de um import.
+
+        Só cresce quando o batch foi limitado pela contagem de documentos,
+        para não inflar o limite quando o orçamento de bytes é que manda.
+
+        Args:
+            num_documents: Documentos enviados no batch
+            latency: Duração do import em segundos
+            num_errors: Documentos rejeitados no batch
+        """
+        previous = self.docs_per_batch
+        error_rate = num_errors / num_documents if num_documents else 0.0
+
+        if latency > self.target_latency or error_rate > self.max_error_rate:
+            self._decrease()
+        elif num_documents >= self.docs_per_batch:
+            self.docs_per_batch = min(
+                self.max_docs, self.docs_per_batch + self.increase_step
+            )
+
+        if self.docs_per_batch != previous:
+            logger.debug(
+                f"Batch adaptativo: {previous} -> {self.docs_per_batch} documentos "
+                f"(latência {latency:.2f}s, erros {num_errors}/{num_documents})"
+            )
+
+    def record_failure(self) -> None:
+        """Reduz docs_per_batch após uma falha de transporte (timeout, 503...)."""
+        previous = self.docs_per_batch
+        self._decrease()
+        logger.debug(
+            f"Batch adaptativo: falha de transporte, {previous} -> {self.docs_per_batch}"
+        )
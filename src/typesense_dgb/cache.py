@@ -0,0 +1,160 @@
+"""
+Cache local do dataset já processado, em Parquet particionado por ano/mês.
+
+O cache é gravado em '<cache_dir>/<dataset>/<revisão>/', onde a revisão é o
+commit do dataset no HuggingFace Hub. Enquanto a revisão não mudar, as cargas
+leem direto do Parquet, sem baixar nem reprocessar o dataset, e o modo
+incremental lê apenas as partições recentes.
+"""
+
+import hashlib
+import logging
+import shutil
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from huggingface_hub import HfApi
+
+logger = logging.getLogger(__name__)
+
+# Colunas de partição do cache (hive: published_year=2024/published_month=10)
+PARTITIONING = ds.partitioning(
+    pa.schema([("published_year", pa.int32()), ("published_month", pa.int32())]),
+    flavor="hive",
+)
+
+# Coluna auxiliar que preserva a ordem (e o índice) original das linhas
+ROW_COLUMN = "_row"
+
+# Colunas de data convertidas para UTC quando têm offsets mistos
+DATE_COLUMNS = ["published_at", "extracted_at"]
+
+
+def dataset_revision(dataset_path: str) -> str | None:
+    """
+    Retorna o commit atual do dataset no HuggingFace Hub.
+
+    Returns:
+        SHA da revisão, ou None se o Hub não estiver acessível
+    """
+    try:
+        return HfApi().dataset_info(dataset_path).sha
+    except Exception as e:
+        logger.warning(f"Não foi possível obter a revisão de {dataset_path}: {e}")
+        return None
+
+
+def cache_path(
+    cache_dir: str | Path,
+    dataset_path: str,
+    revision: str,
+    columns: Iterable[str] | None = None,
+) -> Path:
+    """
+    Diretório do cache de uma revisão do dataset.
+
+    Com columns, o nome inclui um hash das colunas projetadas, para que uma
+    mudança no schema gere um cache novo.
+    """
+    name = revision
+    if columns is not None:
+        digest = hashlib.sha1(",".join(columns).encode()).hexdigest()[:8]
+        name = f"{revision}-{digest}"
+    return Path(cache_dir) / dataset_path.replace("/", "__") / name
+
+
+def write_processed_cache(df: pd.DataFrame, path: Path) -> None:
+    """
+    Grava o DataFrame processado como Parquet particionado por ano/mês.
+
+    A gravação é feita num diretório temporário e movida no final, então um
+    cache incompleto nunca é lido. Revisões antigas do mesmo dataset são
+    removidas.
+
+    Args:
+        df: DataFrame completo, com as colunas derivadas
+        path: Diretório de destino (ver cache_path)
+    """
+    df = df.assign(**{ROW_COLUMN: df.index.to_numpy()})
+    for column in DATE_COLUMNS:
+        if column in df.columns and df[column].dtype == object:
+            df[column] = pd.to_datetime(df[column], utc=True)
+
+    # Anos/meses são float quando há datas ausentes; as partições usam int32
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name in PARTITIONING.schema.names:
+        index = table.schema.get_field_index(name)
+        table = table.set_column(index, name, table[name].cast(pa.int32()))
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    ds.write_dataset(table, tmp_path, format="parquet", partitioning=PARTITIONING)
+
+    for stale in path.parent.glob("*"):
+        if stale != tmp_path:
+            shutil.rmtree(stale, ignore_errors=True)
+    tmp_path.rename(path)
+    logger.info(f"Cache do dataset processado gravado em {path}")
+
+
+def _cutoff_filter(cutoff_date: datetime | None) -> ds.Expression | None:
+    """
+    Filtro do modo incremental, com poda das partições anteriores ao corte.
+
+    As partições usam o fuso de cada published_at, então a poda considera um
+    dia de folga; o filtro exato é feito por published_at_ts.
+    """
+    if cutoff_date is None:
+        return None
+
+    bound = cutoff_date - timedelta(days=1)
+    year, month = ds.field("published_year"), ds.field("published_month")
+    partitions = (year > bound.year) | ((year == bound.year) & (month >= bound.month))
+    return partitions & (ds.field("published_at_ts") >= int(cutoff_date.timestamp()))
+
+
+def _to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """Converte uma tabela do cache para DataFrame com o índice original."""
+    df = table.to_pandas()
+    df.index = pd.Index(df.pop(ROW_COLUMN))
+    df.index.name = None
+    return df
+
+
+def read_processed_cache(
+    path: Path, cutoff_date: datetime | None = None
+) -> pd.DataFrame:
+    """
+    Lê o dataset processado do cache.
+
+    Args:
+        path: Diretório do cache (ver cache_path)
+        cutoff_date: Data de corte do modo incremental; None lê tudo
+
+    Returns:
+        DataFrame processado, na ordem original das linhas
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    df = _to_dataframe(dataset.to_table(filter=_cutoff_filter(cutoff_date)))
+    return df.sort_index()
+
+
+def iter_processed_cache(
+    path: Path, cutoff_date: datetime | None = None, chunk_size: int = 5000
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê o dataset processado do cache em blocos de até chunk_size registros.
+
+    Os blocos seguem a ordem das partições, não a ordem original das linhas;
+    o índice de cada linha é o original.
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    for batch in dataset.to_batches(
+        filter=_cutoff_filter(cutoff_date), batch_size=chunk_size
+    ):
+        if batch.num_rows:
+            yield _to_dataframe(pa.Table.from_batches([batch]))
@@ -1,16 +1,95 @@
 """
 Cliente Typesense - Conexão e configuração.
+
+Com TYPESENSE_NODES (ex.: 'http://ts1:8108,http://ts2:8108,http://ts3:8108')
+o cliente usa todos os nós do cluster, com failover entre eles; sem a
+variável, usa o nó único de TYPESENSE_HOST/TYPESENSE_PORT. Para seleção de
+nós por latência e escrita no líder, ver typesense_dgb.cluster.
 """
 
 import logging
 import os
 import time
+from collections.abc import Sequence
+from typing import Any
+from urllib.parse import urlsplit
 
 import requests
 import typesense
 
 logger = logging.getLogger(__name__)
 
+NodeSpec = str | dict[str, Any]
+
+
+def parse_node(spec: NodeSpec, protocol: str = "http") -> dict[str, str]:
+    """
+    Converte 'host:porta', 'protocolo://host:porta' ou um dicionário no
+    formato de nó do cliente Typesense ({'host', 'port', 'protocol'}).
+
+    Raises:
+        ValueError: Se o nó não tiver host
+    """
+    if isinstance(spec, dict):
+        node = {
+            "host": str(spec["host"]),
+            "port": str(spec.get("port", "8108")),
+            "protocol": spec.get("protocol", protocol),
+        }
+    else:
+        spec = spec.strip()
+        parts = urlsplit(spec if "://" in spec else f"{protocol}://{spec}")
+        if not parts.hostname:
+            raise ValueError(f"Nó Typesense inválido: '{spec}'")
+        node = {
+            "host": parts.hostname,
+            "port": str(parts.port or "8108"),
+            "protocol": parts.scheme,
+        }
+    return node
+
+
+def parse_nodes(
+    nodes: str | Sequence[NodeSpec], protocol: str = "http"
+) -> list[dict[str, str]]:
+    """
+    Lista de nós a partir de uma string separada por vírgulas ou de uma lista.
+
+    Raises:
+        ValueError: Se a lista estiver vazia ou algum nó for inválido
+    """
+    if isinstance(nodes, str):
+        nodes = [spec for spec in nodes.split(",") if spec.strip()]
+    parsed = [parse_node(spec, protocol) for spec in nodes]
+    if not parsed:
+        raise ValueError("Nenhum nó Typesense configurado")
+    return parsed
+
+
+def node_url(node: dict[str, str]) -> str:
+    """URL base de um nó, ex. 'http://localhost:8108'."""
+    return f"{node['protocol']}://{node['host']}:{node['port']}"
+
+
+def configured_nodes(
+    host: str | None = None,
+    port: str | None = None,
+    nodes: str | Sequence[NodeSpec] | None = None,
+    protocol: str = "http",
+) -> list[dict[str, str]]:
+    """
+    Nós a usar: `nodes`, senão TYPESENSE_NODES, senão o nó único de
+    host/port (TYPESENSE_HOST/TYPESENSE_PORT).
+    """
+    if nodes is None and host is None and port is None:
+        nodes = os.getenv("TYPESENSE_NODES") or None
+    if nodes is not None:
+        return parse_nodes(nodes, protocol)
+
+    host = host or os.getenv("TYPESENSE_HOST", "localhost")
+    port = port or os.getenv("TYPESENSE_PORT", "8108")
+    return [{"host": host, "port": port, "protocol": protocol}]
+
 
 def get_client(
     host: str | None = None,
@@ -18,6 +97,8 @@ def get_client(
     api_key: str | None = None,
     protocol: str = "http",
     timeout: int = 10,
+    nodes: str | Sequence[NodeSpec] | None = None,
+    nearest_node: NodeSpec | None = None,
 ) -> typesense.Client:
     """
     Cria e retorna um cliente Typesense configurado.
@@ -28,15 +109,19 @@ def get_client(
         api_key: Chave de API (default: TYPESENSE_API_KEY env var)
         protocol: Protocolo de conexão (default: 'http')
         timeout: Timeout de conexão em segundos (default: 10)
+        nodes: Nós do cluster, como lista ou string separada por vírgulas;
+            tem precedência sobre host/port (default: TYPESENSE_NODES env var)
+        nearest_node: Nó usado preferencialmente enquanto estiver saudável,
+            com failover para `nodes` (default: TYPESENSE_NEAREST_NODE env var)
 
     Returns:
         typesense.Client: Cliente Typesense configurado
 
     Raises:
-        ValueError: Se api_key não for fornecida
+        ValueError: Se api_key não for fornecida ou algum nó for inválido
     """
-    host = host or os.getenv("TYPESENSE_HOST", "localhost")
-    port = port or os.getenv("TYPESENSE_PORT", "8108")
+    node_list = configured_nodes(host, port, nodes, protocol)
+    nearest_node = nearest_node or os.getenv("TYPESENSE_NEAREST_NODE") or None
     api_key = api_key or os.getenv(
         "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
     )
@@ -44,57 +129,82 @@ def get_client(
     if not api_key:
         raise ValueError("TYPESENSE_API_KEY deve ser configurada")
 
-    client = typesense.Client(
-        {
-            "nodes": [{"host": host, "port": port, "protocol": protocol}],
-            "api_key": api_key,
-            "connection_timeout_seconds": timeout,
-        }
-    )
+    config: dict[str, Any] = {
+        "nodes": node_list,
+        "api_key": api_key,
+        "connection_timeout_seconds": timeout,
+    }
+    if nearest_node:
+        config["nearest_node"] = parse_node(nearest_node, protocol)
+    if len(node_list) > 1:
+        # Uma tentativa por nó antes de desistir
+        config["num_retries"] = max(3, len(node_list))
+        config["retry_interval_seconds"] = 0.1
+
+    client = typesense.Client(config)
 
     return client
 
 
+def check_health(node: dict[str, str], timeout: float = 5) -> str | None:
+    """
+    Consulta /health de um nó.
+
+    Returns:
+        None se o nó está pronto, ou a descrição do problema
+    """
+    try:
+        response = requests.get(f"{node_url(node)}/health", timeout=timeout)
+    except Exception as e:
+        return str(e)
+    if response.status_code != 200:
+        return f"status {response.status_code}"
+    return None
+
+
 def wait_for_typesense(
     host: str | None = None,
     port: str | None = None,
     api_key: str | None = None,
     max_retries: int = 30,
     retry_interval: int = 2,
+    nodes: str | Sequence[NodeSpec] | None = None,
+    nearest_node: NodeSpec | None = None,
 ) -> typesense.Client | None:
     """
     Aguarda o servidor Typesense ficar pronto e retorna um cliente.
 
+    Num cluster, basta um nó pronto: o cliente faz failover para os demais.
+
     Args:
         host: Host do servidor Typesense
         port: Porta do servidor
         api_key: Chave de API
         max_retries: Número máximo de tentativas (default: 30)
         retry_interval: Intervalo entre tentativas em segundos (default: 2)
+        nodes: Nós do cluster (default: TYPESENSE_NODES env var)
+        nearest_node: Nó preferido pelo cliente retornado (ver get_client)
+            (default: TYPESENSE_NEAREST_NODE env var)
 
     Returns:
         typesense.Client se conectado, None se timeout
     """
-    host = host or os.getenv("TYPESENSE_HOST", "localhost")
-    port = port or os.getenv("TYPESENSE_PORT", "8108")
-
-    retry_count = 0
-
-    while retry_count < max_retries:
-        try:
-            health_url = f"http://{host}:{port}/health"
-            response = requests.get(health_url, timeout=5)
-
-            if response.status_code == 200:
-                logger.info("Typesense está pronto!")
-                return get_client(host=host, port=port, api_key=api_key)
-
-        except Exception as e:
-            retry_count += 1
-            logger.info(
-                f"Typesense não está pronto, tentativa {retry_count}/{max_retries}: {e}"
+    node_list = configured_nodes(host, port, nodes)
+
+    for attempt in range(1, max_retries + 1):
+        problems = {node_url(node): check_health(node) for node in node_list}
+        ready = [url for url, problem in problems.items() if problem is None]
+        if ready:
+            logger.info(f"Typesense está pronto! ({len(ready)}/{len(node_list)} nós)")
+            return get_client(
+                api_key=api_key, nodes=node_list, nearest_node=nearest_node
             )
-            time.sleep(retry_interval)
+
+        details = "; ".join(f"{url}: {problem}" for url, problem in problems.items())
+        logger.info(
+            f"Typesense não está pronto, tentativa {attempt}/{max_retries}: {details}"
+        )
+        time.sleep(retry_interval)
 
     logger.error("Typesense não ficou pronto após todas as tentativas")
     return None
@@ -0,0 +1,272 @@
+"""
+Cluster Typesense com health check em background e roteamento por nó.
+
+O cliente do pacote typesense faz failover entre nós, mas escolhe o nó em
+round-robin e só descobre um nó lento quando a requisição falha.
+TypesenseCluster consulta periodicamente /health (latência) e /debug (papel
+no Raft) de cada nó e entrega clientes já apontados para o nó certo:
+
+    nodes = "http://ts1:8108,http://ts2:8108,http://ts3:8108"
+    with TypesenseCluster(nodes) as cluster:
+        cluster.read_client().collections["news"].documents.search(params)
+        index_documents(cluster.write_client(), df)
+
+Leituras vão para nearest_node enquanto estiver saudável; senão, para um nó
+sorteado com peso inversamente proporcional à latência. Escritas vão para o
+líder (um seguidor também aceita, mas repassa ao líder). Cada cliente mantém
+os demais nós como failover.
+"""
+
+import dataclasses
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import requests
+import typesense
+
+from typesense_dgb.client import (
+    NodeSpec,
+    check_health,
+    configured_nodes,
+    get_client,
+    node_url,
+    parse_node,
+)
+
+logger = logging.getLogger(__name__)
+
+# Estado do Raft informado em /debug pelo nó líder
+LEADER_STATE = 1
+
+# Latência mínima considerada no sorteio, para um nó muito rápido não
+# receber todas as leituras
+MIN_LATENCY = 0.001
+
+
+@dataclasses.dataclass
+class NodeStatus:
+    """Estado de um nó no último health check."""
+
+    node: dict[str, str]
+    healthy: bool = True
+    latency: float | None = None
+    leader: bool = False
+    failures: int = 0
+    error: str | None = None
+
+    @property
+    def url(self) -> str:
+        return node_url(self.node)
+
+
+class TypesenseCluster:
+    """
+    Clientes Typesense por nó, com leitura ponderada por latência e escrita no líder.
+
+    Os nós começam como saudáveis, sem latência conhecida: até o primeiro
+    check(), leituras são sorteadas de forma uniforme.
+
+    Args:
+        nodes: Nós do cluster, como lista ou string separada por vírgulas
+            (default: TYPESENSE_NODES, ou TYPESENSE_HOST/TYPESENSE_PORT)
+        nearest_node: Nó preferido para leituras, ex. o balanceador da região
+            (default: TYPESENSE_NEAREST_NODE env var)
+        api_key: Chave de API, usada também em /debug (default: TYPESENSE_API_KEY)
+        timeout: Timeout das requisições dos clientes em segundos (default: 10)
+        check_interval: Intervalo entre health checks em background, em
+            segundos (default: 5.0)
+        check_timeout: Timeout de cada health check em segundos; um nó mais
+            lento que isso é tratado como indisponível (default: 2.0)
+        smoothing: Peso da última medição na média móvel da latência
+            (default: 0.3)
+        rng: Gerador usado no sorteio dos nós de leitura (default: random.Random())
+    """
+
+    def __init__(
+        self,
+        nodes: str | Sequence[NodeSpec] | None = None,
+        nearest_node: NodeSpec | None = None,
+        api_key: str | None = None,
+        timeout: int = 10,
+        check_interval: float = 5.0,
+        check_timeout: float = 2.0,
+        smoothing: float = 0.3,
+        rng: random.Random | None = None,
+    ) -> None:
+        nearest_node = nearest_node or os.getenv("TYPESENSE_NEAREST_NODE") or None
+        self.api_key = api_key or os.getenv(
+            "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
+        )
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.smoothing = smoothing
+        self.rng = rng or random.Random()
+
+        self.nodes = [NodeStatus(node) for node in configured_nodes(nodes=nodes)]
+        self.nearest = NodeStatus(parse_node(nearest_node)) if nearest_node else None
+        self._clients: dict[str, typesense.Client] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # Health check -------------------------------------------------------------
+
+    def _is_leader(self, status: NodeStatus) -> bool:
+        try:
+            response = requests.get(
+                f"{status.url}/debug",
+                headers={typesense.api_call.ApiCall.API_KEY_HEADER_NAME: self.api_key},
+                timeout=self.check_timeout,
+            )
+            return response.ok and response.json().get("state") == LEADER_STATE
+        except Exception as e:
+            logger.debug(f"Falha ao consultar /debug de {status.url}: {e}")
+            return False
+
+    def _check_node(self, status: NodeStatus) -> None:
+        start = time.perf_counter()
+        error = check_health(status.node, timeout=self.check_timeout)
+        elapsed = time.perf_counter() - start
+        leader = self._is_leader(status) if error is None else False
+
+        with self._lock:
+            if error is None and not status.healthy:
+                logger.info(f"Nó {status.url} voltou a responder")
+            elif error is not None and status.healthy:
+                logger.warning(f"Nó {status.url} indisponível: {error}")
+            status.healthy = error is None
+            status.error = error
+            status.leader = leader
+            if error is None:
+                status.failures = 0
+                status.latency = (
+                    elapsed
+                    if status.latency is None
+                    else self.smoothing * elapsed
+                    + (1 - self.smoothing) * status.latency
+                )
+            else:
+                status.failures += 1
+
+    def check(self) -> None:
+        """Executa um health check de todos os nós (e do nearest_node)."""
+        statuses = self.nodes + ([self.nearest] if self.nearest else [])
+        threads = [
+            threading.Thread(target=self._check_node, args=(status,), daemon=True)
+            for status in statuses
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:  # pragma: no cover - defensivo
+                logger.warning(f"Falha no health check do cluster: {e}")
+
+    def start(self) -> "TypesenseCluster":
+        """Faz um health check e inicia os seguintes numa thread daemon."""
+        self.check()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="typesense-health", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Para os health checks em background."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "TypesenseCluster":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # Seleção de nós ---------------------------------------------------------
+
+    def healthy_nodes(self) -> list[NodeStatus]:
+        """Nós saudáveis, do mais rápido para o mais lento."""
+        with self._lock:
+            healthy = [status for status in self.nodes if status.healthy]
+        return sorted(
+            healthy,
+            key=lambda status: (
+                status.latency if status.latency is not None else float("inf")
+            ),
+        )
+
+    def leader(self) -> NodeStatus | None:
+        """Líder saudável do cluster, ou None se nenhum nó se declarou líder."""
+        with self._lock:
+            return next(
+                (status for status in self.nodes if status.healthy and status.leader),
+                None,
+            )
+
+    def read_node(self) -> NodeStatus:
+        """
+        Nó para a próxima leitura.
+
+        nearest_node se estiver saudável; senão um nó saudável sorteado com
+        peso 1/latência; se nenhum estiver saudável, o primeiro nó (o cliente
+        ainda tenta os demais). Nós ainda sem latência medida (recém
+        adicionados ou recuperados) recebem o peso médio dos medidos.
+        """
+        if self.nearest is not None and self.nearest.healthy:
+            return self.nearest
+        healthy = self.healthy_nodes()
+        if not healthy:
+            return self.nodes[0]
+        measured = {
+            status.url: 1 / max(status.latency, MIN_LATENCY)
+            for status in healthy
+            if status.latency is not None
+        }
+        default = sum(measured.values()) / len(measured) if measured else 1.0
+        weights = [measured.get(status.url, default) for status in healthy]
+        return self.rng.choices(healthy, weights=weights)[0]
+
+    def write_node(self) -> NodeStatus:
+        """Nó para escritas: o líder, ou o nó saudável mais rápido sem líder."""
+        leader = self.leader()
+        if leader is not None:
+            return leader
+        healthy = self.healthy_nodes()
+        return healthy[0] if healthy else self.nodes[0]
+
+    def client_for(self, status: NodeStatus) -> typesense.Client:
+        """Cliente que usa o nó dado e, se ele falhar, os demais nós do cluster."""
+        with self._lock:
+            client = self._clients.get(status.url)
+            if client is None:
+                client = get_client(
+                    api_key=self.api_key,
+                    timeout=self.timeout,
+                    nodes=[other.node for other in self.nodes],
+                    nearest_node=status.node,
+                )
+                self._clients[status.url] = client
+            return client
+
+    def read_client(self) -> typesense.Client:
+        """Cliente para buscas, apontado para read_node()."""
+        return self.client_for(self.read_node())
+
+    def write_client(self) -> typesense.Client:
+        """Cliente para imports e demais escritas, apontado para write_node()."""
+        return self.client_for(self.write_node())
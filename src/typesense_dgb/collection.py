@@ -3,7 +3,9 @@ Gerenciamento de coleções Typesense.
 """
 
 import logging
+import re
 import time
+from datetime import datetime, timezone
 from typing import Any
 
 import typesense
@@ -255,3 +257,109 @@ def list_collections(client: typesense.Client) -> list[dict[str, Any]]:
     except Exception as e:
         logger.error(f"Erro ao listar coleções: {e}")
         return []
+
+
+def versioned_collection_name(
+    alias: str = COLLECTION_NAME, now: datetime | None = None
+) -> str:
+    """
+    Gera o nome de uma versão da coleção para reload blue/green.
+
+    Args:
+        alias: Nome do alias servido aos clientes (default: 'news')
+        now: Momento de criação (default: agora, em UTC)
+
+    Returns:
+        Nome no formato '<alias>_<YYYYmmddHHMMSS>'
+    """
+    now = now or datetime.now(timezone.utc)
+    return f"{alias}_{now.strftime('%Y%m%d%H%M%S')}"
+
+
+def get_alias_target(
+    client: typesense.Client, alias: str = COLLECTION_NAME
+) -> str | None:
+    """
+    Retorna a coleção para a qual o alias aponta.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+
+    Returns:
+        Nome da coleção, ou None se o alias não existir
+    """
+    try:
+        return client.aliases[alias].retrieve()["collection_name"]
+    except ObjectNotFound:
+        return None
+
+
+def point_alias(
+    client: typesense.Client, collection_name: str, alias: str = COLLECTION_NAME
+) -> str | None:
+    """
+    Aponta o alias para a coleção de forma atômica.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Coleção que passará a ser servida
+        alias: Nome do alias
+
+    Returns:
+        Coleção para a qual o alias apontava antes, ou None
+    """
+    previous = get_alias_target(client, alias)
+    client.aliases.upsert(alias, {"collection_name": collection_name})
+    logger.info(
+        f"Alias '{alias}' agora aponta para '{collection_name}'"
+        + (f" (antes: '{previous}')" if previous else "")
+    )
+    return previous
+
+
+def list_collection_versions(
+    client: typesense.Client, alias: str = COLLECTION_NAME
+) -> list[str]:
+    """
+    Lista as versões '<alias>_<timestamp>' existentes, da mais antiga à mais nova.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+
+    Returns:
+        Nomes das coleções versionadas
+    """
+    pattern = re.compile(rf"^{re.escape(alias)}_\d{{14}}$")
+    names = [collection["name"] for collection in client.collections.retrieve()]
+    return sorted(name for name in names if pattern.match(name))
+
+
+def cleanup_collection_versions(
+    client: typesense.Client, alias: str = COLLECTION_NAME, keep: int = 2
+) -> list[str]:
+    """
+    Remove versões antigas da coleção, mantendo as `keep` mais recentes.
+
+    A coleção servida pelo alias nunca é removida.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+        keep: Número de versões a manter, incluindo a atual (default: 2)
+
+    Returns:
+        Nomes das coleções removidas
+    """
+    current = get_alias_target(client, alias)
+    versions = list_collection_versions(client, alias)
+    stale = [
+        name for name in versions[: max(len(versions) - keep, 0)] if name != current
+    ]
+
+    for name in stale:
+        logger.info(f"Removendo versão antiga da coleção: '{name}'")
+        client.collections[name].delete()
+
+    return stale
@@ -3,84 +3,385 @@ Download e processamento do dataset govbrnews.
 """
 
 import logging
+import time
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
+import numpy as np
 import pandas as pd
-from datasets import load_dataset
+import pyarrow as pa
+import pyarrow.compute as pc
+from datasets import Dataset, load_dataset
 
-from typesense_dgb.utils import calculate_published_week
+from typesense_dgb.cache import (
+    ROW_COLUMN,
+    cache_path,
+    dataset_revision,
+    iter_processed_cache,
+    read_processed_cache,
+    write_processed_cache,
+)
+from typesense_dgb.collection import COLLECTION_SCHEMA
+from typesense_dgb.metrics import PipelineMetrics
+from typesense_dgb.stats import NewsStats
+from typesense_dgb.utils import add_derived_columns, parse_dates
 
 logger = logging.getLogger(__name__)
 
 DATASET_PATH = "nitaibezerra/govbrnews"
 
+# Registros por bloco no modo streaming
+STREAM_CHUNK_SIZE = 5000
+
+# Campos do schema calculados em add_derived_columns (não vêm do dataset)
+DERIVED_FIELDS = {"published_year", "published_month", "published_week"}
+
+# Colunas do dataset usadas para id, timestamps e tags
+SOURCE_COLUMNS = ["unique_id", "published_at", "extracted_at", "tags"]
+
+
+def required_columns(schema: dict[str, Any] = COLLECTION_SCHEMA) -> list[str]:
+    """
+    Colunas do dataset necessárias para indexar os campos do schema.
+
+    Returns:
+        SOURCE_COLUMNS seguidas dos campos do schema que vêm direto do dataset
+    """
+    fields = [field["name"] for field in schema["fields"]]
+    return SOURCE_COLUMNS + [
+        name
+        for name in fields
+        if name not in DERIVED_FIELDS and name not in SOURCE_COLUMNS
+    ]
+
+
+def _project_columns(dataset: Dataset, columns: list[str]) -> Dataset:
+    """
+    Restringe o dataset às colunas informadas, antes de qualquer materialização.
+
+    Registra quantas colunas e quantos bytes (tamanho em Arrow) deixam de ser
+    carregados.
+    """
+    keep = [name for name in columns if name in dataset.column_names]
+    dropped = [name for name in dataset.column_names if name not in keep]
+    if not dropped:
+        return dataset
+
+    saved = sum(dataset.data.column(name).nbytes for name in dropped)
+    logger.info(
+        f"Projeção de colunas: {len(keep)}/{len(dataset.column_names)} carregadas, "
+        f"{saved / 1024 / 1024:.1f} MB não materializados ({', '.join(dropped)})"
+    )
+    return dataset.select_columns(keep)
+
+
+def _cutoff_date(days: int) -> datetime:
+    """Data de corte do modo incremental (timezone de Brasília, UTC-3)."""
+    return datetime.now(timezone(timedelta(hours=-3))) - timedelta(days=days)
+
+
+def _recent_positions(dataset: Dataset, cutoff_date: datetime) -> np.ndarray:
+    """
+    Posições das linhas publicadas a partir de cutoff_date.
+
+    Lê apenas a coluna published_at da tabela Arrow (memory-mapped): colunas
+    timestamp com timezone são comparadas direto no Arrow; as demais são
+    convertidas como em parse_dates. O resto do dataset não é materializado.
+    """
+    column = dataset.data.column("published_at")
+    if pa.types.is_timestamp(column.type) and column.type.tz is not None:
+        cutoff = pa.scalar(cutoff_date).cast(column.type)
+        mask = pc.fill_null(pc.greater_equal(column, cutoff), False)
+        return np.flatnonzero(mask.to_numpy())
+
+    published_at = pd.to_datetime(column.to_pandas(), errors="coerce")
+    return np.flatnonzero((published_at >= cutoff_date).to_numpy())
+
+
+def _select_recent(dataset: Dataset, days: int) -> tuple[Dataset, np.ndarray]:
+    """
+    Seleciona no Arrow as linhas do modo incremental, antes de ir para pandas.
+
+    Returns:
+        Tupla (dataset só com as linhas recentes, posições originais dessas linhas)
+    """
+    cutoff_date = _cutoff_date(days)
+    positions = _recent_positions(dataset, cutoff_date)
+    logger.info(f"Modo incremental: Filtrando dados dos últimos {days} dias")
+    logger.info(f"Data de corte: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(
+        f"Registros após filtro: {len(positions)} (removidos {len(dataset) - len(positions)} registros antigos)"
+    )
+    return dataset.select(positions), positions
+
+
+def _iter_processed_chunks(
+    dataset: Dataset,
+    mode: str,
+    days: int,
+    chunk_size: int,
+    metrics: PipelineMetrics,
+) -> Iterator[pd.DataFrame]:
+    """
+    Processa o dataset em blocos de até chunk_size registros.
+
+    Cada bloco é lido do cache Arrow (memory-mapped) do HuggingFace, de modo
+    que a memória fica limitada pelo tamanho do bloco e não do dataset.
+    O índice dos blocos continua a numeração global das linhas.
+    """
+    total = len(dataset)
+    positions = np.arange(total)
+    if mode == "incremental":
+        with metrics.stage("filter", docs=total):
+            dataset, positions = _select_recent(dataset, days)
+
+    offset = 0
+    chunks = iter(dataset.with_format("pandas").iter(batch_size=chunk_size))
+    while True:
+        # A leitura do bloco (Arrow -> pandas) conta como processamento
+        start = time.perf_counter()
+        df = next(chunks, None)
+        if df is None:
+            break
+        df.index = pd.Index(positions[offset : offset + len(df)])
+        offset += len(df)
+        df = add_derived_columns(parse_dates(df))
+        metrics.record("process", time.perf_counter() - start, len(df))
+        yield df
+
+    logger.info(f"Streaming concluído: {offset}/{total} registros processados")
+
+
+def _iter_with_stats(
+    chunks: Iterator[pd.DataFrame], stats: NewsStats, metrics: PipelineMetrics
+) -> Iterator[pd.DataFrame]:
+    """Soma as contagens de cada bloco à medida que os blocos são consumidos."""
+    for df in chunks:
+        with metrics.stage("stats", docs=len(df)):
+            stats.add(df)
+        yield df
+
+
+def _with_stats(
+    result: pd.DataFrame | Iterator[pd.DataFrame],
+    stats: NewsStats | None,
+    metrics: PipelineMetrics,
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Acumula em stats as contagens do resultado de download_and_process_dataset."""
+    if stats is None:
+        return result
+    if isinstance(result, pd.DataFrame):
+        with metrics.stage("stats", docs=len(result)):
+            stats.add(result)
+        return result
+    return _iter_with_stats(result, stats, metrics)
+
+
+def iter_arrow_batches(
+    mode: str = "full",
+    days: int = 7,
+    dataset_path: str = DATASET_PATH,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    columns: list[str] | None = None,
+    metrics: PipelineMetrics | None = None,
+) -> Iterator[pa.Table]:
+    """
+    Percorre o dataset como fatias Arrow do cache memory-mapped do HuggingFace.
+
+    Nenhuma fatia passa por pandas: as colunas derivadas são calculadas na
+    preparação dos documentos (prepare_arrow_documents). Cada fatia traz a
+    coluna ROW_COLUMN com a posição original das linhas.
+
+    Args:
+        mode: 'full' para dataset completo ou 'incremental' para dados recentes
+        days: Número de dias para olhar para trás no modo incremental (default: 7)
+        dataset_path: Caminho do dataset no HuggingFace
+        chunk_size: Registros por fatia (default: 5000)
+        columns: Colunas do dataset a carregar (default: None, required_columns())
+        metrics: Acumula os tempos de download e filtro (default: None)
+
+    Yields:
+        Tabelas Arrow com até chunk_size registros
+    """
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    logger.info(f"Baixando dataset govbrnews do HuggingFace (modo: {mode}, Arrow)...")
+    with metrics.stage("download") as stage:
+        dataset = load_dataset(dataset_path, split="train")
+        stage["docs"] = len(dataset)
+    logger.info(f"Dataset baixado com sucesso. Total de registros: {len(dataset)}")
+    dataset = _project_columns(
+        dataset, columns if columns is not None else required_columns()
+    )
+
+    total = len(dataset)
+    positions = np.arange(total)
+    if mode == "incremental":
+        with metrics.stage("filter", docs=total):
+            dataset, positions = _select_recent(dataset, days)
+
+    offset = 0
+    for table in dataset.with_format("arrow").iter(batch_size=chunk_size):
+        table = table.append_column(
+            ROW_COLUMN, pa.array(positions[offset : offset + len(table)])
+        )
+        offset += len(table)
+        yield table
+
+    logger.info(f"Leitura Arrow concluída: {offset}/{total} registros")
+
+
+def _load_from_cache(
+    cache_dir: str,
+    dataset_path: str,
+    mode: str,
+    days: int,
+    stream: bool,
+    chunk_size: int,
+    columns: list[str],
+    metrics: PipelineMetrics,
+) -> pd.DataFrame | Iterator[pd.DataFrame] | None:
+    """
+    Carrega o dataset processado do cache Parquet, criando-o se necessário.
+
+    Returns:
+        Mesmo retorno de download_and_process_dataset, ou None se a revisão
+        do dataset não puder ser determinada (cache desativado nesta carga)
+    """
+    revision = dataset_revision(dataset_path)
+    if revision is None:
+        return None
+
+    path = cache_path(cache_dir, dataset_path, revision, columns)
+    if path.exists():
+        logger.info(f"Usando cache do dataset processado (revisão {revision[:8]})")
+    else:
+        logger.info(
+            f"Cache ausente para a revisão {revision[:8]}; processando dataset completo"
+        )
+        with metrics.stage("download") as stage:
+            dataset = load_dataset(dataset_path, split="train", revision=revision)
+            stage["docs"] = len(dataset)
+        dataset = _project_columns(dataset, columns)
+        with metrics.stage("process", docs=len(dataset)):
+            df = add_derived_columns(parse_dates(dataset.to_pandas()))
+        with metrics.stage("cache_write", docs=len(df)):
+            write_processed_cache(df, path)
+        if mode == "full" and not stream:
+            return df
+
+    cutoff_date = _cutoff_date(days) if mode == "incremental" else None
+    if stream:
+        return iter_processed_cache(path, cutoff_date, chunk_size)
+
+    with metrics.stage("cache_read") as stage:
+        df = read_processed_cache(path, cutoff_date)
+        stage["docs"] = len(df)
+    logger.info(f"Registros lidos do cache: {len(df)}")
+    return df
+
 
 def download_and_process_dataset(
     mode: str = "full",
     days: int = 7,
     dataset_path: str = DATASET_PATH,
-) -> pd.DataFrame:
+    stream: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    cache_dir: str | None = None,
+    columns: list[str] | None = None,
+    metrics: PipelineMetrics | None = None,
+    stats: NewsStats | None = None,
+) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """
     Baixa o dataset do HuggingFace e converte para pandas DataFrame.
 
+    Com cache_dir, o dataset processado é guardado em Parquet particionado por
+    ano/mês e reaproveitado enquanto a revisão no HuggingFace não mudar; o
+    modo incremental lê só as partições recentes.
+
     Args:
         mode: 'full' para dataset completo ou 'incremental' para dados recentes
         days: Número de dias para olhar para trás no modo incremental (default: 7)
         dataset_path: Caminho do dataset no HuggingFace
+        stream: Se True, retorna um iterador de DataFrames processados em blocos
+            em vez de materializar o dataset inteiro (default: False)
+        chunk_size: Registros por bloco no modo streaming (default: 5000)
+        cache_dir: Diretório do cache do dataset processado (default: None,
+            sem cache)
+        columns: Colunas do dataset a carregar; as demais nunca são
+            materializadas (default: None, required_columns() do schema)
+        metrics: Acumula os tempos de download, filtro, processamento e cache
+            (default: None, sem métricas)
+        stats: Acumula as contagens por facet dos registros processados (ver
+            write_stats); só no modo full, em que o pipeline vê o dataset
+            inteiro. No modo streaming, as contagens ficam completas quando o
+            iterador termina (default: None)
 
     Returns:
-        DataFrame processado com colunas adicionais para indexação
+        DataFrame processado com colunas adicionais para indexação, ou um
+        iterador de DataFrames processados se stream=True
 
     Raises:
         Exception: Se ocorrer erro no download ou processamento
     """
+    columns = columns if columns is not None else required_columns()
+    metrics = metrics if metrics is not None else PipelineMetrics()
+    stats = stats if mode == "full" else None
+
     try:
+        if cache_dir:
+            cached = _load_from_cache(
+                cache_dir,
+                dataset_path,
+                mode,
+                days,
+                stream,
+                chunk_size,
+                columns,
+                metrics,
+            )
+            if cached is not None:
+                return _with_stats(cached, stats, metrics)
+
         logger.info(f"Baixando dataset govbrnews do HuggingFace (modo: {mode})...")
-        dataset = load_dataset(dataset_path, split="train")
+        with metrics.stage("download") as stage:
+            dataset = load_dataset(dataset_path, split="train")
+            stage["docs"] = len(dataset)
         logger.info(f"Dataset baixado com sucesso. Total de registros: {len(dataset)}")
+        dataset = _project_columns(dataset, columns)
 
-        # Converte para pandas DataFrame
-        df = dataset.to_pandas()
-
-        # Converte published_at e extracted_at para datetime
-        df["published_at"] = pd.to_datetime(df["published_at"], errors="coerce")
-        df["extracted_at"] = pd.to_datetime(df["extracted_at"], errors="coerce")
+        if stream:
+            logger.info(f"Modo streaming: processando em blocos de {chunk_size}")
+            return _with_stats(
+                _iter_processed_chunks(dataset, mode, days, chunk_size, metrics),
+                stats,
+                metrics,
+            )
 
-        # Filtra para modo incremental
+        # Filtra para modo incremental no Arrow, antes de converter para pandas
+        positions = None
         if mode == "incremental":
-            # Usa datetime com timezone (Brasília UTC-3)
-            cutoff_date = datetime.now(timezone(timedelta(hours=-3))) - timedelta(
-                days=days
-            )
-            initial_count = len(df)
-            df = df[df["published_at"] >= cutoff_date]
-            logger.info(f"Modo incremental: Filtrando dados dos últimos {days} dias")
-            logger.info(f"Data de corte: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
-            logger.info(
-                f"Registros após filtro: {len(df)} (removidos {initial_count - len(df)} registros antigos)"
-            )
+            with metrics.stage("filter", docs=len(dataset)):
+                dataset, positions = _select_recent(dataset, days)
+
+        with metrics.stage("process", docs=len(dataset)):
+            # Converte para pandas DataFrame (mantendo as posições originais)
+            df = dataset.to_pandas()
+            if positions is not None:
+                df.index = pd.Index(positions)
 
-            if len(df) == 0:
+            # Converte published_at e extracted_at para datetime
+            df = parse_dates(df)
+
+            if len(df) == 0 and mode == "incremental":
                 logger.warning(
                     f"Nenhum registro encontrado nos últimos {days} dias. Nada a processar."
                 )
                 return df
 
-        # Extrai ano e mês para faceting
-        df["published_year"] = df["published_at"].dt.year
-        df["published_month"] = df["published_at"].dt.month
-
-        # Converte datetime para Unix timestamp (segundos) para Typesense
-        df["published_at_ts"] = df["published_at"].apply(
-            lambda x: int(x.timestamp()) if pd.notna(x) else 0
-        )
-        df["extracted_at_ts"] = df["extracted_at"].apply(
-            lambda x: int(x.timestamp()) if pd.notna(x) else 0
-        )
-
-        # Calcula semana ISO 8601 (formato YYYYWW)
-        logger.info("Calculando semanas ISO 8601 para otimização temporal...")
-        df["published_week"] = df["published_at_ts"].apply(calculate_published_week)
+            # Extrai ano/mês, timestamps e semana ISO 8601 (formato YYYYWW)
+            logger.info("Calculando colunas derivadas e semanas ISO 8601...")
+            df = add_derived_columns(df)
 
         # Log de estatísticas
         valid_weeks = df["published_week"].notna().sum()
@@ -89,7 +390,7 @@ def download_and_process_dataset(
         )
 
         logger.info("Dataset processado com sucesso")
-        return df
+        return _with_stats(df, stats, metrics)
 
     except Exception as e:
         logger.error(f"Erro ao baixar/processar dataset: {e}")
@@ -0,0 +1,722 @@
+"""
+Servidor Typesense falso, em processo, para testes e benchmarks sem rede.
+
+Implementa via HTTP o subconjunto da API usado por este pacote: health,
+debug (papel do nó no cluster), CRUD de coleções e aliases, import JSONL
+com resultado por linha, remoção por filtro, busca (q, filter_by, sort_by,
+facet_by, paginação) e multi_search, sobre um índice em memória. Latência
+e falhas podem ser injetadas de forma determinística.
+
+    with FakeTypesenseServer(latency=0.01) as server:
+        client = server.client()
+        create_collection(client)
+        server.inject_failure(503, count=1, path="/documents/import")
+        index_documents(client, df, retry_policy=RetryPolicy(base_delay=0))
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import typesense
+
+logger = logging.getLogger(__name__)
+
+# Operadores de filter_by, do mais longo para o mais curto
+FILTER_OPERATORS = [":!=", ":>=", ":<=", ":=", ":>", ":<", ":"]
+
+# Tipos inteiros aceitos no schema
+INT_TYPES = {"int32", "int64"}
+
+
+class FakeTypesenseError(Exception):
+    """Erro de API com status HTTP, convertido em resposta {'message': ...}."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _split_top_level(text: str, separator: str) -> list[str]:
+    """Divide text por separator, ignorando ocorrências dentro de [] e ``."""
+    parts, depth, quoted, start = [], 0, False, 0
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "`":
+            quoted = not quoted
+        elif not quoted and char == "[":
+            depth += 1
+        elif not quoted and char == "]":
+            depth -= 1
+        elif not quoted and depth == 0 and text.startswith(separator, index):
+            parts.append(text[start:index])
+            index += len(separator)
+            start = index
+            continue
+        index += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _parse_value(raw: str) -> str | int | float:
+    """Converte um valor de filtro, removendo crases e reconhecendo números."""
+    raw = raw.strip()
+    if raw.startswith("`") and raw.endswith("`"):
+        return raw[1:-1]
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def _compile_clause(clause: str, fields: set[str] | None = None):
+    """Compila uma condição 'campo:op valor' de filter_by num predicado."""
+    for operator in FILTER_OPERATORS:
+        field, found, raw = clause.partition(operator)
+        if found and field and " " not in field.strip():
+            break
+    else:
+        raise FakeTypesenseError(400, f"Could not parse the filter query: `{clause}`")
+
+    field = field.strip()
+    if fields is not None and field != "id" and field not in fields:
+        raise FakeTypesenseError(
+            404, f"Could not find a filter field named `{field}` in the schema."
+        )
+    raw = raw.strip()
+    if raw.startswith("["):
+        body = raw[1:-1]
+        if ".." in body and "`" not in body:
+            low, high = (_parse_value(value) for value in body.split("..", 1))
+            return lambda doc: any(
+                low <= value <= high for value in _values(doc, field)
+            )
+        options = {_parse_value(value) for value in _split_top_level(body, ",")}
+
+        def matches(doc: dict[str, Any]) -> bool:
+            return any(value in options for value in _values(doc, field))
+
+        return (lambda doc: not matches(doc)) if operator == ":!=" else matches
+
+    target = _parse_value(raw)
+    compare = {
+        ":!=": lambda value: value != target,
+        ":>=": lambda value: value >= target,
+        ":<=": lambda value: value <= target,
+        ":>": lambda value: value > target,
+        ":<": lambda value: value < target,
+    }.get(operator, lambda value: value == target)
+
+    if operator == ":!=":
+        return lambda doc: all(compare(value) for value in _values(doc, field))
+    return lambda doc: any(_safe(compare, value) for value in _values(doc, field))
+
+
+def _safe(compare, value) -> bool:
+    """Compara ignorando tipos incompatíveis (ex.: str com int)."""
+    try:
+        return compare(value)
+    except TypeError:
+        return False
+
+
+def _values(document: dict[str, Any], field: str) -> list[Any]:
+    """Valores de um campo, tratando arrays e campos ausentes."""
+    value = document.get(field)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def compile_filter(filter_by: str | None, fields: set[str] | None = None):
+    """
+    Compila uma expressão filter_by (condições unidas por &&) num predicado.
+
+    Suporta =, !=, >, >=, <, <=, listas [a,b], intervalos [a..b] e valores
+    entre crases. Não suporta || nem parênteses. Com fields, campos fora do
+    schema (exceto id) geram erro 404, como no Typesense.
+    """
+    if not filter_by:
+        return lambda doc: True
+    predicates = [
+        _compile_clause(part, fields) for part in _split_top_level(filter_by, "&&")
+    ]
+    return lambda doc: all(predicate(doc) for predicate in predicates)
+
+
+class _Collection:
+    """Coleção em memória: schema e documentos por id, em ordem de inserção."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self.schema = schema
+        self.fields = {field["name"]: field for field in schema.get("fields", [])}
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.created_at = int(time.time())
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "name": self.schema["name"],
+            "fields": self.schema.get("fields", []),
+            "default_sorting_field": self.schema.get("default_sorting_field", ""),
+            "num_documents": len(self.documents),
+            "created_at": self.created_at,
+        }
+
+    def validate(self, document: dict[str, Any]) -> None:
+        """Confere campos obrigatórios e tipos básicos, como o Typesense."""
+        for name, field in self.fields.items():
+            value = document.get(name)
+            if value is None:
+                if not field.get("optional") and name != "id":
+                    raise FakeTypesenseError(
+                        400,
+                        f"Field `{name}` has been declared in the schema, "
+                        "but is not found in the document.",
+                    )
+                continue
+            kind = field.get("type")
+            valid = (
+                (kind in INT_TYPES and isinstance(value, int))
+                or (kind == "string" and isinstance(value, str))
+                or (
+                    kind == "string[]"
+                    and isinstance(value, list)
+                    and all(isinstance(item, str) for item in value)
+                )
+                or kind not in INT_TYPES | {"string", "string[]"}
+            )
+            if not valid or isinstance(value, bool) and kind in INT_TYPES:
+                raise FakeTypesenseError(400, f"Field `{name}` must be {kind}.")
+
+
+class FakeTypesenseServer:
+    """
+    Servidor HTTP em thread que imita o Typesense para testes e benchmarks.
+
+    Args:
+        api_key: Chave exigida no header X-TYPESENSE-API-KEY (default: 'test')
+        latency: Atraso em segundos aplicado a cada requisição (default: 0.0)
+        import_latency_per_doc: Atraso adicional por documento importado, em
+            segundos (default: 0.0)
+        host: Interface de escuta (default: '127.0.0.1')
+        port: Porta; 0 escolhe uma porta livre (default: 0)
+        leader: Papel informado em /debug; False imita um seguidor do cluster
+            (default: True)
+    """
+
+    def __init__(
+        self,
+        api_key: str = "test",
+        latency: float = 0.0,
+        import_latency_per_doc: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        leader: bool = True,
+    ) -> None:
+        self.api_key = api_key
+        self.leader = leader
+        self.latency = latency
+        self.import_latency_per_doc = import_latency_per_doc
+        self.collections: dict[str, _Collection] = {}
+        self.aliases: dict[str, str] = {}
+
+        # Injeção de falhas e métricas
+        self._failures: deque[tuple[str, int]] = deque()
+        self._rejections: dict[str, list[Any]] = {}
+        # Requisições por rota, ex. 'POST /collections/{name}/documents/import'
+        self.requests: Counter[str] = Counter()
+        self.import_batches: list[int] = []
+        self.max_concurrent_imports = 0
+        self._concurrent_imports = 0
+
+        self._lock = threading.RLock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeTypesenseServer":
+        """Inicia o servidor numa thread daemon."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name="fake-typesense", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Para o servidor e libera a porta."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeTypesenseServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def client(self, timeout: int = 10) -> typesense.Client:
+        """Cliente typesense apontando para este servidor, sem retries internos."""
+        return typesense.Client(
+            {
+                "nodes": [
+                    {"host": self.host, "port": str(self.port), "protocol": "http"}
+                ],
+                "api_key": self.api_key,
+                "connection_timeout_seconds": timeout,
+                "num_retries": 0,
+                "retry_interval_seconds": 0,
+            }
+        )
+
+    def inject_failure(self, status: int = 503, count: int = 1, path: str = "") -> None:
+        """
+        Faz as próximas `count` requisições cujo caminho contém `path` falharem.
+
+        Args:
+            status: Status HTTP da falha (default: 503)
+            count: Número de requisições afetadas (default: 1)
+            path: Trecho do caminho, ex. '/documents/import' (default: todas)
+        """
+        with self._lock:
+            self._failures.extend([(path, status)] * count)
+
+    def reject_documents(
+        self,
+        ids: list[str],
+        code: int = 400,
+        error: str = "Rejected by fake server",
+        times: int | None = None,
+    ) -> None:
+        """
+        Faz o import desses ids falhar na linha correspondente.
+
+        Args:
+            ids: Ids dos documentos
+            code: Código da linha com falha (ex.: 400 permanente, 503 transitória)
+            error: Mensagem de erro da linha
+            times: Número de vezes que cada id falha; None falha sempre
+        """
+        with self._lock:
+            for doc_id in ids:
+                self._rejections[doc_id] = [code, error, times]
+
+    # Processamento das requisições ------------------------------------------
+
+    def _take_failure(self, path: str) -> int | None:
+        with self._lock:
+            for index, (fragment, status) in enumerate(self._failures):
+                if fragment in path:
+                    del self._failures[index]
+                    return status
+        return None
+
+    def _collection(self, name: str) -> _Collection:
+        # Uma coleção real tem precedência sobre um alias de mesmo nome
+        name = name if name in self.collections else self.aliases.get(name, name)
+        collection = self.collections.get(name)
+        if collection is None:
+            raise FakeTypesenseError(404, f"Collection `{name}` not found.")
+        return collection
+
+    def handle(
+        self, method: str, path: str, params: dict[str, str], body: bytes
+    ) -> tuple[int, Any]:
+        """
+        Executa uma requisição e retorna (status, resposta).
+
+        A resposta é um objeto JSON ou, no import, o texto JSONL.
+        """
+        parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+        if parts == ["health"]:
+            return 200, {"ok": True}
+        if parts == ["debug"] and method == "GET":
+            # Estado do Raft: 1 = líder, 4 = seguidor
+            return 200, {"state": 1 if self.leader else 4, "version": "fake"}
+        if parts == ["multi_search"] and method == "POST":
+            return 200, self._multi_search(params, json.loads(body or b"{}"))
+
+        if parts[:1] == ["aliases"]:
+            return self._handle_alias(method, parts[1:], body)
+
+        if parts[:1] != ["collections"]:
+            raise FakeTypesenseError(404, "Not Found")
+
+        with self._lock:
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, [
+                        collection.info() for collection in self.collections.values()
+                    ]
+                if method == "POST":
+                    return 201, self._create_collection(json.loads(body))
+
+            collection = self._collection(parts[1])
+            if len(parts) == 2:
+                if method == "GET":
+                    return 200, collection.info()
+                if method == "DELETE":
+                    del self.collections[collection.schema["name"]]
+                    return 200, collection.info()
+
+            if parts[2:3] == ["documents"]:
+                return self._handle_documents(
+                    collection, method, parts[3:], params, body
+                )
+
+        raise FakeTypesenseError(404, "Not Found")
+
+    def _create_collection(self, schema: dict[str, Any]) -> dict[str, Any]:
+        name = schema.get("name")
+        if not name:
+            raise FakeTypesenseError(400, "Parameter `name` is required.")
+        if name in self.collections:
+            raise FakeTypesenseError(
+                409, f"A collection with name `{name}` already exists."
+            )
+        self.collections[name] = _Collection(schema)
+        return self.collections[name].info()
+
+    def _handle_alias(
+        self, method: str, parts: list[str], body: bytes
+    ) -> tuple[int, Any]:
+        with self._lock:
+            if not parts:
+                aliases = [
+                    {"name": name, "collection_name": target}
+                    for name, target in self.aliases.items()
+                ]
+                return 200, {"aliases": aliases}
+
+            name = parts[0]
+            if method == "PUT":
+                target = json.loads(body)["collection_name"]
+                self.aliases[name] = target
+                return 200, {"name": name, "collection_name": target}
+            if name not in self.aliases:
+                raise FakeTypesenseError(404, "Not Found")
+            alias = {"name": name, "collection_name": self.aliases[name]}
+            if method == "DELETE":
+                del self.aliases[name]
+            return 200, alias
+
+    def _handle_documents(
+        self,
+        collection: _Collection,
+        method: str,
+        parts: list[str],
+        params: dict[str, str],
+        body: bytes,
+    ) -> tuple[int, Any]:
+        if parts == ["import"] and method == "POST":
+            return 200, self._import(collection, params.get("action", "create"), body)
+        if parts == ["search"] and method == "GET":
+            return 200, self._search(collection, params)
+        if not parts and method == "DELETE":
+            matches = compile_filter(params.get("filter_by"))
+            ids = [
+                doc_id for doc_id, doc in collection.documents.items() if matches(doc)
+            ]
+            for doc_id in ids:
+                del collection.documents[doc_id]
+            return 200, {"num_deleted": len(ids)}
+        if not parts and method == "POST":
+            document = json.loads(body)
+            document.setdefault("id", str(len(collection.documents)))
+            collection.validate(document)
+            collection.documents[str(document["id"])] = document
+            return 201, document
+
+        if len(parts) == 1:
+            document = collection.documents.get(parts[0])
+            if document is None:
+                raise FakeTypesenseError(
+                    404, f"Could not find a document with id: {parts[0]}"
+                )
+            if method == "DELETE":
+                del collection.documents[parts[0]]
+            return 200, document
+
+        raise FakeTypesenseError(404, "Not Found")
+
+    def _import(self, collection: _Collection, action: str, body: bytes) -> str:
+        results = []
+        for line in body.decode().split("\n"):
+            results.append(json.dumps(self._import_line(collection, action, line)))
+        self.import_batches.append(len(results))
+        return "\n".join(results)
+
+    def _import_line(
+        self, collection: _Collection, action: str, line: str
+    ) -> dict[str, Any]:
+        try:
+            document = json.loads(line)
+            if not isinstance(document, dict):
+                raise ValueError
+        except ValueError:
+            return {
+                "success": False,
+                "error": "Bad JSON.",
+                "code": 400,
+                "document": line,
+            }
+
+        doc_id = str(document.get("id", len(collection.documents)))
+        rejection = self._rejections.get(doc_id)
+        if rejection is not None:
+            code, error, times = rejection
+            if times is None or times > 0:
+                if times is not None:
+                    rejection[2] = times - 1
+                return {
+                    "success": False,
+                    "error": error,
+                    "code": code,
+                    "document": line,
+                }
+
+        existing = collection.documents.get(doc_id)
+        if action == "create" and existing is not None:
+            return {
+                "success": False,
+                "error": f"A document with id {doc_id} already exists.",
+                "code": 409,
+                "document": line,
+            }
+        if action == "update" and existing is None:
+            return {
+                "success": False,
+                "error": f"Could not find a document with id: {doc_id}",
+                "code": 404,
+                "document": line,
+            }
+        if action in ("update", "emplace") and existing is not None:
+            document = {**existing, **document}
+
+        document["id"] = doc_id
+        try:
+            collection.validate(document)
+        except FakeTypesenseError as e:
+            return {
+                "success": False,
+                "error": e.message,
+                "code": e.status,
+                "document": line,
+            }
+        collection.documents[doc_id] = document
+        return {"success": True}
+
+    def _search(
+        self, collection: _Collection, params: dict[str, str]
+    ) -> dict[str, Any]:
+        if "q" not in params:
+            raise FakeTypesenseError(400, "Parameter `q` is required.")
+
+        query = params["q"].strip().lower()
+        query_by = [field for field in params.get("query_by", "").split(",") if field]
+        if query != "*" and not query_by:
+            raise FakeTypesenseError(400, "Parameter `query_by` is required.")
+        tokens = [] if query == "*" else query.split()
+        matches = compile_filter(params.get("filter_by"), set(collection.fields))
+
+        hits = []
+        for document in collection.documents.values():
+            if not matches(document):
+                continue
+            if tokens:
+                text = " ".join(
+                    str(value).lower()
+                    for field in query_by
+                    for value in _values(document, field)
+                )
+                if not all(token in text for token in tokens):
+                    continue
+            hits.append(document)
+
+        sort_by = params.get("sort_by") or (
+            f"{collection.schema.get('default_sorting_field')}:desc"
+            if collection.schema.get("default_sorting_field")
+            else ""
+        )
+        for clause in reversed([part for part in sort_by.split(",") if part]):
+            field, _, order = clause.partition(":")
+            hits.sort(
+                key=lambda doc: (doc.get(field) is not None, doc.get(field, 0)),
+                reverse=order.strip() != "asc",
+            )
+
+        facet_counts = []
+        max_values = int(params.get("max_facet_values", 10))
+        for field in [name for name in params.get("facet_by", "").split(",") if name]:
+            if not collection.fields.get(field, {}).get("facet"):
+                raise FakeTypesenseError(
+                    404, f"Could not find a facet field named `{field}` in the schema."
+                )
+            counts = Counter(
+                str(value) for document in hits for value in _values(document, field)
+            )
+            facet_counts.append(
+                {
+                    "field_name": field,
+                    "counts": [
+                        {"value": value, "count": count, "highlighted": value}
+                        for value, count in counts.most_common(max_values)
+                    ],
+                    "stats": {"total_values": len(counts)},
+                }
+            )
+
+        per_page = int(params.get("per_page", params.get("limit", 10)))
+        page = int(params.get("page", 1))
+        start = (page - 1) * per_page
+        include = [
+            field for field in params.get("include_fields", "").split(",") if field
+        ]
+        page_hits = [
+            {
+                "document": (
+                    {key: doc[key] for key in include if key in doc} if include else doc
+                ),
+                "highlights": [],
+                "text_match": 0,
+            }
+            for doc in hits[start : start + per_page]
+        ]
+        return {
+            "facet_counts": facet_counts,
+            "found": len(hits),
+            "hits": page_hits,
+            "out_of": len(collection.documents),
+            "page": page,
+            "request_params": {
+                "collection_name": collection.schema["name"],
+                "per_page": per_page,
+                "q": params["q"],
+            },
+            "search_time_ms": 0,
+        }
+
+    def _multi_search(
+        self, common: dict[str, str], body: dict[str, Any]
+    ) -> dict[str, Any]:
+        results = []
+        for search in body.get("searches", []):
+            params = {**common, **{key: str(value) for key, value in search.items()}}
+            try:
+                with self._lock:
+                    collection = self._collection(params.pop("collection"))
+                    results.append(self._search(collection, params))
+            except FakeTypesenseError as e:
+                results.append({"code": e.status, "error": e.message})
+        return {"results": results}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Traduz requisições HTTP para FakeTypesenseServer.handle."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("fake-typesense: " + format, *args)
+
+    def _dispatch(self, method: str) -> None:
+        fake: FakeTypesenseServer = self.server.fake
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        parts = url.path.strip("/").split("/")
+        if parts[0] in ("collections", "aliases") and len(parts) > 1:
+            parts[1] = "{name}"
+        fake.requests[f"{method} /{'/'.join(parts)}"] += 1
+
+        is_import = url.path.endswith("/documents/import")
+        if is_import:
+            with fake._lock:
+                fake._concurrent_imports += 1
+                fake.max_concurrent_imports = max(
+                    fake.max_concurrent_imports, fake._concurrent_imports
+                )
+        try:
+            delay = fake.latency
+            if is_import:
+                delay += fake.import_latency_per_doc * (body.count(b"\n") + 1)
+            if delay:
+                time.sleep(delay)
+
+            if url.path != "/health" and (
+                self.headers.get(typesense.api_call.ApiCall.API_KEY_HEADER_NAME)
+                != fake.api_key
+            ):
+                raise FakeTypesenseError(
+                    401,
+                    "Forbidden - a valid `x-typesense-api-key` header must be sent.",
+                )
+
+            failure = fake._take_failure(url.path)
+            if failure is not None:
+                raise FakeTypesenseError(failure, HTTPStatus(failure).phrase)
+
+            status, result = fake.handle(method, url.path, params, body)
+        except FakeTypesenseError as e:
+            status, result = e.status, {"message": e.message}
+        except (ValueError, KeyError) as e:
+            status, result = 400, {"message": f"Bad request: {e}"}
+        finally:
+            if is_import:
+                with fake._lock:
+                    fake._concurrent_imports -= 1
+
+        if isinstance(result, str):
+            payload, content_type = result.encode(), "text/plain; charset=utf-8"
+        else:
+            payload, content_type = json.dumps(result).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
@@ -2,19 +2,83 @@
 Indexação de documentos no Typesense.
 """
 
+import asyncio
+import dataclasses
+import json
 import logging
-from typing import Any
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import IO, Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import typesense
 
+from typesense_dgb.async_client import AsyncTypesenseClient
+from typesense_dgb.batching import AdaptiveBatchSizer, iter_batches
+from typesense_dgb.cache import ROW_COLUMN
 from typesense_dgb.collection import COLLECTION_NAME
+from typesense_dgb.jsonl import dumps_jsonl, iter_import_failures
+from typesense_dgb.metrics import PipelineMetrics
+from typesense_dgb.retry import (
+    TRANSIENT_ERRORS,
+    RetryPolicy,
+    split_failures,
+    write_dead_letters,
+)
+from typesense_dgb.search import invalidate_search_caches
+from typesense_dgb.utils import (
+    add_derived_columns,
+    arrow_timestamp_seconds,
+    calculate_published_week_array,
+    parse_dates,
+    to_arrow_timestamps,
+)
 
 logger = logging.getLogger(__name__)
 
 # Limite máximo de caracteres para uma tag válida
 MAX_TAG_LENGTH = 100
 
+# Campos de texto opcionais (adicionados apenas se tiverem valores válidos)
+OPTIONAL_STRING_FIELDS = [
+    "agency",
+    "title",
+    "url",
+    "image",
+    "category",
+    "content",
+    "summary",
+    "subtitle",
+    "editorial_lead",
+    "theme_1_level_1_code",
+    "theme_1_level_1_label",
+    "theme_1_level_2_code",
+    "theme_1_level_2_label",
+    "theme_1_level_3_code",
+    "theme_1_level_3_label",
+    "most_specific_theme_code",
+    "most_specific_theme_label",
+]
+
+# Campos inteiros opcionais: (campo no documento, coluna no DataFrame)
+OPTIONAL_INT_FIELDS = [
+    ("extracted_at", "extracted_at_ts"),
+    ("published_year", "published_year"),
+    ("published_month", "published_month"),
+    ("published_week", "published_week"),
+]
+
 
 def clean_tags(tags_value) -> list[str]:
     """
@@ -78,27 +142,7 @@ def prepare_document(row: pd.Series) -> dict[str, Any]:
     }
 
     # Adiciona campos opcionais apenas se tiverem valores válidos
-    optional_string_fields = [
-        "agency",
-        "title",
-        "url",
-        "image",
-        "category",
-        "content",
-        "summary",
-        "subtitle",
-        "editorial_lead",
-        "theme_1_level_1_code",
-        "theme_1_level_1_label",
-        "theme_1_level_2_code",
-        "theme_1_level_2_label",
-        "theme_1_level_3_code",
-        "theme_1_level_3_label",
-        "most_specific_theme_code",
-        "most_specific_theme_label",
-    ]
-
-    for field in optional_string_fields:
+    for field in OPTIONAL_STRING_FIELDS:
         if pd.notna(row.get(field)):
             val = str(row[field]).strip()
             if val:
@@ -126,24 +170,630 @@ def prepare_document(row: pd.Series) -> dict[str, Any]:
     return doc
 
 
+def clean_string_column(df: pd.DataFrame, field: str) -> list[str | None]:
+    """
+    Normaliza uma coluna de texto opcional de uma só vez.
+
+    Returns:
+        Lista posicional com o valor limpo ou None quando ausente/vazio
+    """
+    values = np.full(len(df), None, dtype=object)
+    if field not in df.columns:
+        return values.tolist()
+
+    column = df[field]
+    present = column.notna().to_numpy()
+    stripped = column[present].astype(str).str.strip().to_numpy(dtype=object)
+    non_empty = stripped != ""
+    values[np.flatnonzero(present)[non_empty]] = stripped[non_empty]
+    return values.tolist()
+
+
+def clean_positive_int_column(df: pd.DataFrame, column_name: str) -> list[int | None]:
+    """
+    Converte uma coluna numérica opcional para int, mantendo apenas valores > 0.
+
+    Returns:
+        Lista posicional com o inteiro ou None quando ausente/inválido
+    """
+    values = np.full(len(df), None, dtype=object)
+    if column_name not in df.columns:
+        return values.tolist()
+
+    column = df[column_name]
+    present = column.notna().to_numpy()
+    numbers = column[present]
+    positive = (numbers > 0).to_numpy(dtype=bool)
+    values[np.flatnonzero(present)[positive]] = (
+        numbers[positive].astype("int64").tolist()
+    )
+    return values.tolist()
+
+
+def document_ids(df: pd.DataFrame) -> list[str]:
+    """
+    Ids dos documentos de um DataFrame, como em prepare_documents.
+
+    Usa unique_id como id; linhas sem unique_id recebem doc_<índice>.
+    """
+    unique_ids = df["unique_id"]
+    present = unique_ids.notna().to_numpy()
+    ids = np.full(len(df), None, dtype=object)
+    ids[present] = unique_ids[present].astype(str).tolist()
+    for position in np.flatnonzero(~present):
+        ids[position] = f"doc_{df.index[position]}"
+    return ids.tolist()
+
+
+def prepare_documents(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """
+    Prepara todos os documentos de um DataFrame de forma colunar.
+
+    Equivalente a aplicar prepare_document em cada linha, mas normaliza
+    cada campo para a coluna inteira antes de montar os dicionários.
+
+    Args:
+        df: DataFrame com dados dos documentos
+
+    Returns:
+        Lista de dicionários formatados para o Typesense, na ordem do DataFrame
+    """
+    ids = document_ids(df)
+    published_at = [
+        value if value is not None else 0
+        for value in clean_positive_int_column(df, "published_at_ts")
+    ]
+
+    columns: list[tuple[str, list[Any]]] = [
+        ("id", ids),
+        ("unique_id", ids),
+        ("published_at", published_at),
+    ]
+    columns += [
+        (field, clean_string_column(df, field)) for field in OPTIONAL_STRING_FIELDS
+    ]
+    columns += [
+        (field, clean_positive_int_column(df, column_name))
+        for field, column_name in OPTIONAL_INT_FIELDS
+    ]
+
+    if "tags" in df.columns:
+        tags = [
+            (clean_tags(value) or None) if value is not None else None
+            for value in df["tags"].tolist()
+        ]
+        columns.append(("tags", tags))
+
+    names = [name for name, _ in columns]
+    return [
+        {name: value for name, value in zip(names, row) if value is not None}
+        for row in zip(*(values for _, values in columns))
+    ]
+
+
+def _arrow_string_column(table: pa.Table, field: str) -> list[str | None]:
+    """
+    Versão Arrow de clean_string_column: remove espaços e anula valores vazios.
+    """
+    if field not in table.column_names:
+        return [None] * table.num_rows
+
+    column = table.column(field)
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        column = pc.cast(column, pa.string())
+    stripped = pc.utf8_trim_whitespace(column)
+    empty = pc.equal(pc.utf8_length(stripped), 0)
+    return pc.if_else(empty, pa.scalar(None, stripped.type), stripped).to_pylist()
+
+
+def _arrow_positive_ints(values: np.ndarray | pa.Array) -> list[int | None]:
+    """Mantém apenas inteiros > 0, com None nas demais posições."""
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        values = pc.fill_null(values, 0).to_numpy()
+    return [value if value > 0 else None for value in values.tolist()]
+
+
+def _arrow_tags_column(table: pa.Table) -> list[list[str] | None]:
+    """
+    Versão Arrow de clean_tags para a coluna inteira de tags.
+
+    Remove espaços de cada tag e descarta tags vazias, nulas ou com mais de
+    MAX_TAG_LENGTH caracteres; listas que ficam vazias viram None.
+    """
+    tags = table.column("tags").combine_chunks()
+    flat = pc.utf8_trim_whitespace(pc.list_flatten(tags))
+    lengths = pc.utf8_length(flat)
+    keep = pc.fill_null(
+        pc.and_(pc.greater(lengths, 0), pc.less_equal(lengths, MAX_TAG_LENGTH)),
+        False,
+    )
+    values = flat.filter(keep).to_pylist()
+    parents = pc.list_parent_indices(tags).filter(keep).to_numpy()
+    offsets = np.concatenate(
+        [[0], np.cumsum(np.bincount(parents, minlength=len(tags)))]
+    ).tolist()
+    return [values[start:end] or None for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def prepare_arrow_documents(table: pa.Table) -> list[dict[str, Any]]:
+    """
+    Prepara documentos direto de uma tabela Arrow do dataset, sem pandas.
+
+    Recebe as colunas originais (ver iter_arrow_batches): timestamps, ano,
+    mês e semana ISO são calculados com Arrow compute em vez de
+    add_derived_columns. Produz os mesmos documentos que prepare_documents
+    sobre o DataFrame processado.
+
+    Args:
+        table: Tabela Arrow com as colunas do dataset e, opcionalmente, a
+            coluna ROW_COLUMN com a posição original de cada linha
+
+    Returns:
+        Lista de dicionários formatados para o Typesense, na ordem da tabela
+    """
+    num_rows = table.num_rows
+    if ROW_COLUMN in table.column_names:
+        positions = table.column(ROW_COLUMN).to_pylist()
+    else:
+        positions = range(num_rows)
+
+    # Usa unique_id como id; linhas sem unique_id recebem doc_<posição>
+    unique_ids = pc.cast(table.column("unique_id"), pa.string()).to_pylist()
+    ids = [
+        value if value is not None else f"doc_{position}"
+        for value, position in zip(unique_ids, positions)
+    ]
+
+    published = to_arrow_timestamps(table.column("published_at"))
+    published_at_ts = arrow_timestamp_seconds(published)
+    derived = {
+        "published_at_ts": published_at_ts,
+        "published_year": pc.year(published),
+        "published_month": pc.month(published),
+        "published_week": calculate_published_week_array(published_at_ts),
+    }
+    if "extracted_at" in table.column_names:
+        derived["extracted_at_ts"] = arrow_timestamp_seconds(
+            to_arrow_timestamps(table.column("extracted_at"))
+        )
+
+    columns: list[tuple[str, list[Any]]] = [
+        ("id", ids),
+        ("unique_id", ids),
+        ("published_at", [max(value, 0) for value in published_at_ts.tolist()]),
+    ]
+    columns += [
+        (field, _arrow_string_column(table, field)) for field in OPTIONAL_STRING_FIELDS
+    ]
+    columns += [
+        (
+            field,
+            (
+                _arrow_positive_ints(derived[column_name])
+                if column_name in derived
+                else [None] * num_rows
+            ),
+        )
+        for field, column_name in OPTIONAL_INT_FIELDS
+    ]
+    if "tags" in table.column_names:
+        columns.append(("tags", _arrow_tags_column(table)))
+
+    names = [name for name, _ in columns]
+    return [
+        {name: value for name, value in zip(names, row) if value is not None}
+        for row in zip(*(values for _, values in columns))
+    ]
+
+
+def _arrow_to_dataframe(table: pa.Table) -> pd.DataFrame:
+    """Converte uma tabela Arrow do dataset no DataFrame processado equivalente."""
+    df = table.to_pandas()
+    if ROW_COLUMN in df.columns:
+        df.index = pd.Index(df.pop(ROW_COLUMN))
+    return add_derived_columns(parse_dates(df))
+
+
+def _prepare_batch(
+    chunk: pd.DataFrame | pa.Table | list[dict[str, Any]], stats: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """
+    Prepara um batch de documentos, usando o caminho colunar sempre que possível.
+
+    Se a preparação colunar falhar, refaz o batch linha a linha para isolar
+    e contabilizar apenas os documentos com problema. Listas de documentos já
+    preparados são usadas como estão.
+    """
+    if isinstance(chunk, list):
+        return chunk
+    try:
+        if isinstance(chunk, pa.Table):
+            return prepare_arrow_documents(chunk)
+        return prepare_documents(chunk)
+    except Exception as e:
+        logger.warning(f"Preparação colunar falhou, processando linha a linha: {e}")
+
+    if isinstance(chunk, pa.Table):
+        chunk = _arrow_to_dataframe(chunk)
+
+    documents: list[dict[str, Any]] = []
+    for idx, row in chunk.iterrows():
+        try:
+            documents.append(prepare_document(row))
+        except Exception as e:
+            logger.warning(f"Erro ao preparar documento no índice {idx}: {e}")
+            stats["errors"] += 1
+    return documents
+
+
+@dataclasses.dataclass
+class _ImportResult:
+    """Resultado de um batch importado, já considerando os reenvios."""
+
+    failures: list[tuple[bytes, dict[str, Any]]] = dataclasses.field(
+        default_factory=list
+    )
+    elapsed: float = 0.0
+    retries: int = 0
+    transport_failures: int = 0
+    bytes_sent: int = 0
+
+
+def _plan_retry(
+    payload: bytes,
+    outcome: str | Exception,
+    retry_policy: RetryPolicy | None,
+    result: _ImportResult,
+) -> tuple[bytes, float] | None:
+    """
+    Decide o passo seguinte após uma tentativa de import.
+
+    Concentra a política de reenvio usada por _import_batch e
+    _import_batch_async, que só fazem a requisição e a espera. Erros de
+    transporte reenviam o batch inteiro e falhas parciais só as linhas com
+    erro transitório. Falhas permanentes, ou transitórias sem tentativas
+    restantes, são acumuladas em result.failures.
+
+    Args:
+        payload: Payload JSONL enviado nesta tentativa
+        outcome: Resposta JSONL do import, ou o erro de transporte
+        retry_policy: Política de reenvio (None desativa os reenvios)
+        result: Resultado do batch, atualizado com a tentativa
+
+    Returns:
+        Tupla (payload a reenviar, espera em segundos), ou None se o batch
+        terminou
+
+    Raises:
+        Exception: O erro de transporte, quando não há mais tentativas
+    """
+    result.bytes_sent += len(payload)
+    can_retry = retry_policy is not None and result.retries < retry_policy.max_retries
+
+    if isinstance(outcome, Exception):
+        result.transport_failures += 1
+        if not can_retry:
+            raise outcome
+        logger.warning(f"Falha transitória no import: {outcome}")
+    else:
+        failures = list(iter_import_failures(outcome))
+        if not failures:
+            return None
+        retryable, permanent = split_failures(payload, failures)
+        result.failures += permanent
+        if not can_retry or not retryable:
+            result.failures += retryable
+            return None
+        payload = b"\n".join(line for line, _ in retryable)
+
+    result.retries += 1
+    delay = retry_policy.backoff(result.retries)
+    num_lines = payload.count(b"\n") + 1
+    logger.warning(
+        f"Reenviando {num_lines} documentos em {delay:.1f}s "
+        f"(tentativa {result.retries}/{retry_policy.max_retries})"
+    )
+    return payload, delay
+
+
+def _import_batch(
+    client: typesense.Client,
+    collection_name: str,
+    payload: bytes,
+    retry_policy: RetryPolicy | None = None,
+) -> _ImportResult:
+    """
+    Envia um batch para o Typesense como payload JSONL já serializado.
+
+    Evita o round trip dict -> JSON -> dict da biblioteca typesense: o
+    payload é gerado direto em bytes e da resposta só as falhas são lidas.
+    Os reenvios seguem _plan_retry.
+
+    Returns:
+        _ImportResult com as falhas finais, duração total e número de reenvios
+
+    Raises:
+        Exception: Erro de transporte quando não há mais tentativas
+    """
+    result = _ImportResult()
+    start = time.perf_counter()
+
+    while True:
+        try:
+            outcome = client.collections[collection_name].documents.import_(
+                payload, {"action": "upsert"}
+            )
+        except TRANSIENT_ERRORS as e:
+            outcome = e
+        retry = _plan_retry(payload, outcome, retry_policy, result)
+        if retry is None:
+            break
+        payload, delay = retry
+        time.sleep(delay)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _record_import(
+    stats: dict[str, Any],
+    num_documents: int,
+    result: _ImportResult,
+    sizer: AdaptiveBatchSizer | None = None,
+    dead_letter: IO[str] | None = None,
+    metrics: PipelineMetrics | None = None,
+) -> None:
+    """
+    Atualiza as estatísticas (e o batch adaptativo) com o resultado de um import.
+
+    Documentos rejeitados são gravados em dead_letter, quando informado.
+    """
+    errors = [error for _, error in result.failures]
+    stats["batch_sizes"].append(num_documents)
+    stats["retries"] += result.retries
+    if metrics is not None:
+        metrics.observe_batch(
+            num_documents,
+            result.bytes_sent,
+            result.elapsed,
+            result.retries,
+            result.transport_failures,
+        )
+        metrics.increment("import_errors", len(errors))
+    if sizer is not None:
+        if result.transport_failures:
+            sizer.record_failure()
+        else:
+            sizer.record(num_documents, result.elapsed, len(errors))
+
+    if errors:
+        stats["errors"] += len(errors)
+        logger.warning(f"Encontrados {len(errors)} erros no batch")
+        for error in errors[:5]:
+            logger.warning(f"Erro: {error}")
+        if dead_letter is not None:
+            write_dead_letters(dead_letter, result.failures)
+            stats["dead_lettered"] += len(errors)
+        stats["failed_ids"] += [
+            json.loads(line).get("id") for line, _ in result.failures
+        ]
+    stats["total_indexed"] += num_documents - len(errors)
+
+
+def _prepare_payload(
+    batch: pd.DataFrame | pa.Table | list[dict[str, Any]],
+) -> tuple[int, int, bytes, tuple[float, float]]:
+    """
+    Prepara e serializa um batch; executado nos processos de preparação.
+
+    Returns:
+        Tupla (documentos preparados, erros de preparação, payload JSONL,
+        segundos de preparação e de serialização)
+    """
+    stats = {"errors": 0}
+    start = time.perf_counter()
+    documents = _prepare_batch(batch, stats)
+    prepared = time.perf_counter()
+    payload = dumps_jsonl(documents)
+    timings = (prepared - start, time.perf_counter() - prepared)
+    return len(documents), stats["errors"], payload, timings
+
+
+def _iter_prepared(
+    data: pd.DataFrame | Iterable[pd.DataFrame] | Iterable[pa.Table],
+    batch_size: int,
+    workers: int = 1,
+    ordered: bool = True,
+) -> Iterator[tuple[int, int, bytes, tuple[float, float]]]:
+    """
+    Prepara os batches em sequência ou num pool de processos.
+
+    Com workers > 1, no máximo 2 * workers batches ficam em preparação ao
+    mesmo tempo. Com ordered=True os payloads saem na ordem dos batches; com
+    ordered=False, na ordem em que ficam prontos.
+
+    Yields:
+        Tuplas no formato de _prepare_payload
+    """
+    batches = iter_batches(data, batch_size)
+    if workers <= 1:
+        for batch in batches:
+            yield _prepare_payload(batch)
+        return
+
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque()
+        for batch in batches:
+            if len(pending) >= max_pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+            pending.append(executor.submit(_prepare_payload, batch))
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _iter_payloads(
+    data: pd.DataFrame | Iterable[pd.DataFrame] | Iterable[pa.Table],
+    batch_size: int,
+    stats: dict[str, Any],
+    sizer: AdaptiveBatchSizer | None = None,
+    workers: int = 1,
+    ordered: bool = True,
+    metrics: PipelineMetrics | None = None,
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Prepara os documentos e os agrupa em payloads JSONL prontos para import.
+
+    Sem sizer, cada fatia de batch_size linhas vira um payload. Com sizer, os
+    documentos são reagrupados conforme o limite atual de documentos e bytes,
+    que é lido a cada linha e portanto reflete o retorno dos imports anteriores.
+
+    Yields:
+        Tuplas (número de documentos, payload JSONL)
+    """
+    pending: list[bytes] = []
+    pending_bytes = 0
+
+    for num_documents, errors, payload, timings in _iter_prepared(
+        data, batch_size, workers, ordered
+    ):
+        if metrics is not None:
+            metrics.record("prepare", timings[0], num_documents)
+            metrics.record("serialize", timings[1], num_documents)
+            metrics.increment("prepare_errors", errors)
+        stats["errors"] += errors
+        stats["total_processed"] += num_documents
+        if not num_documents:
+            continue
+
+        if sizer is None:
+            yield num_documents, payload
+            continue
+
+        for line in payload.split(b"\n"):
+            if sizer.is_full(len(pending), pending_bytes, len(line) + 1):
+                yield len(pending), b"\n".join(pending)
+                pending, pending_bytes = [], 0
+            pending.append(line)
+            pending_bytes += len(line) + 1
+
+    if pending:
+        yield len(pending), b"\n".join(pending)
+
+
+def _new_stats() -> dict[str, Any]:
+    """Estatísticas iniciais de uma indexação."""
+    return {
+        "total_processed": 0,
+        "total_indexed": 0,
+        "errors": 0,
+        "skipped": False,
+        "batch_sizes": [],
+        "retries": 0,
+        "dead_lettered": 0,
+        "failed_ids": [],
+    }
+
+
+def _should_skip(
+    collection_info: dict[str, Any],
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    mode: str,
+    force: bool,
+) -> bool:
+    """
+    Decide se a indexação deve ser pulada para não duplicar documentos.
+
+    Returns:
+        True se a coleção não está vazia e o modo full foi pedido sem force
+    """
+    existing_count = collection_info.get("num_documents", 0)
+    if existing_count == 0:
+        return False
+
+    logger.info(f"Coleção já contém {existing_count} documentos")
+    if mode == "full":
+        if force:
+            logger.warning(
+                "⚠️  Modo force ativado: Documentos existentes serão sobrescritos"
+            )
+            logger.warning(
+                f"⚠️  {existing_count} documentos existentes serão substituídos"
+            )
+            return False
+
+        logger.info(
+            "Modo full em coleção não vazia. Use modo 'incremental' para atualizar."
+        )
+        logger.info("Ou use --force para sobrescrever dados existentes.")
+        logger.info("Pulando indexação para evitar duplicados.")
+        return True
+
+    if isinstance(df, pd.DataFrame):
+        logger.info(f"Modo incremental: {len(df)} documentos serão atualizados")
+    else:
+        logger.info("Modo incremental: documentos serão atualizados em blocos")
+    return False
+
+
 def index_documents(
     client: typesense.Client,
-    df: pd.DataFrame,
+    df: pd.DataFrame | Iterable[pd.DataFrame] | Iterable[pa.Table],
     collection_name: str = COLLECTION_NAME,
     mode: str = "full",
     force: bool = False,
     batch_size: int = 1000,
+    concurrency: int = 1,
+    adaptive_batching: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    dead_letter_path: str | None = None,
+    workers: int = 1,
+    ordered: bool = True,
+    metrics: PipelineMetrics | None = None,
 ) -> dict[str, Any]:
     """
     Indexa os documentos do DataFrame no Typesense.
 
+    Aceita também um iterador de DataFrames (ver download_and_process_dataset
+    com stream=True); nesse caso os blocos são consumidos sob demanda e a
+    memória fica limitada pelo tamanho de cada bloco. Um iterador de tabelas
+    Arrow (ver iter_arrow_batches) é preparado com prepare_arrow_documents,
+    sem passar por pandas. Blocos que já são listas de documentos preparados
+    (ver sync_documents) são só serializados.
+
     Args:
         client: Cliente Typesense
-        df: DataFrame com documentos a indexar
+        df: DataFrame, ou iterador de DataFrames ou tabelas Arrow, com
+            documentos a indexar
         collection_name: Nome da coleção
         mode: 'full' ou 'incremental'
         force: Se True, permite modo full em coleções não vazias
         batch_size: Tamanho do batch para importação (default: 1000)
+        concurrency: Número máximo de imports simultâneos. Com valor > 1, a
+            preparação dos próximos batches ocorre enquanto os anteriores são
+            importados por um pool de threads (default: 1, sequencial)
+        adaptive_batching: Se True, o número de documentos por import é ajustado
+            por AdaptiveBatchSizer (orçamento de bytes, latência e taxa de erros),
+            partindo de batch_size; os tamanhos usados ficam em
+            stats["batch_sizes"] (default: False)
+        retry_policy: Política de reenvio para erros de transporte e falhas
+            parciais, somada às repetições do próprio cliente (ver
+            RetryPolicy); None desativa os reenvios (default: None)
+        dead_letter_path: Arquivo JSONL onde os documentos rejeitados são
+            acrescentados (default: None, não grava)
+        workers: Número de processos que preparam e serializam os batches em
+            paralelo (default: 1, no processo atual)
+        ordered: Com workers > 1, envia os batches na ordem do dataset; se
+            False, envia cada batch assim que fica pronto (default: True)
+        metrics: Acumula tempos de preparação, serialização e import, bytes
+            enviados e reenvios (default: None, sem métricas)
 
     Returns:
         Dicionário com estatísticas da indexação
@@ -151,12 +801,7 @@ def index_documents(
     Raises:
         Exception: Se ocorrer erro na indexação
     """
-    stats = {
-        "total_processed": 0,
-        "total_indexed": 0,
-        "errors": 0,
-        "skipped": False,
-    }
+    stats = _new_stats()
 
     try:
         logger.info(
@@ -165,95 +810,228 @@ def index_documents(
 
         # Verifica documentos existentes na coleção
         collection_info = client.collections[collection_name].retrieve()
-        existing_count = collection_info.get("num_documents", 0)
-
-        if existing_count > 0:
-            logger.info(f"Coleção já contém {existing_count} documentos")
-            if mode == "full":
-                if force:
-                    logger.warning(
-                        "⚠️  Modo force ativado: Documentos existentes serão sobrescritos"
-                    )
-                    logger.warning(
-                        f"⚠️  {existing_count} documentos existentes serão substituídos"
-                    )
-                else:
-                    logger.info(
-                        "Modo full em coleção não vazia. Use modo 'incremental' para atualizar."
-                    )
-                    logger.info(
-                        "Ou use --force para sobrescrever dados existentes."
-                    )
-                    logger.info("Pulando indexação para evitar duplicados.")
-                    stats["skipped"] = True
-                    return stats
-            else:
-                logger.info(f"Modo incremental: {len(df)} documentos serão atualizados")
+        if _should_skip(collection_info, df, mode, force):
+            stats["skipped"] = True
+            return stats
 
         # DataFrame vazio
-        if len(df) == 0:
+        if isinstance(df, pd.DataFrame) and len(df) == 0:
             logger.info("Nenhum documento para indexar. Saindo.")
             return stats
 
-        # Prepara e indexa documentos em batches
-        documents: list[dict[str, Any]] = []
-        for idx, row in df.iterrows():
-            try:
-                doc = prepare_document(row)
-                documents.append(doc)
-                stats["total_processed"] += 1
-
-                # Indexa em batches
-                if len(documents) >= batch_size:
-                    logger.info(
-                        f"Indexando batch de {len(documents)} documentos... "
-                        f"(total processado: {stats['total_processed']})"
+        # Prepara e indexa documentos em batches. Com concurrency > 1 os
+        # imports rodam em threads, com no máximo `concurrency` em andamento.
+        executor = (
+            ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+        )
+        sizer = (
+            AdaptiveBatchSizer(initial_docs=batch_size) if adaptive_batching else None
+        )
+        dead_letter = (
+            open(dead_letter_path, "a", encoding="utf-8") if dead_letter_path else None
+        )
+        in_flight: deque[tuple[int, Future]] = deque()
+        try:
+            for num_documents, payload in _iter_payloads(
+                df, batch_size, stats, sizer, workers, ordered, metrics
+            ):
+                logger.info(
+                    f"Indexando batch de {num_documents} documentos... "
+                    f"(total processado: {stats['total_processed']})"
+                )
+                if executor is None:
+                    result = _import_batch(
+                        client, collection_name, payload, retry_policy
                     )
-                    result = client.collections[collection_name].documents.import_(
-                        documents, {"action": "upsert"}
+                    _record_import(
+                        stats, num_documents, result, sizer, dead_letter, metrics
                     )
+                    continue
 
-                    # Verifica erros
-                    errors = [item for item in result if not item.get("success")]
-                    if errors:
-                        stats["errors"] += len(errors)
-                        logger.warning(f"Encontrados {len(errors)} erros no batch")
-                        for error in errors[:5]:
-                            logger.warning(f"Erro: {error}")
-                    else:
-                        stats["total_indexed"] += len(documents)
-
-                    documents = []
-
-            except Exception as e:
-                logger.warning(f"Erro ao preparar documento no índice {idx}: {e}")
-                stats["errors"] += 1
-                continue
-
-        # Indexa documentos restantes
-        if documents:
-            logger.info(f"Indexando batch final de {len(documents)} documentos...")
-            result = client.collections[collection_name].documents.import_(
-                documents, {"action": "upsert"}
-            )
+                if len(in_flight) >= concurrency:
+                    sent, future = in_flight.popleft()
+                    _record_import(
+                        stats, sent, future.result(), sizer, dead_letter, metrics
+                    )
+                future = executor.submit(
+                    _import_batch, client, collection_name, payload, retry_policy
+                )
+                in_flight.append((num_documents, future))
 
-            errors = [item for item in result if not item.get("success")]
-            if errors:
-                stats["errors"] += len(errors)
-                logger.warning(f"Encontrados {len(errors)} erros no batch final")
-            else:
-                stats["total_indexed"] += len(documents)
+            while in_flight:
+                sent, future = in_flight.popleft()
+                _record_import(
+                    stats, sent, future.result(), sizer, dead_letter, metrics
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if dead_letter is not None:
+                dead_letter.close()
+            # Inclusive em cargas interrompidas, que já alteraram a coleção
+            if stats["total_indexed"]:
+                invalidate_search_caches(collection_name)
+
+        if stats["total_processed"] == 0 and stats["errors"] == 0:
+            logger.info("Nenhum documento para indexar. Saindo.")
+            return stats
 
         # Estatísticas finais
         collection_info = client.collections[collection_name].retrieve()
-        total_docs = collection_info.get("num_documents", 0)
+        _log_collection_stats(collection_name, collection_info)
+
+        return stats
+
+    except Exception as e:
+        logger.error(f"Erro ao indexar documentos: {e}")
+        raise
+
+
+async def _import_batch_async(
+    client: AsyncTypesenseClient,
+    collection_name: str,
+    payload: bytes,
+    retry_policy: RetryPolicy | None = None,
+) -> _ImportResult:
+    """
+    Envia um payload JSONL para o Typesense pelo cliente assíncrono.
+
+    Mesma política de reenvio de _import_batch (_plan_retry), aguardando com
+    asyncio.sleep.
+
+    Returns:
+        _ImportResult com as falhas finais, duração total e número de reenvios
+    """
+    result = _ImportResult()
+    start = time.perf_counter()
+
+    while True:
+        try:
+            outcome = await client.import_documents_raw(
+                collection_name, payload, {"action": "upsert"}
+            )
+        except TRANSIENT_ERRORS as e:
+            outcome = e
+        retry = _plan_retry(payload, outcome, retry_policy, result)
+        if retry is None:
+            break
+        payload, delay = retry
+        await asyncio.sleep(delay)
+
+    result.elapsed = time.perf_counter() - start
+    return result
 
-        logger.info("Documentos indexados com sucesso no Typesense")
-        logger.info(f"Total de documentos na coleção: {total_docs}")
-        logger.info("Estatísticas da coleção:")
-        logger.info(f"  Total de registros: {total_docs}")
-        logger.info(f"  Nome da coleção: {collection_name}")
-        logger.info(f"  Campos no schema: {len(collection_info['fields'])}")
+
+async def index_documents_async(
+    client: AsyncTypesenseClient,
+    df: pd.DataFrame | Iterable[pd.DataFrame] | Iterable[pa.Table],
+    collection_name: str = COLLECTION_NAME,
+    mode: str = "full",
+    force: bool = False,
+    batch_size: int = 1000,
+    concurrency: int = 4,
+    adaptive_batching: bool = False,
+    retry_policy: RetryPolicy | None = None,
+    dead_letter_path: str | None = None,
+    workers: int = 1,
+    ordered: bool = True,
+    metrics: PipelineMetrics | None = None,
+) -> dict[str, Any]:
+    """
+    Versão assíncrona de index_documents sobre um AsyncTypesenseClient.
+
+    Os batches são preparados fora do event loop, numa thread (que usa o
+    pool de processos quando workers > 1), e importados como tasks, com no
+    máximo `concurrency` imports em andamento (o cliente ainda aplica seu
+    próprio limite de requisições simultâneas).
+
+    Args:
+        client: Cliente Typesense assíncrono
+        df: DataFrame, ou iterador de DataFrames, com documentos a indexar
+        collection_name: Nome da coleção
+        mode: 'full' ou 'incremental'
+        force: Se True, permite modo full em coleções não vazias
+        batch_size: Tamanho do batch para importação (default: 1000)
+        concurrency: Número máximo de imports simultâneos (default: 4)
+        adaptive_batching: Se True, ajusta os batches com AdaptiveBatchSizer
+            (ver index_documents) (default: False)
+        retry_policy: Política de reenvio (ver index_documents) (default: None)
+        dead_letter_path: Arquivo JSONL para documentos rejeitados (default: None)
+        workers: Processos de preparação (ver index_documents) (default: 1)
+        ordered: Ordem de envio com workers > 1 (ver index_documents)
+            (default: True)
+        metrics: Métricas da carga (ver index_documents) (default: None)
+
+    Returns:
+        Dicionário com estatísticas da indexação
+
+    Raises:
+        Exception: Se ocorrer erro na indexação
+    """
+    stats = _new_stats()
+
+    try:
+        logger.info(
+            f"Indexando documentos no Typesense (modo: {mode}, force: {force}, async)..."
+        )
+
+        collection_info = await client.retrieve_collection(collection_name)
+        if _should_skip(collection_info, df, mode, force):
+            stats["skipped"] = True
+            return stats
+
+        if isinstance(df, pd.DataFrame) and len(df) == 0:
+            logger.info("Nenhum documento para indexar. Saindo.")
+            return stats
+
+        sizer = (
+            AdaptiveBatchSizer(initial_docs=batch_size) if adaptive_batching else None
+        )
+        dead_letter = (
+            open(dead_letter_path, "a", encoding="utf-8") if dead_letter_path else None
+        )
+        in_flight: deque[tuple[int, asyncio.Task]] = deque()
+        loop = asyncio.get_running_loop()
+        payloads = _iter_payloads(
+            df, batch_size, stats, sizer, workers, ordered, metrics
+        )
+        try:
+            # A preparação (pandas, serialização e espera pelo pool de
+            # processos) roda numa thread para não bloquear os imports em
+            # andamento; só um next() por vez, então stats e sizer não são
+            # acessados em paralelo
+            while item := await loop.run_in_executor(None, next, payloads, None):
+                num_documents, payload = item
+                logger.info(
+                    f"Indexando batch de {num_documents} documentos... "
+                    f"(total processado: {stats['total_processed']})"
+                )
+                if len(in_flight) >= concurrency:
+                    sent, task = in_flight.popleft()
+                    _record_import(stats, sent, await task, sizer, dead_letter, metrics)
+                task = asyncio.create_task(
+                    _import_batch_async(client, collection_name, payload, retry_policy)
+                )
+                in_flight.append((num_documents, task))
+
+            while in_flight:
+                sent, task = in_flight.popleft()
+                _record_import(stats, sent, await task, sizer, dead_letter, metrics)
+        finally:
+            payloads.close()
+            for _, task in in_flight:
+                task.cancel()
+            if dead_letter is not None:
+                dead_letter.close()
+            if stats["total_indexed"]:
+                invalidate_search_caches(collection_name)
+
+        if stats["total_processed"] == 0 and stats["errors"] == 0:
+            logger.info("Nenhum documento para indexar. Saindo.")
+            return stats
+
+        collection_info = await client.retrieve_collection(collection_name)
+        _log_collection_stats(collection_name, collection_info)
 
         return stats
 
@@ -262,6 +1040,22 @@ def index_documents(
         raise
 
 
+def _log_collection_stats(
+    collection_name: str, collection_info: dict[str, Any]
+) -> None:
+    """
+    Registra as estatísticas finais da coleção após a indexação.
+    """
+    total_docs = collection_info.get("num_documents", 0)
+
+    logger.info("Documentos indexados com sucesso no Typesense")
+    logger.info(f"Total de documentos na coleção: {total_docs}")
+    logger.info("Estatísticas da coleção:")
+    logger.info(f"  Total de registros: {total_docs}")
+    logger.info(f"  Nome da coleção: {collection_name}")
+    logger.info(f"  Campos no schema: {len(collection_info['fields'])}")
+
+
 def run_test_queries(
     client: typesense.Client, collection_name: str = COLLECTION_NAME
 ) -> None:
@@ -300,3 +1094,59 @@ def run_test_queries(
 
     except Exception as e:
         logger.warning(f"Consultas de teste encontraram um problema: {e}")
+
+
+def validate_collection(
+    client: typesense.Client,
+    collection_name: str,
+    min_documents: int = 1,
+) -> bool:
+    """
+    Verifica se uma coleção recém-carregada pode ser servida.
+
+    Confere a contagem de documentos, uma busca textual e uma busca facetada.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Nome da coleção
+        min_documents: Número mínimo de documentos esperado (default: 1)
+
+    Returns:
+        True se todas as verificações passaram
+    """
+    try:
+        collection_info = client.collections[collection_name].retrieve()
+        num_documents = collection_info.get("num_documents", 0)
+        if num_documents < max(min_documents, 1):
+            logger.error(
+                f"Validação falhou: '{collection_name}' tem {num_documents} "
+                f"documentos (mínimo: {min_documents})"
+            )
+            return False
+
+        documents = client.collections[collection_name].documents
+        results = documents.search(
+            {"q": "*", "query_by": "title", "limit": 1, "sort_by": "published_at:desc"}
+        )
+        if results["found"] != num_documents or not results["hits"]:
+            logger.error(
+                f"Validação falhou: busca '*' retornou {results['found']} "
+                f"de {num_documents} documentos"
+            )
+            return False
+
+        results = documents.search(
+            {"q": "*", "query_by": "title", "facet_by": "agency", "limit": 0}
+        )
+        if not results.get("facet_counts") or not results["facet_counts"][0]["counts"]:
+            logger.error("Validação falhou: facet por 'agency' sem resultados")
+            return False
+
+        logger.info(
+            f"✅ Validação de '{collection_name}' ok ({num_documents} documentos)"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Validação falhou: {e}")
+        return False
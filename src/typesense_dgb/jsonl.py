@@ -0,0 +1,70 @@
+"""
+Serialização JSONL para imports em massa no Typesense.
+
+Usa orjson quando disponível (``pip install typesense-dgb[fast]``) e cai para
+o módulo json da biblioteca padrão caso contrário.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from typesense.exceptions import TypesenseClientError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+# Linha de resposta do Typesense para um documento importado com sucesso
+SUCCESS_LINE = '{"success":true}'
+
+
+def dumps_document(document: dict[str, Any]) -> bytes:
+    """Serializa um documento como uma linha JSON (sem quebra de linha)."""
+    if orjson is not None:
+        return orjson.dumps(document)
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_jsonl(documents: Iterable[dict[str, Any]]) -> bytes:
+    """
+    Serializa documentos diretamente para um payload JSONL.
+
+    Args:
+        documents: Documentos a serializar
+
+    Returns:
+        Payload JSONL em bytes, um documento por linha
+    """
+    return b"\n".join(dumps_document(document) for document in documents)
+
+
+def iter_import_failures(response: str | bytes) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Percorre a resposta de um import e retorna apenas as linhas com falha.
+
+    Linhas de sucesso são reconhecidas sem parsing; somente as falhas são
+    convertidas em dicionários.
+
+    Args:
+        response: Resposta JSONL do endpoint de import
+
+    Yields:
+        Tuplas (posição do documento no batch, resultado da linha)
+
+    Raises:
+        TypesenseClientError: Se alguma linha da resposta não for JSON válido
+    """
+    if isinstance(response, bytes):
+        response = response.decode()
+
+    for position, line in enumerate(response.split("\n")):
+        if line == SUCCESS_LINE:
+            continue
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise TypesenseClientError(f"Invalid response - {line}") from e
+        if not result.get("success"):
+            yield position, result
@@ -0,0 +1,229 @@
+"""
+Métricas por etapa da carga: tempos, vazão, bytes enviados e latência dos imports.
+
+Um PipelineMetrics é repassado para download_and_process_dataset,
+iter_arrow_batches e index_documents, que registram cada etapa:
+
+    metrics = PipelineMetrics()
+    df = download_and_process_dataset(metrics=metrics)
+    index_documents(client, df, metrics=metrics)
+    print(metrics.to_json())
+    Path("load.prom").write_text(metrics.to_prometheus())
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Prefixo dos nomes no formato de texto do Prometheus
+PROMETHEUS_PREFIX = "typesense_dgb_load"
+
+# Quantis da latência dos imports no resumo
+LATENCY_QUANTILES = [0.5, 0.95, 0.99]
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Quantil pelo método do vizinho mais próximo (values já ordenados)."""
+    index = min(int(q * len(values)), len(values) - 1)
+    return values[index]
+
+
+class PipelineMetrics:
+    """
+    Acumula métricas da carga por etapa, contadores e latência de cada import.
+
+    Etapas com o mesmo nome somam tempo e documentos (ex.: 'prepare' de cada
+    batch). Com workers > 1, 'prepare' e 'serialize' somam o tempo de todos
+    os processos, e com concurrency > 1 'import' soma imports simultâneos;
+    nesses casos a etapa pode passar do tempo total da carga.
+
+    Listeners registrados com add_listener são chamados com o nome da etapa
+    sempre que uma etapa termina (usado pelo profiling de memória).
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: Counter[str] = Counter()
+        self.batch_latencies: list[float] = []
+        self._listeners: list[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Registra uma função chamada com o nome de cada etapa concluída."""
+        self._listeners.append(listener)
+
+    @contextmanager
+    def stage(self, name: str, docs: int = 0) -> Iterator[dict[str, int]]:
+        """
+        Mede o tempo do bloco e o acumula na etapa `name`.
+
+        O número de documentos pode ser informado na entrada ou, quando só é
+        conhecido no final, atribuído ao dicionário retornado:
+
+            with metrics.stage("process") as stage:
+                df = process(raw)
+                stage["docs"] = len(df)
+        """
+        info = {"docs": docs}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(name, time.perf_counter() - start, info["docs"])
+
+    def record(self, name: str, seconds: float, docs: int = 0) -> None:
+        """Acumula uma duração medida fora de stage() (ex.: em outro processo)."""
+        with self._lock:
+            stage = self.stages.setdefault(
+                name, {"seconds": 0.0, "calls": 0, "docs": 0}
+            )
+            stage["seconds"] += seconds
+            stage["calls"] += 1
+            stage["docs"] += docs
+        for listener in self._listeners:
+            listener(name)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Soma value ao contador `name`."""
+        with self._lock:
+            self.counters[name] += value
+
+    def observe_batch(
+        self,
+        docs: int,
+        num_bytes: int,
+        latency: float,
+        retries: int = 0,
+        transport_failures: int = 0,
+    ) -> None:
+        """
+        Registra um batch importado.
+
+        Args:
+            docs: Documentos do batch
+            num_bytes: Bytes enviados, incluindo reenvios
+            latency: Duração do import em segundos, incluindo reenvios
+            retries: Reenvios do batch
+            transport_failures: Falhas de transporte do batch
+        """
+        with self._lock:
+            self.batch_latencies.append(latency)
+            self.counters["batches"] += 1
+            self.counters["documents_sent"] += docs
+            self.counters["bytes_sent"] += num_bytes
+            self.counters["retries"] += retries
+            self.counters["transport_failures"] += transport_failures
+        self.record("import", latency, docs)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Resumo das métricas até agora.
+
+        Returns:
+            Dicionário com total_seconds, stages (seconds, calls, docs e
+            docs_per_second por etapa), counters e batch_latency
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "seconds": round(stage["seconds"], 4),
+                    "calls": stage["calls"],
+                    "docs": stage["docs"],
+                    "docs_per_second": (
+                        round(stage["docs"] / stage["seconds"], 1)
+                        if stage["docs"] and stage["seconds"]
+                        else None
+                    ),
+                }
+                for name, stage in self.stages.items()
+            }
+            latencies = sorted(self.batch_latencies)
+            counters = dict(self.counters)
+
+        batch_latency: dict[str, Any] = {"count": len(latencies)}
+        if latencies:
+            batch_latency["mean"] = round(sum(latencies) / len(latencies), 4)
+            batch_latency["max"] = round(latencies[-1], 4)
+            for q in LATENCY_QUANTILES:
+                batch_latency[f"p{int(q * 100)}"] = round(_quantile(latencies, q), 4)
+
+        return {
+            "total_seconds": round(time.perf_counter() - self.started_at, 4),
+            "stages": stages,
+            "counters": counters,
+            "batch_latency": batch_latency,
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Resumo (ver summary) serializado em JSON."""
+        return json.dumps(self.summary(), indent=indent)
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """
+        Resumo no formato de texto do Prometheus.
+
+        Pode ser gravado no diretório do textfile collector do node_exporter.
+        """
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_duration_seconds Duração total da carga",
+            f"# TYPE {prefix}_duration_seconds gauge",
+            f"{prefix}_duration_seconds {summary['total_seconds']}",
+            f"# HELP {prefix}_stage_seconds Tempo acumulado por etapa",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        stages = summary["stages"]
+        for name, stage in stages.items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{name}"}} {stage["seconds"]}')
+        lines += [
+            f"# HELP {prefix}_stage_documents Documentos processados por etapa",
+            f"# TYPE {prefix}_stage_documents gauge",
+        ]
+        for name, stage in stages.items():
+            lines.append(f'{prefix}_stage_documents{{stage="{name}"}} {stage["docs"]}')
+
+        for name, value in sorted(summary["counters"].items()):
+            lines += [
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {value}",
+            ]
+
+        with self._lock:
+            latencies = sorted(self.batch_latencies)
+        lines += [
+            f"# HELP {prefix}_batch_latency_seconds Latência dos imports por batch",
+            f"# TYPE {prefix}_batch_latency_seconds summary",
+        ]
+        if latencies:
+            for q in LATENCY_QUANTILES:
+                lines.append(
+                    f'{prefix}_batch_latency_seconds{{quantile="{q}"}} '
+                    f"{_quantile(latencies, q):.6f}"
+                )
+        lines += [
+            f"{prefix}_batch_latency_seconds_sum {sum(latencies):.6f}",
+            f"{prefix}_batch_latency_seconds_count {len(latencies)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self) -> None:
+        """Registra no log uma linha por etapa e os contadores."""
+        summary = self.summary()
+        logger.info(f"Métricas da carga ({summary['total_seconds']:.1f}s no total):")
+        for name, stage in summary["stages"].items():
+            rate = (
+                f", {stage['docs_per_second']:.0f} docs/s"
+                if stage["docs_per_second"]
+                else ""
+            )
+            logger.info(f"  {name}: {stage['seconds']:.2f}s{rate}")
+        for name, value in sorted(summary["counters"].items()):
+            logger.info(f"  {name}: {value}")
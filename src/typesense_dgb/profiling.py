@@ -0,0 +1,256 @@
+"""
+Profiling de CPU (cProfile) e de memória (tracemalloc) de uma carga, só com stdlib.
+
+Os relatórios são separados pelas etapas registradas em PipelineMetrics
+(download, process, prepare, import...):
+
+    metrics = PipelineMetrics()
+    profiler = create_profiler("memory", metrics)
+    profiler.start()
+    try:
+        index_documents(client, download_and_process_dataset(metrics=metrics),
+                        metrics=metrics)
+    finally:
+        profiler.stop()
+        profiler.dump("profiles")
+
+Etapas executadas em outros processos (workers > 1) ou threads
+(concurrency > 1) não aparecem no profile de CPU.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from typesense_dgb.metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+# Funções de entrada de cada etapa no profile de CPU: (arquivo, função)
+STAGE_FUNCTIONS = {
+    "download": [("datasets/load.py", "load_dataset")],
+    "filter": [("typesense_dgb/dataset.py", "_select_recent")],
+    "process": [
+        ("typesense_dgb/utils.py", "parse_dates"),
+        ("typesense_dgb/utils.py", "add_derived_columns"),
+    ],
+    "cache_read": [
+        ("typesense_dgb/cache.py", "read_processed_cache"),
+        ("typesense_dgb/cache.py", "iter_processed_cache"),
+    ],
+    "cache_write": [("typesense_dgb/cache.py", "write_processed_cache")],
+    "prepare": [("typesense_dgb/indexer.py", "_prepare_batch")],
+    "stats": [("typesense_dgb/stats.py", "add")],
+    "serialize": [("typesense_dgb/jsonl.py", "dumps_jsonl")],
+    "import": [
+        ("typesense_dgb/indexer.py", "_import_batch"),
+        ("typesense_dgb/indexer.py", "_import_batch_async"),
+    ],
+}
+
+# Etapas acompanhadas no profile de memória; a serialização é registrada junto
+# com a preparação e entra na conta de 'prepare'
+MEMORY_STAGES = {
+    "download",
+    "filter",
+    "process",
+    "cache_read",
+    "cache_write",
+    "stats",
+    "prepare",
+    "import",
+}
+
+
+class CpuProfiler:
+    """
+    Profile de CPU da carga com cProfile.
+
+    Args:
+        top: Número de funções no relatório (default: 20)
+    """
+
+    def __init__(self, top: int = 20) -> None:
+        self.top = top
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def stage_seconds(self) -> dict[str, float]:
+        """Tempo cumulativo das funções de entrada de cada etapa (STAGE_FUNCTIONS)."""
+        stats = pstats.Stats(self._profile).stats
+        totals = {}
+        for stage, functions in STAGE_FUNCTIONS.items():
+            seconds = sum(
+                cumulative
+                for (filename, _, name), (_, _, _, cumulative, _) in stats.items()
+                if any(
+                    name == function and filename.replace("\\", "/").endswith(suffix)
+                    for suffix, function in functions
+                )
+            )
+            if seconds:
+                totals[stage] = seconds
+        return totals
+
+    def report(self) -> str:
+        """Tempo por etapa e as `top` funções com maior tempo cumulativo."""
+        lines = ["Profile de CPU por etapa (tempo cumulativo):"]
+        for stage, seconds in self.stage_seconds().items():
+            lines.append(f"  {stage:<12}{seconds:>10.2f}s")
+
+        output = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        lines.append(output.getvalue())
+        return "\n".join(lines)
+
+    def dump(self, directory: str | Path, name: str = "load_data") -> list[Path]:
+        """
+        Grava o profile em '<name>.pstats' (abrir com pstats ou snakeviz) e o
+        relatório em '<name>_cpu.txt'.
+
+        Returns:
+            Caminhos dos arquivos gravados
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stats_path = directory / f"{name}.pstats"
+        report_path = directory / f"{name}_cpu.txt"
+        self._profile.dump_stats(stats_path)
+        report_path.write_text(self.report())
+        return [stats_path, report_path]
+
+
+class MemoryProfiler:
+    """
+    Profile de memória da carga com tracemalloc, separado por etapa.
+
+    A cada etapa concluída em PipelineMetrics, registra o pico de memória
+    alocada desde a etapa anterior. Nas primeiras `max_snapshots` etapas
+    também compara snapshots e acumula, por linha de código, a memória
+    alocada durante a etapa. Os snapshots ficam caros com o dataset inteiro
+    em memória, por isso só as primeiras etapas (e os primeiros batches) são
+    detalhadas.
+
+    Args:
+        metrics: Métricas da carga, cujas etapas delimitam o profile
+        top: Número de linhas por etapa no relatório (default: 20)
+        max_snapshots: Etapas comparadas por snapshot (default: 20)
+        frames: Frames guardados por alocação (default: 1)
+    """
+
+    def __init__(
+        self,
+        metrics: PipelineMetrics,
+        top: int = 20,
+        max_snapshots: int = 20,
+        frames: int = 1,
+    ) -> None:
+        self.top = top
+        self.max_snapshots = max_snapshots
+        self.frames = frames
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._snapshots = 0
+        metrics.add_listener(self.on_stage)
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        self._snapshot = self._take_snapshot()
+
+    def stop(self) -> None:
+        self._snapshot = None
+        tracemalloc.stop()
+
+    def on_stage(self, name: str) -> None:
+        """Fecha o intervalo da etapa `name` (listener de PipelineMetrics)."""
+        if name not in MEMORY_STAGES or not tracemalloc.is_tracing():
+            return
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        stage = self.stages.setdefault(
+            name, {"peak": 0, "events": 0, "sampled": 0, "lines": {}}
+        )
+        stage["peak"] = max(stage["peak"], peak)
+        stage["events"] += 1
+
+        if self._snapshot is None:
+            return
+        snapshot = self._take_snapshot()
+        for stat in snapshot.compare_to(self._snapshot, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            line = str(stat.traceback[0])
+            size, count = stage["lines"].get(line, (0, 0))
+            stage["lines"][line] = (size + stat.size_diff, count + stat.count_diff)
+        stage["sampled"] += 1
+
+        self._snapshots += 1
+        self._snapshot = snapshot if self._snapshots < self.max_snapshots else None
+
+    def report(self) -> str:
+        """Pico por etapa e as `top` linhas que mais alocaram em cada uma."""
+        lines = ["Profile de memória por etapa:"]
+        for name, stage in self.stages.items():
+            lines.append(
+                f"\n{name}: pico {stage['peak'] / 1024 / 1024:.1f} MB "
+                f"({stage['events']} ocorrências, {stage['sampled']} comparadas)"
+            )
+            ranked = sorted(stage["lines"].items(), key=lambda item: -item[1][0])
+            for line, (size, count) in ranked[: self.top]:
+                lines.append(f"  {size / 1024:>12.1f} KiB {count:>9} blocos  {line}")
+        return "\n".join(lines)
+
+    def dump(self, directory: str | Path, name: str = "load_data") -> list[Path]:
+        """
+        Grava o relatório em '<name>_memory.txt'.
+
+        Returns:
+            Caminhos dos arquivos gravados
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path = directory / f"{name}_memory.txt"
+        report_path.write_text(self.report())
+        return [report_path]
+
+
+def create_profiler(
+    kind: str, metrics: PipelineMetrics, top: int = 20
+) -> CpuProfiler | MemoryProfiler:
+    """
+    Cria o profiler do tipo pedido.
+
+    Args:
+        kind: 'cpu' ou 'memory'
+        metrics: Métricas da carga (delimitam as etapas no profile de memória)
+        top: Número de linhas nos relatórios (default: 20)
+
+    Raises:
+        ValueError: Se kind não for 'cpu' nem 'memory'
+    """
+    if kind == "cpu":
+        return CpuProfiler(top=top)
+    if kind == "memory":
+        return MemoryProfiler(metrics, top=top)
+    raise ValueError(f"Tipo de profile desconhecido: {kind}")
@@ -0,0 +1,142 @@
+"""
+Reload completo sem indisponibilidade (blue/green) usando aliases do Typesense.
+
+O alias (por padrão 'news') é o nome usado pela interface web e pelos clientes
+MCP. Cada reload cria uma coleção nova '<alias>_<timestamp>', indexa e valida
+os dados nela e só então aponta o alias para ela, de forma atômica.
+"""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.collection import (
+    COLLECTION_NAME,
+    cleanup_collection_versions,
+    create_collection,
+    get_alias_target,
+    point_alias,
+    versioned_collection_name,
+)
+from typesense_dgb.indexer import index_documents, validate_collection
+from typesense_dgb.search import invalidate_search_caches
+
+logger = logging.getLogger(__name__)
+
+
+def blue_green_reload(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    alias: str = COLLECTION_NAME,
+    keep_versions: int = 2,
+    min_documents_ratio: float = 0.9,
+    replace_legacy: bool = False,
+    **index_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Recarrega o dataset numa coleção nova e troca o alias ao final.
+
+    Enquanto a nova versão é construída, o alias continua servindo a versão
+    anterior completa. Se a indexação ou a validação falhar, a nova coleção é
+    removida e o alias não é alterado.
+
+    Se existir uma coleção "real" com o mesmo nome do alias (instalações
+    anteriores ao reload blue/green), ela tem precedência sobre o alias no
+    Typesense; com replace_legacy=True ela é removida logo após a troca.
+
+    Args:
+        client: Cliente Typesense
+        df: DataFrame, ou iterador de DataFrames, com documentos a indexar
+        alias: Nome do alias servido aos clientes (default: 'news')
+        keep_versions: Versões mantidas após a troca, incluindo a atual (default: 2)
+        min_documents_ratio: Fração mínima de documentos da versão anterior que a
+            nova precisa ter para ser aceita (default: 0.9)
+        replace_legacy: Remove a coleção legada com o nome do alias (default: False)
+        **index_kwargs: Repassados para index_documents (batch_size, concurrency...)
+
+    Returns:
+        Estatísticas de index_documents acrescidas de 'collection_name',
+        'previous_collection', 'swapped' e 'removed_versions'
+
+    Raises:
+        Exception: Se ocorrer erro na criação ou indexação da nova coleção (que
+            é removida antes de o erro ser repassado)
+    """
+    collection_name = versioned_collection_name(alias)
+    previous = get_alias_target(client, alias)
+    logger.info(
+        f"Reload blue/green: construindo '{collection_name}' "
+        f"(alias '{alias}' atualmente em '{previous or '-'}')"
+    )
+
+    # Versão servida hoje (via alias ou coleção legada) define o mínimo aceitável
+    try:
+        previous_count = client.collections[alias].retrieve()["num_documents"]
+    except ObjectNotFound:
+        previous_count = 0
+    min_documents = max(int(previous_count * min_documents_ratio), 1)
+
+    try:
+        create_collection(client, collection_name)
+        stats = index_documents(
+            client, df, collection_name, mode="full", force=True, **index_kwargs
+        )
+    except Exception:
+        # Sem isso a versão incompleta ficaria órfã e, por ser a mais recente,
+        # seria mantida pela limpeza no lugar da última versão boa
+        logger.error(
+            f"Falha ao construir '{collection_name}'; removendo a versão incompleta"
+        )
+        try:
+            client.collections[collection_name].delete()
+        except ObjectNotFound:
+            pass
+        raise
+    stats.update(
+        {
+            "collection_name": collection_name,
+            "previous_collection": previous,
+            "swapped": False,
+            "removed_versions": [],
+        }
+    )
+
+    if not validate_collection(client, collection_name, min_documents):
+        logger.error(
+            f"Nova versão '{collection_name}' reprovada; alias '{alias}' mantido"
+        )
+        client.collections[collection_name].delete()
+        return stats
+
+    point_alias(client, collection_name, alias)
+    stats["swapped"] = True
+    invalidate_search_caches()
+
+    _handle_legacy_collection(client, alias, replace_legacy)
+
+    stats["removed_versions"] = cleanup_collection_versions(
+        client, alias, keep=keep_versions
+    )
+    return stats
+
+
+def _handle_legacy_collection(
+    client: typesense.Client, alias: str, replace_legacy: bool
+) -> None:
+    """Trata uma coleção real com o mesmo nome do alias, que o sombrearia."""
+    names = {collection["name"] for collection in client.collections.retrieve()}
+    if alias not in names:
+        return
+
+    if replace_legacy:
+        logger.warning(f"Removendo coleção legada '{alias}' para ativar o alias")
+        client.collections[alias].delete()
+    else:
+        logger.warning(
+            f"Coleção legada '{alias}' tem precedência sobre o alias; "
+            "remova-a (ou use --force) para servir a nova versão"
+        )
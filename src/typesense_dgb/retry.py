@@ -0,0 +1,132 @@
+"""
+Política de retry para imports no Typesense.
+"""
+
+import asyncio
+import json
+import random
+from typing import IO, Any
+
+import requests
+from typesense.exceptions import (
+    HTTPStatus0Error,
+    ServerError,
+    ServiceUnavailable,
+    Timeout,
+)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - dependência opcional
+    aiohttp = None
+
+# Erros de transporte que justificam reenviar o batch inteiro
+TRANSIENT_ERRORS: tuple[type[Exception], ...] = (
+    HTTPStatus0Error,
+    ServerError,
+    ServiceUnavailable,
+    Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    asyncio.TimeoutError,
+)
+if aiohttp is not None:
+    TRANSIENT_ERRORS += (aiohttp.ClientConnectionError,)
+
+# Códigos de erro por linha que indicam falha transitória no servidor
+RETRYABLE_CODES = {408, 429}
+
+
+class RetryPolicy:
+    """
+    Retry com backoff exponencial e jitter para imports.
+
+    Batches que falham por erro de transporte (TRANSIENT_ERRORS) são
+    reenviados inteiros; em falhas parciais, só as linhas com código 408,
+    429 ou 5xx são reenviadas. Linhas rejeitadas de forma permanente (ex.:
+    erro de schema) ou sem código não são reenviadas, e qualquer outra
+    exceção é lançada sem reenvio.
+
+    O cliente typesense já repete internamente erros de transporte e 5xx
+    (`num_retries` vezes, passando pelos nós do cluster, com
+    `retry_interval_seconds` entre elas). Cada tentativa daqui inclui essas
+    repetições: num erro persistente são feitas até
+    (max_retries + 1) * (num_retries + 1) requisições. As repetições do
+    cliente cobrem o failover imediato entre nós; as desta política, o
+    backoff longo e as falhas por linha.
+
+    Args:
+        max_retries: Número máximo de reenvios por batch (default: 3)
+        base_delay: Espera base em segundos antes do primeiro reenvio (default: 1.0)
+        max_delay: Espera máxima em segundos entre tentativas (default: 30.0)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ) -> None:
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Espera antes do reenvio de número `attempt` (a partir de 1).
+
+        Usa "full jitter": um valor aleatório entre 0 e o backoff exponencial,
+        para que workers concorrentes não reenviem todos ao mesmo tempo.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def is_retryable(result: dict[str, Any]) -> bool:
+        """
+        Indica se a falha de uma linha do import é transitória.
+
+        Só 408, 429 e 5xx são reenviadas; linhas sem código numérico são
+        tratadas como permanentes.
+        """
+        code = result.get("code")
+        return isinstance(code, int) and (code in RETRYABLE_CODES or code >= 500)
+
+
+def split_failures(
+    payload: bytes, failures: list[tuple[int, dict[str, Any]]]
+) -> tuple[list[tuple[bytes, dict[str, Any]]], list[tuple[bytes, dict[str, Any]]]]:
+    """
+    Separa as linhas com falha de um payload em transitórias e permanentes.
+
+    Args:
+        payload: Payload JSONL enviado
+        failures: Falhas do import como (posição da linha, resultado)
+
+    Returns:
+        Tupla (falhas transitórias, falhas permanentes) como (linha, resultado)
+    """
+    lines = payload.split(b"\n")
+    retryable = []
+    permanent = []
+    for position, result in failures:
+        target = retryable if RetryPolicy.is_retryable(result) else permanent
+        target.append((lines[position], result))
+    return retryable, permanent
+
+
+def write_dead_letters(
+    output: IO[str], rejected: list[tuple[bytes, dict[str, Any]]]
+) -> None:
+    """
+    Grava documentos rejeitados em JSONL para reprocessamento manual.
+
+    Cada linha contém o documento original, a mensagem de erro e o código.
+    """
+    for line, result in rejected:
+        record = {
+            "error": result.get("error"),
+            "code": result.get("code"),
+            "document": json.loads(line),
+        }
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1,422 @@
+"""
+Busca com cache de resultados para consultas repetitivas.
+
+O servidor MCP e outros consumidores repetem muito as mesmas consultas
+(facets com q=*, termos populares). CachedSearchClient guarda as respostas
+num cache LRU com TTL, indexado pelos parâmetros normalizados, e agrupa
+requisições idênticas simultâneas numa só chamada ao Typesense
+(single-flight):
+
+    search = CachedSearchClient(ttl=60)
+    result = search.search({"q": "*", "query_by": "title", "facet_by": "agency"})
+
+Os caches do processo são invalidados quando index_documents termina uma
+carga; em outros processos, o TTL limita por quanto tempo um resultado
+antigo pode ser servido.
+
+Para cargas de trabalho com muitas buscas independentes (contagens por
+órgão, por tema, por período), MultiSearchExecutor agrupa as buscas em
+requisições multi_search e devolve a resposta de cada uma:
+
+    with MultiSearchExecutor(client) as executor:
+        futures = {agency: executor.submit({"q": "*", "filter_by": f"agency:={agency}",
+                                            "per_page": 0}) for agency in agencies}
+    counts = {agency: future.result()["found"] for agency, future in futures.items()}
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import typesense
+from typesense.api_call import ApiCall
+from typesense.exceptions import TypesenseClientError
+
+from typesense_dgb.client import get_client
+from typesense_dgb.collection import COLLECTION_NAME
+
+logger = logging.getLogger(__name__)
+
+# Buscas por requisição de multi_search (limit_multi_searches padrão do servidor)
+MULTI_SEARCH_LIMIT = 50
+
+# Parâmetros cujo valor é uma lista separada por vírgulas
+LIST_PARAMS = {"query_by", "facet_by", "include_fields", "exclude_fields", "sort_by"}
+
+# Caches vivos no processo, invalidados por invalidate_search_caches
+_CACHES: "weakref.WeakSet[CachedSearchClient]" = weakref.WeakSet()
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _normalize_value(name: str, value: Any) -> str:
+    """Representação canônica de um parâmetro de busca."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        value = ",".join(str(item) for item in value)
+    value = str(value).strip()
+    if name == "q":
+        return " ".join(value.lower().split())
+    if name in LIST_PARAMS:
+        return ",".join(item.strip() for item in value.split(",") if item.strip())
+    return value
+
+
+def cache_key(collection_name: str, params: Mapping[str, Any]) -> CacheKey:
+    """
+    Chave de cache de uma busca.
+
+    A ordem dos parâmetros, espaços extras, maiúsculas em q e valores None
+    não mudam a chave; a ordem dentro de query_by e facet_by muda (afeta a
+    relevância e a ordem dos facets).
+    """
+    items = tuple(
+        sorted(
+            (name, _normalize_value(name, value))
+            for name, value in params.items()
+            if value is not None
+        )
+    )
+    return collection_name, items
+
+
+class SearchCache:
+    """
+    Cache LRU com TTL para respostas de busca.
+
+    Args:
+        max_entries: Número máximo de respostas guardadas (default: 1024)
+        ttl: Validade de uma resposta em segundos (default: 60.0)
+        clock: Relógio monotônico em segundos (default: time.monotonic)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Any | None:
+        """Retorna a resposta guardada, ou None se ausente ou expirada."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        """Guarda uma resposta, removendo a menos usada se o cache estiver cheio."""
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, collection_name: str | None = None) -> int:
+        """
+        Remove as respostas de uma coleção, ou todas se collection_name for None.
+
+        Returns:
+            Número de respostas removidas
+        """
+        if collection_name is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+        keys = [key for key in self._entries if key[0] == collection_name]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+
+class _Flight:
+    """Busca em andamento, compartilhada pelas requisições idênticas."""
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+        self.done = threading.Event()
+        self.result: dict[str, Any] | None = None
+        self.error: BaseException | None = None
+
+
+class CachedSearchClient:
+    """
+    Fachada de busca com cache LRU+TTL e agrupamento de requisições idênticas.
+
+    As respostas são compartilhadas entre chamadas e não devem ser alteradas
+    por quem as recebe. Erros não são guardados no cache.
+
+    Args:
+        client: Cliente Typesense (default: get_client())
+        collection_name: Coleção (ou alias) padrão das buscas (default: 'news')
+        max_entries: Número máximo de respostas guardadas (default: 1024)
+        ttl: Validade de uma resposta em segundos (default: 60.0)
+        clock: Relógio monotônico, para testes (default: time.monotonic)
+    """
+
+    def __init__(
+        self,
+        client: typesense.Client | None = None,
+        collection_name: str = COLLECTION_NAME,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client if client is not None else get_client()
+        self.collection_name = collection_name
+        self.cache = SearchCache(max_entries=max_entries, ttl=ttl, clock=clock)
+        self.stats: Counter[str] = Counter()
+        self._inflight: dict[CacheKey, _Flight] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        _CACHES.add(self)
+
+    def search(
+        self, params: Mapping[str, Any], collection_name: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Executa uma busca, servindo do cache quando possível.
+
+        Args:
+            params: Parâmetros de busca do Typesense (q, query_by, filter_by...)
+            collection_name: Coleção da busca (default: a coleção padrão)
+
+        Returns:
+            Resposta da busca do Typesense
+
+        Raises:
+            Exception: Erro do Typesense na busca (repassado a todas as
+                requisições agrupadas)
+        """
+        collection_name = collection_name or self.collection_name
+        key = cache_key(collection_name, params)
+
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight(self._generation)
+                self._inflight[key] = flight
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self.client.collections[collection_name].documents.search(
+                dict(params)
+            )
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                # Resposta obtida antes de uma invalidação não entra no cache
+                if flight.error is None and flight.generation == self._generation:
+                    self.cache.put(key, flight.result)
+            flight.done.set()
+
+        return flight.result
+
+    def invalidate(self, collection_name: str | None = None) -> int:
+        """
+        Descarta as respostas de uma coleção, ou todas se collection_name for None.
+
+        Buscas em andamento terminam normalmente, mas suas respostas não são
+        guardadas.
+
+        Returns:
+            Número de respostas removidas do cache
+        """
+        with self._lock:
+            self._generation += 1
+            self._inflight.clear()
+            removed = self.cache.invalidate(collection_name)
+        self.stats["invalidations"] += 1
+        return removed
+
+
+def invalidate_search_caches(collection_name: str | None = None) -> None:
+    """
+    Invalida todos os CachedSearchClient do processo.
+
+    Chamado ao final de index_documents e sync_documents (para a coleção
+    carregada) e de blue_green_reload (todas as coleções, pois o alias muda).
+    """
+    removed = sum(cache.invalidate(collection_name) for cache in list(_CACHES))
+    if removed:
+        logger.info(f"Cache de busca invalidado: {removed} respostas descartadas")
+
+
+class MultiSearchExecutor:
+    """
+    Agrupa buscas independentes em requisições multi_search.
+
+    submit() enfileira uma busca e retorna um Future; flush() (ou a saída do
+    bloco with) envia as buscas pendentes em lotes de até max_per_request,
+    com até `concurrency` lotes simultâneos, e resolve cada Future com a
+    resposta da sua busca. Uma busca com erro resolve só o seu Future com a
+    exceção correspondente ao código (ex.: ObjectNotFound); uma falha da
+    requisição inteira é repassada a todas as buscas do lote, e buscas sem
+    resposta no lote falham com TypesenseClientError.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Coleção (ou alias) padrão das buscas (default: 'news')
+        max_per_request: Buscas por requisição multi_search (default: 50)
+        concurrency: Requisições multi_search simultâneas (default: 4)
+    """
+
+    def __init__(
+        self,
+        client: typesense.Client,
+        collection_name: str = COLLECTION_NAME,
+        max_per_request: int = MULTI_SEARCH_LIMIT,
+        concurrency: int = 4,
+    ) -> None:
+        self.client = client
+        self.collection_name = collection_name
+        self.max_per_request = max_per_request
+        self.concurrency = concurrency
+        self.requests = 0
+        self._pending: list[tuple[dict[str, Any], Future]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "MultiSearchExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def submit(
+        self, params: Mapping[str, Any], collection_name: str | None = None
+    ) -> Future:
+        """
+        Enfileira uma busca para o próximo flush.
+
+        Args:
+            params: Parâmetros de busca do Typesense
+            collection_name: Coleção da busca (default: a coleção padrão)
+
+        Returns:
+            Future resolvido com a resposta da busca
+        """
+        search = {**params, "collection": collection_name or self.collection_name}
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((search, future))
+        return future
+
+    def _send(self, chunk: list[tuple[dict[str, Any], Future]]) -> None:
+        """Envia um lote e resolve os Futures com as respostas."""
+        try:
+            response = self.client.multi_search.perform(
+                {"searches": [search for search, _ in chunk]}, {}
+            )
+        except Exception as e:
+            for _, future in chunk:
+                future.set_exception(e)
+            return
+
+        results = response.get("results", [])
+        for (_, future), result in zip(chunk, results):
+            if "error" in result:
+                code = result.get("code", 400)
+                future.set_exception(ApiCall.get_exception(code)(code, result["error"]))
+            else:
+                future.set_result(result)
+
+        # Resposta truncada (ou limitada por limit_multi_searches): as buscas
+        # sem resposta falham, em vez de deixar seus Futures pendentes
+        if len(results) < len(chunk):
+            message = (
+                f"multi_search retornou {len(results)} respostas "
+                f"para {len(chunk)} buscas"
+            )
+            logger.error(message)
+            for _, future in chunk[len(results) :]:
+                future.set_exception(TypesenseClientError(message))
+
+    def flush(self) -> None:
+        """Envia todas as buscas pendentes e aguarda as respostas."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        chunks = [
+            pending[start : start + self.max_per_request]
+            for start in range(0, len(pending), self.max_per_request)
+        ]
+        self.requests += len(chunks)
+
+        if len(chunks) <= 1 or self.concurrency <= 1:
+            for chunk in chunks:
+                self._send(chunk)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(chunks))
+        ) as executor:
+            list(executor.map(self._send, chunks))
+
+    def execute(
+        self,
+        searches: Iterable[Mapping[str, Any]],
+        return_exceptions: bool = False,
+    ) -> list[dict[str, Any] | BaseException]:
+        """
+        Executa as buscas e retorna as respostas na mesma ordem.
+
+        Args:
+            searches: Parâmetros de cada busca; 'collection' em uma busca
+                sobrescreve a coleção padrão
+            return_exceptions: Se True, buscas com erro aparecem na lista como
+                exceções; se False, o primeiro erro é lançado (default: False)
+
+        Returns:
+            Respostas das buscas, na ordem de searches
+
+        Raises:
+            Exception: Erro da primeira busca com falha, se return_exceptions=False
+        """
+        futures = [
+            self.submit(
+                {key: value for key, value in search.items() if key != "collection"},
+                search.get("collection"),
+            )
+            for search in searches
+        ]
+        self.flush()
+        if return_exceptions:
+            return [future.exception() or future.result() for future in futures]
+        return [future.result() for future in futures]
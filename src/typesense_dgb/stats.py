@@ -0,0 +1,292 @@
+"""
+Snapshot pré-calculado das contagens por facet para dashboards.
+
+As telas iniciais dos dashboards mostram contagens por órgão, tema e período
+sobre a coleção inteira, o que obriga o Typesense a percorrer todos os
+documentos a cada acesso. O carregador calcula essas contagens uma vez por
+carga, no pipeline pandas, e grava o resultado na coleção 'news_stats' (um
+documento por campo e valor) ou num arquivo JSON:
+
+    stats = NewsStats()
+    df = download_and_process_dataset(stats=stats)
+    index_documents(client, df)
+    write_stats(client, stats)
+
+    get_stats(client, "agency", limit=10)
+    # {"saude": 1520, "mec": 1311, ...}
+
+As contagens equivalem a facet_by no campo, com q=* e sem filtros, sobre a
+coleção 'news'. Cargas que não passam pelo dataset completo (incremental)
+recalculam o snapshot a partir da coleção com collection_stats.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import typesense
+
+from typesense_dgb.collection import COLLECTION_NAME, create_collection
+from typesense_dgb.indexer import (
+    OPTIONAL_INT_FIELDS,
+    clean_positive_int_column,
+    clean_string_column,
+)
+from typesense_dgb.search import MultiSearchExecutor
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION_NAME = "news_stats"
+
+# Campos da coleção 'news' com contagens pré-calculadas
+STATS_FIELDS = [
+    "agency",
+    "category",
+    "theme_1_level_1_code",
+    "theme_1_level_1_label",
+    "theme_1_level_2_code",
+    "theme_1_level_2_label",
+    "theme_1_level_3_code",
+    "theme_1_level_3_label",
+    "published_year",
+    "published_month",
+    "published_week",
+]
+
+# Pseudo-campo com o total de documentos (valor TOTAL_VALUE)
+TOTAL_FIELD = "documents"
+TOTAL_VALUE = "total"
+
+# Valores de facet pedidos por campo em collection_stats
+MAX_FACET_VALUES = 10000
+
+# Documentos por página ao ler o snapshot (máximo do Typesense)
+STATS_PAGE_SIZE = 250
+
+STATS_SCHEMA: dict[str, Any] = {
+    "name": STATS_COLLECTION_NAME,
+    "fields": [
+        {"name": "field", "type": "string", "facet": True},
+        {"name": "value", "type": "string", "facet": False},
+        {"name": "count", "type": "int64", "facet": False},
+        {"name": "generation", "type": "int64", "facet": False},
+    ],
+    "default_sorting_field": "count",
+}
+
+
+def _facet_values(df: pd.DataFrame, field: str) -> list[str]:
+    """
+    Valores do campo como ficam no índice e no facet do Typesense.
+
+    Usa a mesma normalização de prepare_documents (textos sem espaços nas
+    pontas, vazios e inteiros <= 0 descartados) para que as contagens batam
+    com as de collection_stats.
+    """
+    int_columns = dict(OPTIONAL_INT_FIELDS)
+    if field in int_columns:
+        values = clean_positive_int_column(df, int_columns[field])
+    else:
+        values = clean_string_column(df, field)
+    return [str(value) for value in values if value is not None]
+
+
+class NewsStats:
+    """
+    Contagens por valor dos campos de STATS_FIELDS.
+
+    add() pode ser chamado bloco a bloco (modo streaming): as contagens são
+    somadas, então cada registro deve passar uma única vez.
+    """
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self.counts: dict[str, Counter[str]] = {
+            field: Counter() for field in STATS_FIELDS
+        }
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Soma as contagens de um DataFrame processado."""
+        self.documents += len(df)
+        for field in STATS_FIELDS:
+            self.counts[field].update(_facet_values(df, field))
+
+    def top(self, field: str, limit: int | None = None) -> dict[str, int]:
+        """Valores mais frequentes de um campo, do maior para o menor."""
+        return dict(self.counts[field].most_common(limit))
+
+    def to_documents(self, generation: int) -> list[dict[str, Any]]:
+        """Documentos da coleção news_stats, um por campo e valor."""
+        documents = [
+            {
+                "id": f"{TOTAL_FIELD}:{TOTAL_VALUE}",
+                "field": TOTAL_FIELD,
+                "value": TOTAL_VALUE,
+                "count": self.documents,
+                "generation": generation,
+            }
+        ]
+        for field, counts in self.counts.items():
+            documents.extend(
+                {
+                    "id": f"{field}:{value}",
+                    "field": field,
+                    "value": value,
+                    "count": count,
+                    "generation": generation,
+                }
+                for value, count in counts.items()
+            )
+        return documents
+
+    def to_dict(self) -> dict[str, Any]:
+        """Representação JSON: total de documentos e contagens por campo."""
+        return {
+            TOTAL_FIELD: self.documents,
+            "fields": {field: self.top(field) for field in STATS_FIELDS},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "NewsStats":
+        """Recria as contagens a partir de to_dict()."""
+        stats = cls()
+        stats.documents = data[TOTAL_FIELD]
+        for field, counts in data["fields"].items():
+            stats.counts[field] = Counter(counts)
+        return stats
+
+
+def collection_stats(
+    client: typesense.Client, collection_name: str = COLLECTION_NAME
+) -> NewsStats:
+    """
+    Calcula o snapshot a partir da coleção, com um facet por campo.
+
+    Usado quando a carga não vê o dataset completo; as buscas vão juntas
+    numa só requisição multi_search.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Coleção (ou alias) de notícias (default: 'news')
+
+    Returns:
+        Contagens da coleção
+    """
+    searches = [
+        {
+            "q": "*",
+            "per_page": 0,
+            "facet_by": field,
+            "max_facet_values": MAX_FACET_VALUES,
+        }
+        for field in STATS_FIELDS
+    ]
+    results = MultiSearchExecutor(client, collection_name).execute(searches)
+
+    stats = NewsStats()
+    stats.documents = results[0]["found"]
+    for field, result in zip(STATS_FIELDS, results):
+        for facet in result.get("facet_counts", []):
+            if facet.get("field_name") == field:
+                stats.counts[field] = Counter(
+                    {item["value"]: item["count"] for item in facet["counts"]}
+                )
+    return stats
+
+
+def write_stats(
+    client: typesense.Client,
+    stats: NewsStats,
+    collection_name: str = STATS_COLLECTION_NAME,
+) -> int:
+    """
+    Grava o snapshot na coleção de estatísticas, criando-a se necessário.
+
+    Os documentos são atualizados por upsert e só depois os valores que
+    saíram do snapshot são removidos, então a coleção nunca fica vazia
+    durante a troca.
+
+    Args:
+        client: Cliente Typesense
+        stats: Contagens a gravar
+        collection_name: Coleção de estatísticas (default: 'news_stats')
+
+    Returns:
+        Número de documentos gravados
+
+    Raises:
+        RuntimeError: Se algum documento for rejeitado pelo Typesense
+    """
+    create_collection(client, collection_name, schema=dict(STATS_SCHEMA))
+    generation = time.time_ns()
+    documents = stats.to_documents(generation)
+
+    documents_api = client.collections[collection_name].documents
+    results = documents_api.import_(documents, {"action": "upsert"})
+    failed = [result for result in results if not result.get("success")]
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} documentos de estatísticas rejeitados: {failed[0]}"
+        )
+
+    removed = documents_api.delete({"filter_by": f"generation:<{generation}"})
+    logger.info(
+        f"Estatísticas gravadas em '{collection_name}': {len(documents)} valores, "
+        f"{removed.get('num_deleted', 0)} removidos"
+    )
+    return len(documents)
+
+
+def get_stats(
+    client: typesense.Client,
+    field: str,
+    limit: int | None = None,
+    collection_name: str = STATS_COLLECTION_NAME,
+) -> dict[str, int]:
+    """
+    Lê as contagens de um campo do snapshot.
+
+    Args:
+        client: Cliente Typesense
+        field: Campo de STATS_FIELDS, ou TOTAL_FIELD para o total de documentos
+        limit: Número máximo de valores (default: None, todos)
+        collection_name: Coleção de estatísticas (default: 'news_stats')
+
+    Returns:
+        Dicionário valor -> contagem, do maior para o menor
+    """
+    counts: dict[str, int] = {}
+    page = 1
+    while limit is None or len(counts) < limit:
+        per_page = STATS_PAGE_SIZE if limit is None else min(limit, STATS_PAGE_SIZE)
+        result = client.collections[collection_name].documents.search(
+            {
+                "q": "*",
+                "filter_by": f"field:=`{field}`",
+                "sort_by": "count:desc",
+                "include_fields": "value,count",
+                "per_page": per_page,
+                "page": page,
+            }
+        )
+        for hit in result["hits"]:
+            counts[hit["document"]["value"]] = hit["document"]["count"]
+        if page * per_page >= result["found"]:
+            break
+        page += 1
+    return dict(list(counts.items())[:limit])
+
+
+def write_stats_json(stats: NewsStats, path: str | Path) -> None:
+    """Grava o snapshot como JSON, para dashboards que não acessam o Typesense."""
+    Path(path).write_text(json.dumps(stats.to_dict(), ensure_ascii=False, indent=2))
+    logger.info(f"Estatísticas gravadas em {path}")
+
+
+def read_stats_json(path: str | Path) -> NewsStats:
+    """Lê um snapshot gravado com write_stats_json."""
+    return NewsStats.from_dict(json.loads(Path(path).read_text()))
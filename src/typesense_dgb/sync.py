@@ -0,0 +1,276 @@
+"""
+Sincronização incremental por fingerprint de conteúdo.
+
+Em vez de reenviar tudo o que foi publicado nos últimos N dias, guarda num
+manifesto SQLite local um fingerprint de 64 bits de cada documento indexado
+(por unique_id). A cada carga, o dataset completo é comparado com o manifesto
+e apenas documentos novos ou alterados são enviados; ids que sumiram do
+dataset são removidos da coleção. Assim correções em notícias antigas também
+são propagadas.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from typing import Any
+from urllib.parse import quote
+
+import pandas as pd
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.batching import iter_batches
+from typesense_dgb.collection import COLLECTION_NAME
+from typesense_dgb.indexer import document_ids, index_documents, prepare_documents
+from typesense_dgb.jsonl import dumps_document
+from typesense_dgb.search import invalidate_search_caches
+
+logger = logging.getLogger(__name__)
+
+# Manifesto padrão, relativo ao diretório de execução
+DEFAULT_MANIFEST_PATH = "typesense_sync_manifest.sqlite"
+
+# Número de ids por requisição de remoção (filter_by id:[...])
+DELETE_BATCH_SIZE = 100
+
+
+def document_fingerprint(document: dict[str, Any]) -> int:
+    """
+    Calcula o fingerprint de 64 bits de um documento preparado.
+
+    Usa o JSON exato que seria enviado ao Typesense, então qualquer mudança
+    em um campo indexado altera o fingerprint.
+
+    Returns:
+        Inteiro com sinal de 64 bits (cabe numa coluna INTEGER do SQLite)
+    """
+    digest = hashlib.blake2b(dumps_document(document), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SyncManifest:
+    """
+    Manifesto local com o fingerprint de cada documento já indexado.
+
+    Pode ser usado como context manager:
+
+        with SyncManifest("manifest.sqlite") as manifest:
+            fingerprints = manifest.fingerprints()
+
+    Args:
+        path: Caminho do arquivo SQLite (criado se não existir)
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "id TEXT PRIMARY KEY, fingerprint INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "SyncManifest":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo do manifesto."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def fingerprints(self) -> dict[str, int]:
+        """Retorna todos os fingerprints registrados, por id."""
+        return dict(self._connection.execute("SELECT id, fingerprint FROM documents"))
+
+    def update(self, changed: dict[str, int], removed: Iterable[str] = ()) -> None:
+        """
+        Registra documentos indexados e remove ids apagados, numa só transação.
+
+        Args:
+            changed: Fingerprints dos documentos enviados com sucesso, por id
+            removed: Ids removidos da coleção
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO documents (id, fingerprint) VALUES (?, ?)",
+                changed.items(),
+            )
+            self._connection.executemany(
+                "DELETE FROM documents WHERE id = ?", ((id_,) for id_ in removed)
+            )
+
+    def clear(self) -> None:
+        """Apaga todos os fingerprints (força reenvio completo na próxima carga)."""
+        with self._connection:
+            self._connection.execute("DELETE FROM documents")
+
+
+def _iter_changed(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    batch_size: int,
+    known: dict[str, int],
+    seen: set[str],
+    pending: dict[str, int],
+) -> Iterator[list[dict[str, Any]] | pd.DataFrame]:
+    """
+    Filtra o dataset, mantendo só os documentos novos ou alterados.
+
+    Preenche `seen` com todos os ids encontrados e `pending` com o fingerprint
+    dos documentos que serão enviados.
+
+    Yields:
+        Listas com os documentos preparados a indexar (sem nova preparação
+        em index_documents), ou o batch inteiro se a preparação falhar
+    """
+    for batch in iter_batches(data, batch_size):
+        try:
+            documents = prepare_documents(batch)
+        except Exception as e:
+            # Envia o batch inteiro; a indexação isola as linhas com problema.
+            # Sem fingerprint, essas linhas serão reenviadas na próxima carga.
+            logger.warning(f"Fingerprint indisponível para o batch, reenviando: {e}")
+            seen.update(document_ids(batch))
+            yield batch
+            continue
+
+        changed = []
+        for document in documents:
+            doc_id = document["id"]
+            seen.add(doc_id)
+            fingerprint = document_fingerprint(document)
+            if known.get(doc_id) != fingerprint:
+                pending[doc_id] = fingerprint
+                changed.append(document)
+
+        if changed:
+            yield changed
+
+
+def _delete_documents(
+    client: typesense.Client, collection_name: str, ids: list[str]
+) -> int:
+    """
+    Remove documentos da coleção por id, em lotes de DELETE_BATCH_SIZE.
+
+    O filter_by não tem como escapar crases dentro de um valor entre crases,
+    então ids com crase são removidos um a um pela rota do documento.
+
+    Returns:
+        Número de documentos removidos segundo o Typesense
+    """
+    deleted = 0
+    documents = client.collections[collection_name].documents
+    filterable = [doc_id for doc_id in ids if "`" not in doc_id]
+    for start in range(0, len(filterable), DELETE_BATCH_SIZE):
+        chunk = filterable[start : start + DELETE_BATCH_SIZE]
+        id_filter = ",".join(f"`{doc_id}`" for doc_id in chunk)
+        result = documents.delete({"filter_by": f"id:[{id_filter}]"})
+        deleted += result.get("num_deleted", 0)
+
+    for doc_id in ids:
+        if "`" in doc_id:
+            try:
+                documents[quote(doc_id, safe="")].delete()
+            except ObjectNotFound:
+                continue
+            deleted += 1
+    return deleted
+
+
+def sync_documents(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    collection_name: str = COLLECTION_NAME,
+    manifest_path: str = DEFAULT_MANIFEST_PATH,
+    batch_size: int = 1000,
+    delete_removed: bool = True,
+    max_delete_ratio: float = 0.1,
+    **index_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Envia ao Typesense apenas os documentos novos ou alterados desde a última carga.
+
+    O df deve conter o dataset completo (download_and_process_dataset com
+    mode='full'): ids do manifesto ausentes do df são removidos da coleção.
+    Na primeira execução o manifesto está vazio e todos os documentos são
+    enviados.
+
+    Args:
+        client: Cliente Typesense
+        df: DataFrame, ou iterador de DataFrames, com o dataset completo
+        collection_name: Nome da coleção (ou alias)
+        manifest_path: Arquivo SQLite do manifesto (default: DEFAULT_MANIFEST_PATH)
+        batch_size: Tamanho do batch para comparação e importação (default: 1000)
+        delete_removed: Se True, remove da coleção ids que saíram do dataset
+            (default: True)
+        max_delete_ratio: Fração máxima do manifesto que pode ser removida numa
+            carga; acima disso as remoções são puladas, protegendo contra um
+            dataset truncado. Use 1.0 para desativar (default: 0.1)
+        **index_kwargs: Repassados para index_documents (concurrency, retry_policy...)
+
+    Returns:
+        Estatísticas de index_documents acrescidas de 'unchanged', 'changed'
+        e 'deleted'
+
+    Raises:
+        Exception: Se ocorrer erro na indexação ou remoção
+    """
+    with SyncManifest(manifest_path) as manifest:
+        known = manifest.fingerprints()
+
+        # Coleção recriada vazia: o manifesto não vale mais
+        collection_info = client.collections[collection_name].retrieve()
+        if known and collection_info.get("num_documents", 0) == 0:
+            logger.warning("Coleção vazia com manifesto existente; reenviando tudo")
+            manifest.clear()
+            known = {}
+
+        seen: set[str] = set()
+        pending: dict[str, int] = {}
+        stats = index_documents(
+            client,
+            _iter_changed(df, batch_size, known, seen, pending),
+            collection_name,
+            mode="incremental",
+            batch_size=batch_size,
+            **index_kwargs,
+        )
+
+        num_changed = len(pending)
+
+        # Documentos rejeitados ficam fora do manifesto para serem reenviados
+        for doc_id in stats["failed_ids"]:
+            pending.pop(doc_id, None)
+
+        removed = sorted(set(known) - seen) if delete_removed and seen else []
+        if removed and len(removed) > max_delete_ratio * len(known):
+            logger.warning(
+                f"{len(removed)} de {len(known)} documentos sumiram do dataset; "
+                f"acima do limite de {max_delete_ratio:.0%}, remoções puladas"
+            )
+            removed = []
+
+        deleted = _delete_documents(client, collection_name, removed) if removed else 0
+        if deleted:
+            invalidate_search_caches(collection_name)
+        manifest.update(pending, removed)
+
+    stats.update(
+        {
+            "unchanged": len(seen) - num_changed,
+            "changed": num_changed,
+            "deleted": deleted,
+        }
+    )
+    logger.info(
+        f"Sincronização: {stats['changed']} novos/alterados, "
+        f"{stats['unchanged']} inalterados, {deleted} removidos"
+    )
+    return stats
@@ -0,0 +1,324 @@
+"""
+Séries temporais de contagem de notícias (semanal, mensal e anual).
+
+Cada série é resolvida com facets em vez de uma busca por período:
+weekly_counts usa o facet de published_week numa única busca, mesmo para 52
+semanas. Em coleções antigas, sem published_week, as semanas viram buscas
+por intervalo de published_at, enviadas juntas via multi_search
+(MultiSearchExecutor). As séries são densas: períodos sem notícias
+aparecem com contagem 0.
+
+    weekly_counts(client, "saúde", 202501, 202552, {"agency": "saude"})
+    # {202501: 12, 202502: 0, ..., 202552: 7}
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.collection import COLLECTION_NAME
+from typesense_dgb.search import MultiSearchExecutor
+
+logger = logging.getLogger(__name__)
+
+# Campos de texto usados quando há termo de busca
+DEFAULT_QUERY_BY = "title,content"
+
+
+def week_start(week: int) -> datetime:
+    """
+    Início (segunda-feira 00:00 UTC) da semana ISO 8601 no formato YYYYWW.
+
+    published_week é calculado sobre o timestamp em UTC, então os intervalos
+    usam o mesmo fuso.
+    """
+    monday = date.fromisocalendar(week // 100, week % 100, 1)
+    return datetime(monday.year, monday.month, monday.day, tzinfo=timezone.utc)
+
+
+def week_range(start_week: int, end_week: int) -> list[int]:
+    """
+    Semanas ISO 8601 (YYYYWW) de start_week a end_week, inclusive.
+
+    Raises:
+        ValueError: Se alguma semana for inválida ou start_week > end_week
+    """
+    if start_week > end_week:
+        raise ValueError(f"Semana inicial {start_week} depois da final {end_week}")
+    current, end = week_start(start_week), week_start(end_week)
+    weeks = []
+    while current <= end:
+        iso_year, iso_week, _ = current.isocalendar()
+        weeks.append(iso_year * 100 + iso_week)
+        current += timedelta(weeks=1)
+    return weeks
+
+
+def month_range(start_month: int, end_month: int) -> list[int]:
+    """
+    Meses (YYYYMM) de start_month a end_month, inclusive.
+
+    Raises:
+        ValueError: Se algum mês for inválido ou start_month > end_month
+    """
+    for month in (start_month, end_month):
+        if not 1 <= month % 100 <= 12:
+            raise ValueError(f"Mês inválido: {month}")
+    if start_month > end_month:
+        raise ValueError(f"Mês inicial {start_month} depois do final {end_month}")
+
+    months = []
+    year, month = divmod(start_month, 100)
+    while year * 100 + month <= end_month:
+        months.append(year * 100 + month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _format_value(value: Any) -> str:
+    """Valor de filtro: números sem aspas, textos entre crases."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return f"`{value}`"
+
+
+def build_filter(filters: str | Mapping[str, Any] | None, *extra: str) -> str:
+    """
+    Monta um filter_by a partir de filtros e condições extras, unidos por &&.
+
+    Args:
+        filters: filter_by pronto, ou dicionário campo -> valor (ou lista de
+            valores, combinados com OU)
+        *extra: Condições adicionais já no formato do Typesense
+
+    Returns:
+        Expressão filter_by (vazia se não houver condições)
+    """
+    clauses = []
+    if isinstance(filters, str):
+        if filters.strip():
+            clauses.append(filters.strip())
+    elif filters:
+        for field, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                values = ",".join(_format_value(item) for item in value)
+                clauses.append(f"{field}:[{values}]")
+            else:
+                clauses.append(f"{field}:={_format_value(value)}")
+    clauses.extend(extra)
+    return " && ".join(clauses)
+
+
+def _base_params(query: str | None, query_by: str) -> dict[str, Any]:
+    """Parâmetros comuns: só contagens, sem documentos."""
+    query = (query or "").strip() or "*"
+    params: dict[str, Any] = {"q": query, "per_page": 0}
+    if query != "*":
+        params["query_by"] = query_by
+    return params
+
+
+def _facet_counts(result: dict[str, Any], field: str) -> dict[int, int]:
+    """Contagens de um facet numérico da resposta, por valor."""
+    for facet in result.get("facet_counts", []):
+        if facet.get("field_name") == field:
+            return {int(item["value"]): item["count"] for item in facet["counts"]}
+    return {}
+
+
+def _multi_search(
+    client: typesense.Client,
+    searches: list[dict[str, Any]],
+    collection_name: str,
+) -> list[dict[str, Any]]:
+    """Executa as buscas via multi_search, em lotes de MULTI_SEARCH_LIMIT."""
+    return MultiSearchExecutor(client, collection_name).execute(searches)
+
+
+def _dense(keys: Iterable[int], counts: Mapping[int, int]) -> dict[int, int]:
+    """Série com todas as chaves, preenchendo com 0 as ausentes."""
+    return {key: counts.get(key, 0) for key in keys}
+
+
+def _weekly_counts_by_range(
+    client: typesense.Client,
+    weeks: list[int],
+    params: dict[str, Any],
+    filters: str | Mapping[str, Any] | None,
+    collection_name: str,
+) -> dict[int, int]:
+    """Uma busca por intervalo de published_at para cada semana, via multi_search."""
+    searches = []
+    for week in weeks:
+        start = int(week_start(week).timestamp())
+        end = start + 7 * 86400
+        searches.append(
+            {
+                **params,
+                "filter_by": build_filter(
+                    filters, f"published_at:>={start}", f"published_at:<{end}"
+                ),
+            }
+        )
+    results = _multi_search(client, searches, collection_name)
+    return {week: result["found"] for week, result in zip(weeks, results)}
+
+
+def weekly_counts(
+    client: typesense.Client,
+    query: str | None,
+    start_week: int,
+    end_week: int,
+    filters: str | Mapping[str, Any] | None = None,
+    collection_name: str = COLLECTION_NAME,
+    query_by: str = DEFAULT_QUERY_BY,
+) -> dict[int, int]:
+    """
+    Número de notícias por semana ISO 8601 num intervalo, numa só busca.
+
+    Usa o facet de published_week; se a coleção não tiver o campo, cai para
+    buscas por intervalo de published_at agrupadas em multi_search.
+
+    Args:
+        client: Cliente Typesense
+        query: Termo de busca (None ou '*' para todas as notícias)
+        start_week: Primeira semana, no formato YYYYWW
+        end_week: Última semana, no formato YYYYWW (inclusive)
+        filters: filter_by adicional, ou dicionário campo -> valor(es)
+        collection_name: Coleção (ou alias) (default: 'news')
+        query_by: Campos de texto da busca (default: 'title,content')
+
+    Returns:
+        Dicionário semana -> contagem, com todas as semanas do intervalo
+
+    Raises:
+        ValueError: Se o intervalo de semanas for inválido
+        RequestMalformed: Se a busca for inválida (ex.: filter_by malformado)
+    """
+    weeks = week_range(start_week, end_week)
+    params = _base_params(query, query_by)
+    try:
+        result = client.collections[collection_name].documents.search(
+            {
+                **params,
+                "filter_by": build_filter(
+                    filters, f"published_week:[{start_week}..{end_week}]"
+                ),
+                "facet_by": "published_week",
+                "max_facet_values": len(weeks),
+            }
+        )
+    except ObjectNotFound as e:
+        # Campo ausente no schema (404); um filter_by inválido (400,
+        # RequestMalformed) falharia igual nas buscas por intervalo
+        logger.info(
+            f"Facet de published_week indisponível ({e}); "
+            f"usando {len(weeks)} buscas por intervalo"
+        )
+        return _weekly_counts_by_range(client, weeks, params, filters, collection_name)
+    return _dense(weeks, _facet_counts(result, "published_week"))
+
+
+def monthly_counts(
+    client: typesense.Client,
+    query: str | None,
+    start_month: int,
+    end_month: int,
+    filters: str | Mapping[str, Any] | None = None,
+    collection_name: str = COLLECTION_NAME,
+    query_by: str = DEFAULT_QUERY_BY,
+) -> dict[int, int]:
+    """
+    Número de notícias por mês num intervalo.
+
+    Faz uma busca com facet de published_month por ano do intervalo, todas
+    numa só requisição multi_search.
+
+    Args:
+        client: Cliente Typesense
+        query: Termo de busca (None ou '*' para todas as notícias)
+        start_month: Primeiro mês, no formato YYYYMM
+        end_month: Último mês, no formato YYYYMM (inclusive)
+        filters: filter_by adicional, ou dicionário campo -> valor(es)
+        collection_name: Coleção (ou alias) (default: 'news')
+        query_by: Campos de texto da busca (default: 'title,content')
+
+    Returns:
+        Dicionário mês (YYYYMM) -> contagem, com todos os meses do intervalo
+
+    Raises:
+        ValueError: Se o intervalo de meses for inválido
+    """
+    months = month_range(start_month, end_month)
+    params = _base_params(query, query_by)
+    years = sorted({month // 100 for month in months})
+
+    searches = []
+    for year in years:
+        first = max(start_month, year * 100 + 1) % 100
+        last = min(end_month, year * 100 + 12) % 100
+        searches.append(
+            {
+                **params,
+                "filter_by": build_filter(
+                    filters,
+                    f"published_year:={year}",
+                    f"published_month:[{first}..{last}]",
+                ),
+                "facet_by": "published_month",
+                "max_facet_values": 12,
+            }
+        )
+
+    counts = {}
+    for year, result in zip(years, _multi_search(client, searches, collection_name)):
+        for month, count in _facet_counts(result, "published_month").items():
+            counts[year * 100 + month] = count
+    return _dense(months, counts)
+
+
+def yearly_counts(
+    client: typesense.Client,
+    query: str | None,
+    start_year: int,
+    end_year: int,
+    filters: str | Mapping[str, Any] | None = None,
+    collection_name: str = COLLECTION_NAME,
+    query_by: str = DEFAULT_QUERY_BY,
+) -> dict[int, int]:
+    """
+    Número de notícias por ano num intervalo, numa só busca com facet.
+
+    Args:
+        client: Cliente Typesense
+        query: Termo de busca (None ou '*' para todas as notícias)
+        start_year: Primeiro ano
+        end_year: Último ano (inclusive)
+        filters: filter_by adicional, ou dicionário campo -> valor(es)
+        collection_name: Coleção (ou alias) (default: 'news')
+        query_by: Campos de texto da busca (default: 'title,content')
+
+    Returns:
+        Dicionário ano -> contagem, com todos os anos do intervalo
+
+    Raises:
+        ValueError: Se start_year > end_year
+    """
+    if start_year > end_year:
+        raise ValueError(f"Ano inicial {start_year} depois do final {end_year}")
+    years = list(range(start_year, end_year + 1))
+    result = client.collections[collection_name].documents.search(
+        {
+            **_base_params(query, query_by),
+            "filter_by": build_filter(
+                filters, f"published_year:[{start_year}..{end_year}]"
+            ),
+            "facet_by": "published_year",
+            "max_facet_values": len(years),
+        }
+    )
+    return _dense(years, _facet_counts(result, "published_year"))
@@ -2,7 +2,13 @@
 Funções utilitárias.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Timezone usado para datas com offset lidas direto do Arrow (Brasília)
+BRASILIA_TZ = "-03:00"
 
 
 def calculate_published_week(timestamp: int | float | None) -> int | None:
@@ -32,3 +38,168 @@ def calculate_published_week(timestamp: int | float | None) -> int | None:
         return int(iso_year * 100 + iso_week)
     except Exception:
         return None
+
+
+def calculate_published_week_series(timestamps: pd.Series | np.ndarray) -> pd.Series:
+    """
+    Calcula a semana ISO 8601 (YYYYWW) para uma coluna inteira de timestamps.
+
+    Versão vetorizada de calculate_published_week: usa aritmética de datas
+    em NumPy em vez de criar um pd.Timestamp por valor.
+
+    Args:
+        timestamps: Unix timestamps em segundos (Series ou array)
+
+    Returns:
+        Series Int64 no formato YYYYWW, com nulo onde o timestamp for inválido
+        (NaN, None ou <= 0), preservando o índice da entrada
+    """
+    values = pd.to_numeric(pd.Series(timestamps), errors="coerce")
+    weeks = calculate_published_week_array(
+        values.to_numpy(dtype="float64", na_value=np.nan)
+    )
+    return pd.Series(
+        pd.arrays.IntegerArray(weeks, weeks == 0), index=values.index, name=values.name
+    )
+
+
+def calculate_published_week_array(seconds: np.ndarray) -> np.ndarray:
+    """
+    Calcula a semana ISO 8601 (YYYYWW) para um array NumPy de timestamps.
+
+    Args:
+        seconds: Unix timestamps em segundos (float, com NaN para ausentes)
+
+    Returns:
+        Array int64 no formato YYYYWW, com 0 onde o timestamp for inválido
+    """
+    seconds = np.asarray(seconds, dtype="float64")
+    valid = (seconds > 0) & (seconds <= pd.Timestamp.max.timestamp())
+    days = np.floor(seconds[valid] / 86400).astype("int64")
+
+    # 1970-01-01 foi uma quinta-feira; a semana ISO pertence ao ano da sua quinta
+    weekday = (days + 3) % 7  # segunda = 0
+    thursday = (days - weekday + 3).astype("datetime64[D]")
+    year_start = thursday.astype("datetime64[Y]")
+    iso_year = year_start.astype("int64") + 1970
+    iso_week = (thursday - year_start.astype("datetime64[D]")).astype("int64") // 7 + 1
+
+    weeks = np.zeros(len(seconds), dtype="int64")
+    weeks[valid] = iso_year * 100 + iso_week
+    return weeks
+
+
+def datetime_to_timestamp_series(values: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna de datas para Unix timestamp (segundos) de forma vetorizada.
+
+    Equivale a aplicar ``int(x.timestamp()) if pd.notna(x) else 0`` em cada
+    valor: datas sem timezone (inclusive só data) são tratadas como UTC e
+    datas com timezone são convertidas para UTC antes da conversão.
+
+    Args:
+        values: Series com datetimes (naive, com timezone ou mistos)
+
+    Returns:
+        Series int64 com o timestamp em segundos, ou 0 para valores ausentes
+    """
+    utc = pd.to_datetime(values, utc=True, errors="coerce")
+    naive = utc.dt.tz_localize(None).to_numpy()
+
+    unit, _ = np.datetime_data(naive.dtype)
+    ticks_per_second = np.timedelta64(1, "s") // np.timedelta64(1, unit)
+    ticks = naive.view("int64")
+
+    # Trunca em direção a zero, como int() sobre o float de timestamp()
+    seconds = np.sign(ticks) * (np.abs(ticks) // ticks_per_second)
+    seconds[np.isnat(naive)] = 0
+    return pd.Series(seconds, index=values.index, name=values.name)
+
+
+def parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte published_at e extracted_at para datetime."""
+    df["published_at"] = pd.to_datetime(df["published_at"], errors="coerce")
+    df["extracted_at"] = pd.to_datetime(df["extracted_at"], errors="coerce")
+    return df
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Adiciona as colunas derivadas usadas na indexação."""
+    # Extrai ano e mês para faceting
+    df["published_year"] = df["published_at"].dt.year
+    df["published_month"] = df["published_at"].dt.month
+
+    # Converte datetime para Unix timestamp (segundos) para Typesense
+    df["published_at_ts"] = datetime_to_timestamp_series(df["published_at"])
+    df["extracted_at_ts"] = datetime_to_timestamp_series(df["extracted_at"])
+
+    # Calcula semana ISO 8601 (formato YYYYWW)
+    df["published_week"] = calculate_published_week_series(df["published_at_ts"])
+    return df
+
+
+def to_arrow_timestamps(
+    column: pa.Array | pa.ChunkedArray, timezone: str = BRASILIA_TZ
+) -> pa.Array:
+    """
+    Converte uma coluna Arrow de datas para timestamp, sem passar por pandas.
+
+    Colunas timestamp são mantidas. Strings ISO 8601 que terminam todas com
+    o offset `timezone` são lidas direto pelo Arrow; strings sem offset viram
+    timestamps sem timezone (tratados como UTC). Nos demais casos (outros
+    offsets, como 'Z' ou '+00:00', ou strings que o Arrow não lê) a coluna
+    é convertida pelo pandas, com a mesma regra de parse_dates
+    (pd.to_datetime): o offset da própria string é mantido, valores sem
+    offset continuam sem timezone e inválidos viram nulos.
+
+    Args:
+        column: Coluna de datas (timestamp ou string)
+        timezone: Offset aceito no caminho só Arrow (default: UTC-3)
+
+    Returns:
+        Array Arrow do tipo timestamp
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if pa.types.is_timestamp(column.type):
+        return column
+
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        # O Arrow perde o offset da string; só quando todas já estão em
+        # `timezone` o ano/mês locais coincidem com os de parse_dates
+        if pc.all(pc.ends_with(column, timezone)).as_py():
+            try:
+                utc = pc.cast(column, pa.timestamp("us", tz="UTC"))
+                return utc.cast(pa.timestamp("us", tz=timezone))
+            except pa.ArrowInvalid:
+                pass
+        try:
+            return pc.cast(column, pa.timestamp("us"))
+        except pa.ArrowInvalid:
+            pass
+
+    parsed = pd.to_datetime(column.to_pandas(), errors="coerce")
+    if parsed.dtype == object:
+        # Offsets diferentes na mesma coluna: normaliza para UTC
+        utc = pd.to_datetime(parsed, utc=True)
+        return pa.array(utc, type=pa.timestamp("us", tz="UTC")).cast(
+            pa.timestamp("us", tz=timezone)
+        )
+    timestamps = pa.array(parsed)
+    return timestamps.cast(pa.timestamp("us", tz=timestamps.type.tz))
+
+
+def arrow_timestamp_seconds(timestamps: pa.Array) -> np.ndarray:
+    """
+    Converte um array Arrow de timestamps para Unix timestamp em segundos.
+
+    Mesma regra de datetime_to_timestamp_series: trunca em direção a zero e
+    usa 0 para valores ausentes.
+
+    Returns:
+        Array NumPy int64
+    """
+    ticks_per_second = np.timedelta64(1, "s") // np.timedelta64(1, timestamps.type.unit)
+    ticks = pc.cast(timestamps, pa.int64())
+    seconds = pc.divide(ticks, pa.scalar(ticks_per_second, pa.int64()))
+    return pc.fill_null(seconds, 0).to_numpy()
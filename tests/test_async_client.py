@@ -0,0 +1,131 @@
+"""
+Tests for typesense_dgb.async_client and index_documents_async
+
+Run with: python -m pytest tests/test_async_client.py -v
+"""
+
+import asyncio
+import json
+import threading
+
+import pandas as pd
+import pytest
+from aiohttp import web
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb import indexer as indexer_module
+from typesense_dgb.async_client import AsyncTypesenseClient
+from typesense_dgb.indexer import index_documents_async
+
+
+def make_app(received: list[list[dict]]) -> web.Application:
+    """Minimal Typesense-like app: collection info, search and import."""
+
+    async def retrieve(request: web.Request) -> web.Response:
+        if request.match_info["name"] != "news":
+            return web.json_response({"message": "Not Found"}, status=404)
+        return web.json_response({"num_documents": 0, "fields": [{"name": "id"}]})
+
+    async def search(request: web.Request) -> web.Response:
+        return web.json_response({"found": 1, "params": dict(request.query)})
+
+    async def import_(request: web.Request) -> web.Response:
+        assert request.headers["X-TYPESENSE-API-KEY"] == "test-key"
+        docs = [json.loads(line) for line in (await request.text()).splitlines()]
+        received.append(docs)
+        results = [{"success": not doc["id"].startswith("bad")} for doc in docs]
+        return web.Response(text="\n".join(json.dumps(r) for r in results))
+
+    app = web.Application()
+    app.router.add_get("/collections/{name}", retrieve)
+    app.router.add_get("/collections/{name}/documents/search", search)
+    app.router.add_post("/collections/{name}/documents/import", import_)
+    return app
+
+
+async def run_with_server(received, coroutine_factory):
+    runner = web.AppRunner(make_app(received))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with AsyncTypesenseClient(
+            host="127.0.0.1", port=str(port), api_key="test-key"
+        ) as client:
+            return await coroutine_factory(client)
+    finally:
+        await runner.cleanup()
+
+
+class TestAsyncTypesenseClient:
+    """Tests for AsyncTypesenseClient against an in-process HTTP server."""
+
+    def test_search_stringifies_params(self):
+        """Booleans and lists are sent in Typesense query-string format."""
+
+        async def scenario(client):
+            return await client.search(
+                "news", {"q": "saúde", "exhaustive": True, "facet_by": ["a", "b"]}
+            )
+
+        result = asyncio.run(run_with_server([], scenario))
+        assert result["params"] == {
+            "q": "saúde",
+            "exhaustive": "true",
+            "facet_by": "a,b",
+        }
+
+    def test_http_errors_map_to_typesense_exceptions(self):
+        """A 404 raises the same exception type as the sync client."""
+
+        async def scenario(client):
+            return await client.retrieve_collection("missing")
+
+        with pytest.raises(ObjectNotFound):
+            asyncio.run(run_with_server([], scenario))
+
+    def test_index_documents_async(self):
+        """Batches are imported concurrently and failures are counted."""
+        received: list[list[dict]] = []
+        df = pd.DataFrame(
+            {
+                "unique_id": ["a", "b", "bad1", "c", "d"],
+                "published_at_ts": [1704110400] * 5,
+            }
+        )
+
+        async def scenario(client):
+            return await index_documents_async(client, df, batch_size=2, concurrency=2)
+
+        stats = asyncio.run(run_with_server(received, scenario))
+
+        assert sorted(len(batch) for batch in received) == [1, 2, 2]
+        assert stats["total_processed"] == 5
+        assert stats["errors"] == 1
+        assert stats["total_indexed"] == 4
+
+    def test_batches_are_prepared_off_the_event_loop(self, monkeypatch):
+        """Batch preparation runs in a worker thread, not in the event loop."""
+        prepare_threads = []
+        prepare_payload = indexer_module._prepare_payload
+
+        def recording_prepare(batch):
+            prepare_threads.append(threading.current_thread())
+            return prepare_payload(batch)
+
+        monkeypatch.setattr(indexer_module, "_prepare_payload", recording_prepare)
+        df = pd.DataFrame(
+            {"unique_id": list("abcd"), "published_at_ts": [1704110400] * 4}
+        )
+
+        async def scenario(client):
+            loop_thread = threading.current_thread()
+            stats = await index_documents_async(client, df, batch_size=2)
+            return loop_thread, stats
+
+        loop_thread, stats = asyncio.run(run_with_server([], scenario))
+
+        assert len(prepare_threads) == 2
+        assert loop_thread not in prepare_threads
+        assert stats["total_indexed"] == 4
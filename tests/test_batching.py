@@ -0,0 +1,52 @@
+"""
+Tests for typesense_dgb.batching
+
+Run with: python -m pytest tests/test_batching.py -v
+"""
+
+from typesense_dgb.batching import AdaptiveBatchSizer
+
+
+class TestAdaptiveBatchSizer:
+    """Tests for the AIMD batch size controller."""
+
+    def test_additive_increase_when_fast_and_full(self):
+        """Fast, error-free, count-limited batches grow by increase_step."""
+        sizer = AdaptiveBatchSizer(initial_docs=100, increase_step=50)
+        sizer.record(100, latency=0.1, num_errors=0)
+        assert sizer.docs_per_batch == 150
+
+    def test_no_increase_when_byte_limited(self):
+        """Batches cut by the byte budget do not inflate the count limit."""
+        sizer = AdaptiveBatchSizer(initial_docs=100)
+        sizer.record(40, latency=0.1, num_errors=0)
+        assert sizer.docs_per_batch == 100
+
+    def test_multiplicative_decrease_on_latency(self):
+        """Slow imports halve the batch size."""
+        sizer = AdaptiveBatchSizer(initial_docs=1000, target_latency=1.0)
+        sizer.record(1000, latency=3.0, num_errors=0)
+        assert sizer.docs_per_batch == 500
+
+    def test_multiplicative_decrease_on_errors(self):
+        """A high error rate halves the batch size."""
+        sizer = AdaptiveBatchSizer(initial_docs=1000, max_error_rate=0.05)
+        sizer.record(1000, latency=0.1, num_errors=100)
+        assert sizer.docs_per_batch == 500
+
+    def test_bounds(self):
+        """The batch size stays within [min_docs, max_docs]."""
+        sizer = AdaptiveBatchSizer(initial_docs=60, min_docs=50, max_docs=120)
+        sizer.record_failure()
+        assert sizer.docs_per_batch == 50
+        for _ in range(10):
+            sizer.record(sizer.docs_per_batch, latency=0.0, num_errors=0)
+        assert sizer.docs_per_batch == 120
+
+    def test_is_full_respects_bytes_and_count(self):
+        """A batch is full by document count or by the byte budget."""
+        sizer = AdaptiveBatchSizer(initial_docs=50, min_docs=1, target_bytes=1000)
+        assert not sizer.is_full(0, 0, 5000)
+        assert sizer.is_full(1, 900, 200)
+        assert sizer.is_full(50, 100, 10)
+        assert not sizer.is_full(10, 100, 10)
@@ -0,0 +1,54 @@
+"""
+Tests for the synthetic data generator and the ingestion benchmark
+
+Run with: python -m pytest tests/test_benchmarks.py -v
+"""
+
+from benchmarks.bench_ingestion import FakeClient, compare, run_benchmarks
+from benchmarks.synthetic import generate_raw_dataframe, to_arrow
+from typesense_dgb.dataset import required_columns
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.utils import add_derived_columns, parse_dates
+
+
+def test_generator_shape():
+    """Synthetic data is deterministic and has every column the loader reads."""
+    df = generate_raw_dataframe(200, seed=1)
+
+    assert len(df) == 200
+    assert set(required_columns()) <= set(df.columns)
+    assert df.equals(generate_raw_dataframe(200, seed=1))
+    assert df["summary"].isna().any()
+    assert to_arrow(df).num_rows == 200
+
+
+def test_generated_data_indexes():
+    """The generated data runs through the real pipeline against FakeClient."""
+    processed = add_derived_columns(parse_dates(generate_raw_dataframe(100)))
+
+    stats = index_documents(FakeClient(), processed, batch_size=40)
+
+    assert stats["total_indexed"] == 100
+    assert stats["batch_sizes"] == [40, 40, 20]
+
+
+def test_run_benchmarks_and_compare():
+    """Every stage is reported and slower stages are flagged as regressions."""
+    results = run_benchmarks(50, batch_size=20, row_limit=10)
+
+    assert [result["stage"] for result in results] == [
+        "process",
+        "prepare_document",
+        "prepare_documents",
+        "prepare_arrow_documents",
+        "serialize",
+        "index",
+    ]
+    assert all(result["docs_per_second"] > 0 for result in results)
+
+    faster = [
+        dict(result, docs_per_second=result["docs_per_second"] * 2)
+        for result in results
+    ]
+    assert compare(results, results, tolerance=0.2) == []
+    assert len(compare(results, faster, tolerance=0.2)) == len(results)
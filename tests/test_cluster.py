@@ -0,0 +1,132 @@
+"""
+Tests for typesense_dgb.cluster
+
+Run with: python -m pytest tests/test_cluster.py -v
+"""
+
+import random
+from collections import Counter
+from contextlib import ExitStack
+
+import pytest
+
+from typesense_dgb.client import get_client, parse_nodes, wait_for_typesense
+from typesense_dgb.cluster import TypesenseCluster
+from typesense_dgb.collection import create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+
+
+@pytest.fixture
+def servers():
+    """Three fake nodes: a leader and two followers, the last one slow."""
+    with ExitStack() as stack:
+        yield [
+            stack.enter_context(FakeTypesenseServer(leader=True)),
+            stack.enter_context(FakeTypesenseServer(leader=False)),
+            stack.enter_context(FakeTypesenseServer(leader=False, latency=0.05)),
+        ]
+
+
+def make_cluster(servers, **kwargs) -> TypesenseCluster:
+    return TypesenseCluster(
+        [server.url for server in servers],
+        api_key="test",
+        rng=random.Random(0),
+        **kwargs,
+    )
+
+
+def test_parse_nodes():
+    assert parse_nodes("ts1:8108, https://ts2:443,") == [
+        {"host": "ts1", "port": "8108", "protocol": "http"},
+        {"host": "ts2", "port": "443", "protocol": "https"},
+    ]
+    with pytest.raises(ValueError):
+        parse_nodes("")
+
+
+def test_get_client_reads_nodes_from_env(monkeypatch):
+    monkeypatch.setenv("TYPESENSE_NODES", "ts1:8108,ts2:8108")
+    monkeypatch.setenv("TYPESENSE_NEAREST_NODE", "http://ts-lb:80")
+
+    client = get_client()
+
+    assert [node.host for node in client.config.nodes] == ["ts1", "ts2"]
+    assert client.config.nearest_node.host == "ts-lb"
+    assert get_client(host="other").config.nodes[0].host == "other"
+
+
+def test_wait_for_typesense_needs_one_healthy_node(servers):
+    client = wait_for_typesense(
+        api_key="test", nodes=["127.0.0.1:1", servers[0].url], max_retries=1
+    )
+
+    assert client is not None
+    assert len(client.config.nodes) == 2
+
+
+def test_wait_for_typesense_keeps_nearest_node(servers, monkeypatch):
+    client = wait_for_typesense(
+        api_key="test",
+        nodes=[servers[0].url],
+        nearest_node=servers[1].url,
+        max_retries=1,
+    )
+    assert client.config.nearest_node.port == str(servers[1].port)
+
+    monkeypatch.setenv("TYPESENSE_NEAREST_NODE", servers[2].url)
+    client = wait_for_typesense(api_key="test", nodes=[servers[0].url], max_retries=1)
+    assert client.config.nearest_node.port == str(servers[2].port)
+
+
+def test_writes_go_to_the_leader(servers):
+    cluster = make_cluster(servers)
+    cluster.check()
+
+    assert cluster.write_node().url == servers[0].url
+    create_collection(cluster.write_client())
+    assert "news" in servers[0].collections
+    assert "news" not in servers[1].collections
+
+
+def test_reads_are_weighted_by_latency(servers):
+    cluster = make_cluster(servers)
+    cluster.check()
+    slow = cluster.nodes[2]
+    assert slow.latency > cluster.nodes[0].latency
+
+    picks = Counter(cluster.read_node().url for _ in range(300))
+    assert set(picks) <= {server.url for server in servers}
+    assert picks[slow.url] < min(picks[servers[0].url], picks[servers[1].url])
+
+
+def test_unmeasured_nodes_get_the_mean_weight(servers):
+    cluster = make_cluster(servers)
+    fast, unmeasured, slow = cluster.nodes
+    fast.latency, slow.latency = 0.01, 2.0
+
+    picks = Counter(cluster.read_node().url for _ in range(2000))
+
+    # Pesos 100, 50,25 (média dos medidos) e 0,5: um terço das leituras
+    assert 0.25 < picks[unmeasured.url] / 2000 < 0.42
+    assert picks[slow.url] < picks[unmeasured.url] < picks[fast.url]
+
+
+def test_unhealthy_nodes_are_skipped(servers):
+    cluster = make_cluster(servers)
+    cluster.check()
+    servers[0].stop()
+    cluster.check()
+
+    assert not cluster.nodes[0].healthy
+    assert cluster.leader() is None
+    assert cluster.write_node().url == servers[1].url
+    assert servers[0].url not in {cluster.read_node().url for _ in range(50)}
+
+
+def test_nearest_node_is_preferred_for_reads(servers):
+    cluster = make_cluster(servers[1:], nearest_node=servers[0].url)
+    cluster.check()
+
+    assert cluster.read_node().url == servers[0].url
+    assert cluster.read_client().collections.retrieve() == []
@@ -0,0 +1,214 @@
+"""
+Tests for typesense_dgb.dataset
+
+Run with: python -m pytest tests/test_dataset.py -v
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from datasets import Dataset
+
+from typesense_dgb import dataset as dataset_module
+from typesense_dgb.dataset import download_and_process_dataset, required_columns
+
+
+@pytest.fixture
+def fake_dataset(monkeypatch):
+    """Replace load_dataset with a small in-memory govbrnews-like dataset."""
+    now = datetime.now(timezone.utc)
+    records = {
+        "unique_id": [f"id{i}" for i in range(7)],
+        "title": [f"Notícia {i}" for i in range(7)],
+        "published_at": [
+            (now - timedelta(days=30 * i)).strftime("%Y-%m-%dT%H:%M:%S-03:00")
+            for i in range(7)
+        ],
+        "extracted_at": [now.strftime("%Y-%m-%d %H:%M:%S")] * 7,
+        "tags": [["a", " b "]] * 7,
+    }
+    dataset = Dataset.from_dict(records)
+    monkeypatch.setattr(dataset_module, "load_dataset", lambda *args, **kwargs: dataset)
+    return dataset
+
+
+class TestStreaming:
+    """Tests for the streaming mode of download_and_process_dataset."""
+
+    def test_stream_matches_full_dataframe(self, fake_dataset):
+        """Concatenated chunks equal the fully materialized DataFrame."""
+        full = download_and_process_dataset(mode="full")
+        chunks = list(download_and_process_dataset(stream=True, chunk_size=3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        streamed = pd.concat(chunks)
+        columns = ["unique_id", "published_at_ts", "published_week", "published_year"]
+        pd.testing.assert_frame_equal(streamed[columns], full[columns])
+
+    def test_stream_keeps_global_index(self, fake_dataset):
+        """Chunk indexes continue the global row numbering."""
+        chunks = download_and_process_dataset(stream=True, chunk_size=3)
+        assert [chunk.index.tolist() for chunk in chunks] == [
+            [0, 1, 2],
+            [3, 4, 5],
+            [6],
+        ]
+
+    def test_stream_incremental_filters_each_chunk(self, fake_dataset):
+        """Incremental streaming drops old rows and empty chunks."""
+        chunks = list(
+            download_and_process_dataset(
+                mode="incremental", days=45, stream=True, chunk_size=1
+            )
+        )
+        assert [chunk["unique_id"].iloc[0] for chunk in chunks] == ["id0", "id1"]
+
+
+class TestColumnProjection:
+    """Tests for loading only the columns the collection schema needs."""
+
+    def test_required_columns_follow_schema(self):
+        """Source columns plus schema fields that are not derived."""
+        columns = required_columns()
+
+        assert columns[:4] == ["unique_id", "published_at", "extracted_at", "tags"]
+        assert {"title", "agency", "most_specific_theme_label"} <= set(columns)
+        assert "published_week" not in columns
+        assert len(columns) == len(set(columns))
+
+    def test_unindexed_columns_are_not_loaded(self, fake_dataset, monkeypatch):
+        """Columns outside the schema never reach the DataFrame."""
+        extra = fake_dataset.add_column("raw_html", ["<html>"] * len(fake_dataset))
+        monkeypatch.setattr(dataset_module, "load_dataset", lambda *a, **k: extra)
+
+        df = download_and_process_dataset()
+        streamed = next(iter(download_and_process_dataset(stream=True)))
+
+        assert "raw_html" not in df.columns
+        assert "raw_html" not in streamed.columns
+        assert "title" in df.columns
+
+    def test_explicit_columns(self, fake_dataset):
+        """An explicit column list overrides the schema-derived one."""
+        df = download_and_process_dataset(
+            columns=["unique_id", "published_at", "extracted_at"]
+        )
+
+        assert "title" not in df.columns
+        assert df["published_week"].notna().all()
+
+
+class TestIncrementalPushdown:
+    """Tests for the Arrow-level date filter of incremental mode."""
+
+    def test_keeps_original_positions(self, fake_dataset):
+        """Only recent rows are materialized, with their original index."""
+        df = download_and_process_dataset(mode="incremental", days=45)
+
+        assert df["unique_id"].tolist() == ["id0", "id1"]
+        assert df.index.tolist() == [0, 1]
+        assert df["published_week"].notna().all()
+
+    def test_timestamp_column_matches_string_column(self, fake_dataset, monkeypatch):
+        """A tz-aware Arrow timestamp column is filtered without pandas parsing."""
+        frame = fake_dataset.to_pandas()
+        frame["published_at"] = pd.to_datetime(frame["published_at"], utc=True)
+        timestamps = Dataset.from_pandas(frame)
+        assert timestamps.features["published_at"].dtype.startswith("timestamp")
+
+        from_strings = download_and_process_dataset(mode="incremental", days=100)
+        monkeypatch.setattr(
+            dataset_module, "load_dataset", lambda *args, **kwargs: timestamps
+        )
+        from_timestamps = download_and_process_dataset(mode="incremental", days=100)
+
+        assert (
+            from_timestamps["unique_id"].tolist() == from_strings["unique_id"].tolist()
+        )
+        pd.testing.assert_series_equal(
+            from_timestamps["published_at_ts"], from_strings["published_at_ts"]
+        )
+
+    def test_empty_window(self, fake_dataset, monkeypatch):
+        """A window with no rows returns an empty DataFrame."""
+        old = fake_dataset.map(
+            lambda row: {"published_at": "2000-01-01T00:00:00-03:00"}
+        )
+        monkeypatch.setattr(dataset_module, "load_dataset", lambda *args, **kwargs: old)
+
+        assert len(download_and_process_dataset(mode="incremental", days=7)) == 0
+
+
+class TestProcessedCache:
+    """Tests for the Parquet cache of download_and_process_dataset."""
+
+    @pytest.fixture
+    def cached(self, fake_dataset, monkeypatch, tmp_path):
+        """Fixed upstream revision and a counter of dataset downloads."""
+        monkeypatch.setattr(dataset_module, "dataset_revision", lambda path: "rev1")
+        calls = []
+        monkeypatch.setattr(
+            dataset_module,
+            "load_dataset",
+            lambda *args, **kwargs: calls.append(kwargs) or fake_dataset,
+        )
+        return str(tmp_path), calls
+
+    def test_second_run_skips_download(self, cached):
+        """The cache is built once and reused while the revision is the same."""
+        cache_dir, calls = cached
+        first = download_and_process_dataset(cache_dir=cache_dir)
+        second = download_and_process_dataset(cache_dir=cache_dir)
+
+        assert len(calls) == 1
+        assert calls[0]["revision"] == "rev1"
+        columns = ["unique_id", "published_at_ts", "published_week", "extracted_at_ts"]
+        pd.testing.assert_frame_equal(second[columns], first[columns])
+
+    def test_incremental_reads_recent_rows(self, cached):
+        """Incremental mode from the cache matches the uncached filter."""
+        cache_dir, _ = cached
+        download_and_process_dataset(cache_dir=cache_dir)
+
+        cached_df = download_and_process_dataset(
+            mode="incremental", days=45, cache_dir=cache_dir
+        )
+        fresh_df = download_and_process_dataset(mode="incremental", days=45)
+
+        assert cached_df["unique_id"].tolist() == fresh_df["unique_id"].tolist()
+
+    def test_stream_from_cache(self, cached):
+        """Streaming from the cache yields bounded chunks with original indexes."""
+        cache_dir, _ = cached
+        download_and_process_dataset(cache_dir=cache_dir)
+
+        chunks = list(
+            download_and_process_dataset(stream=True, chunk_size=3, cache_dir=cache_dir)
+        )
+
+        assert all(len(chunk) <= 3 for chunk in chunks)
+        assert sorted(pd.concat(chunks).index) == list(range(7))
+
+    def test_unknown_revision_disables_cache(self, cached, monkeypatch):
+        """Without a revision the dataset is downloaded and nothing is cached."""
+        cache_dir, calls = cached
+        monkeypatch.setattr(dataset_module, "dataset_revision", lambda path: None)
+
+        download_and_process_dataset(cache_dir=cache_dir)
+        download_and_process_dataset(cache_dir=cache_dir)
+
+        assert len(calls) == 2
+
+
+class TestArrowBatches:
+    """Tests for iter_arrow_batches."""
+
+    def test_slices_keep_positions(self, fake_dataset):
+        """Incremental Arrow slices carry the original row positions."""
+        tables = list(
+            dataset_module.iter_arrow_batches(mode="incremental", days=45, chunk_size=1)
+        )
+
+        assert [table.column("_row").to_pylist() for table in tables] == [[0], [1]]
+        assert "published_week" not in tables[0].column_names
@@ -0,0 +1,155 @@
+"""
+Tests for typesense_dgb.fake_server, exercising the loader end to end over HTTP
+
+Run with: python -m pytest tests/test_fake_server.py -v
+"""
+
+import pytest
+from typesense.exceptions import ObjectNotFound, RequestUnauthorized, ServiceUnavailable
+
+from benchmarks.synthetic import generate_raw_dataframe
+from typesense_dgb import reload as reload_module
+from typesense_dgb.client import wait_for_typesense
+from typesense_dgb.collection import COLLECTION_NAME, create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer, compile_filter
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.reload import blue_green_reload
+from typesense_dgb.retry import RetryPolicy
+from typesense_dgb.sync import sync_documents
+from typesense_dgb.utils import add_derived_columns, parse_dates
+
+NO_WAIT = RetryPolicy(max_retries=2, base_delay=0)
+
+
+@pytest.fixture
+def server():
+    with FakeTypesenseServer() as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    client = server.client()
+    create_collection(client)
+    return client
+
+
+@pytest.fixture(scope="module")
+def processed():
+    raw = generate_raw_dataframe(60, seed=1, content_words=20)
+    return add_derived_columns(parse_dates(raw))
+
+
+def search(client, **params):
+    return client.collections[COLLECTION_NAME].documents.search(params)
+
+
+def test_health_and_api_key(server):
+    assert wait_for_typesense(host=server.host, port=str(server.port)) is not None
+
+    client = server.client()
+    server.api_key = "other"
+    with pytest.raises(RequestUnauthorized):
+        client.collections.retrieve()
+
+
+def test_index_search_and_facets(client, processed):
+    stats = index_documents(client, processed, batch_size=25)
+
+    assert stats["total_indexed"] == len(processed)
+    result = search(
+        client, q="*", filter_by="agency:=mec", facet_by="agency", per_page=100
+    )
+    expected = (processed["agency"] == "mec").sum()
+    assert result["found"] == expected
+    assert {hit["document"]["agency"] for hit in result["hits"]} == {"mec"}
+    assert result["facet_counts"][0]["counts"][0] == {
+        "value": "mec",
+        "count": expected,
+        "highlighted": "mec",
+    }
+
+    newest = search(client, q="*", sort_by="published_at:desc", per_page=1)
+    assert (
+        newest["hits"][0]["document"]["published_at"]
+        == processed["published_at_ts"].max()
+    )
+
+
+def test_import_reports_errors_per_line(server, client, processed):
+    documents = client.collections[COLLECTION_NAME].documents
+    results = documents.import_([{"id": "x", "title": "sem data"}])
+    assert results[0]["code"] == 400
+    assert "not found in the document" in results[0]["error"]
+
+    rejected = processed.iloc[1]["unique_id"]
+    server.reject_documents([rejected])
+    stats = index_documents(client, processed.head(3))
+
+    assert stats["total_indexed"] == 2
+    assert stats["errors"] == 1
+    assert stats["failed_ids"] == [rejected]
+
+
+def test_injected_failures_are_retried(server, client, processed):
+    server.inject_failure(503, count=1, path="/documents/import")
+    server.reject_documents([processed.iloc[0]["unique_id"]], code=503, times=1)
+
+    stats = index_documents(client, processed, batch_size=20, retry_policy=NO_WAIT)
+
+    assert stats["total_indexed"] == len(processed)
+    assert stats["errors"] == 0
+    assert server.requests["POST /collections/{name}/documents/import"] == 5
+
+    server.inject_failure(503, count=1, path="/collections/")
+    with pytest.raises(ServiceUnavailable):
+        client.collections[COLLECTION_NAME].retrieve()
+
+
+def test_concurrent_imports_with_latency(server, client, processed):
+    server.latency = 0.05
+
+    stats = index_documents(client, processed, batch_size=10, concurrency=3)
+
+    assert stats["total_indexed"] == len(processed)
+    assert server.max_concurrent_imports > 1
+    assert sorted(server.import_batches) == [10] * 6
+
+
+def test_blue_green_reload_swaps_alias(server, processed, monkeypatch):
+    client = server.client()
+    names = iter(["news_20240101000000", "news_20240101000001"])
+    monkeypatch.setattr(
+        reload_module, "versioned_collection_name", lambda _: next(names)
+    )
+
+    first = blue_green_reload(client, processed)
+    second = blue_green_reload(client, processed.head(58), keep_versions=1)
+
+    assert first["swapped"] and second["swapped"]
+    assert server.aliases[COLLECTION_NAME] == second["collection_name"]
+    assert list(server.collections) == [second["collection_name"]]
+    assert client.collections[COLLECTION_NAME].retrieve()["num_documents"] == 58
+
+
+def test_sync_deletes_removed_documents(client, processed, tmp_path):
+    manifest = str(tmp_path / "manifest.sqlite")
+    sync_documents(client, processed, manifest_path=manifest)
+
+    stats = sync_documents(client, processed.iloc[1:], manifest_path=manifest)
+
+    assert stats["deleted"] == 1
+    assert stats["changed"] == 0
+    documents = client.collections[COLLECTION_NAME].documents
+    with pytest.raises(ObjectNotFound):
+        documents[processed.iloc[0]["unique_id"]].retrieve()
+
+
+def test_compile_filter():
+    doc = {"id": "a", "agency": "mec", "tags": ["saúde", "vacina"], "year": 2024}
+
+    assert compile_filter("agency:=mec && year:>=2024")(doc)
+    assert compile_filter("tags:[`saúde`, educação]")(doc)
+    assert compile_filter("year:[2020..2024]")(doc)
+    assert not compile_filter("agency:!=mec")(doc)
+    assert not compile_filter("id:[b,c]")(doc)
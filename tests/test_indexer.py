@@ -0,0 +1,326 @@
+"""
+Tests for typesense_dgb.indexer
+
+Run with: python -m pytest tests/test_indexer.py -v
+"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from typesense_dgb import indexer
+from typesense_dgb.indexer import (
+    index_documents,
+    prepare_arrow_documents,
+    prepare_document,
+    prepare_documents,
+)
+from typesense_dgb.utils import add_derived_columns, parse_dates
+
+
+def parse_payload(payload: bytes) -> list[dict]:
+    """Decode a JSONL import payload sent to the mocked client."""
+    return [json.loads(line) for line in payload.decode().split("\n")]
+
+
+def import_response(results: list[bool]) -> str:
+    """Build a Typesense-style JSONL import response."""
+    return "\n".join(
+        '{"success":true}' if ok else '{"success":false,"error":"bad"}'
+        for ok in results
+    )
+
+
+def make_dataframe() -> pd.DataFrame:
+    """Build a small DataFrame covering the edge cases of prepare_document."""
+    return pd.DataFrame(
+        {
+            "unique_id": ["a1", None, "c3", 4],
+            "agency": ["  mec  ", "", None, "saude"],
+            "title": ["Título", "   ", "Outro", np.nan],
+            "category": [None, "Notícias", 12, "x"],
+            "published_at_ts": [1729641600, 0, np.nan, 1704110400],
+            "extracted_at_ts": [1729645200, -5, 1729645200, 0],
+            "published_year": [2025.0, np.nan, 2024.0, 2024.0],
+            "published_month": [10.0, np.nan, 1.0, 0.0],
+            "published_week": [202543.0, None, 202401.0, np.nan],
+            "tags": [
+                np.array(["  educação ", "", "x" * 101]),
+                None,
+                np.array([]),
+                ["saúde", 3, " vacina"],
+            ],
+        },
+        index=[10, 11, 12, 13],
+    )
+
+
+class TestPrepareDocuments:
+    """Tests for the columnar prepare_documents path."""
+
+    def test_matches_prepare_document(self):
+        """Columnar output must serialize exactly like the per-row output."""
+        df = make_dataframe()
+        expected = [prepare_document(row) for _, row in df.iterrows()]
+        result = prepare_documents(df)
+
+        assert result == expected
+        for doc, expected_doc in zip(result, expected):
+            assert json.dumps(doc) == json.dumps(expected_doc)
+
+    def test_missing_unique_id_uses_index_label(self):
+        """Rows without unique_id fall back to doc_<index label>."""
+        docs = prepare_documents(make_dataframe())
+        assert docs[1]["id"] == "doc_11"
+        assert docs[1]["published_at"] == 0
+
+    def test_missing_optional_columns(self):
+        """Only unique_id is required; absent columns are skipped."""
+        df = pd.DataFrame({"unique_id": ["a", "b"]})
+        expected = [prepare_document(row) for _, row in df.iterrows()]
+        assert prepare_documents(df) == expected
+
+    def test_empty_dataframe(self):
+        """An empty DataFrame yields no documents."""
+        df = make_dataframe().iloc[0:0]
+        assert prepare_documents(df) == []
+
+
+def make_arrow_table() -> pa.Table:
+    """Build a raw (unprocessed) dataset slice, as read from the Arrow cache."""
+    return pa.table(
+        {
+            "unique_id": ["a1", None, "c3", "d4"],
+            "agency": ["  mec  ", "", None, "saude"],
+            "title": ["Título", "   ", "Outro", None],
+            "published_at": [
+                "2024-10-23T08:00:00-03:00",
+                None,
+                "2023-12-31T23:30:00-03:00",
+                "2024-01-01T00:00:00-03:00",
+            ],
+            "extracted_at": ["2024-10-23 09:00:00", None, "2024-01-02 00:00:00", None],
+            "tags": [["  educação ", "", "x" * 101, None], None, [], ["saúde"]],
+            "_row": [10, 11, 12, 13],
+        }
+    )
+
+
+class TestPrepareArrowDocuments:
+    """Tests for the pandas-free prepare_arrow_documents path."""
+
+    def expected(self, table: pa.Table) -> list[dict]:
+        df = table.to_pandas()
+        df.index = pd.Index(df.pop("_row"))
+        return prepare_documents(add_derived_columns(parse_dates(df)))
+
+    def test_matches_pandas_path(self):
+        """Arrow output equals prepare_documents on the processed DataFrame."""
+        table = make_arrow_table()
+        documents = prepare_arrow_documents(table)
+
+        assert documents == self.expected(table)
+        assert documents[1] == {
+            "id": "doc_11",
+            "unique_id": "doc_11",
+            "published_at": 0,
+        }
+        assert documents[2]["published_year"] == 2023
+
+    def test_timestamp_columns(self):
+        """Arrow timestamp columns need no string parsing."""
+        table = make_arrow_table()
+        index = table.schema.get_field_index("published_at")
+        published = pd.to_datetime(table.column("published_at").to_pandas(), utc=True)
+        table = table.set_column(index, "published_at", pa.array(published))
+
+        assert prepare_arrow_documents(table) == self.expected(table)
+
+    def test_mixed_date_only_and_offset_strings(self):
+        """The pandas fallback keeps values without offset naive, as parse_dates."""
+        for published in [
+            ["2024-06-01", "2024-06-01T10:00:00-03:00", "2024-12-31", "2025-01-01"],
+            ["2024-12-31T22:00:00-03:00", "2024-06-01", "2024-06-01T00:30:00-03:00"],
+        ]:
+            table = pa.table(
+                {
+                    "unique_id": [f"id{i}" for i in range(len(published))],
+                    "published_at": published,
+                    "extracted_at": published,
+                    "_row": list(range(len(published))),
+                }
+            )
+            fields = ["published_year", "published_month", "published_week"]
+            documents = prepare_arrow_documents(table)
+            expected = self.expected(table)
+
+            assert [[doc.get(field) for field in fields] for doc in documents] == [
+                [doc.get(field) for field in fields] for doc in expected
+            ]
+            assert documents == expected
+
+    def test_offsets_other_than_brasilia(self):
+        """'Z' and '+00:00' strings keep their own offset, as in parse_dates."""
+        published = [
+            "2025-01-01T01:00:00Z",
+            "2024-03-01T01:00:00+00:00",
+            "2024-12-30T02:00:00Z",
+        ]
+        for values in [published[:1], published[1:2], [published[0], published[2]]]:
+            table = pa.table(
+                {
+                    "unique_id": [f"id{i}" for i in range(len(values))],
+                    "published_at": values,
+                    "extracted_at": values,
+                    "_row": list(range(len(values))),
+                }
+            )
+            assert prepare_arrow_documents(table) == self.expected(table)
+
+        table = pa.table({"unique_id": ["a"], "published_at": published[1:2]})
+        document = prepare_arrow_documents(table)[0]
+        assert (document["published_year"], document["published_month"]) == (2024, 3)
+
+    def test_index_documents_accepts_arrow_tables(self):
+        """index_documents slices Arrow tables into batches without pandas."""
+        client = MagicMock()
+        collection = client.collections.__getitem__.return_value
+        collection.retrieve.return_value = {"num_documents": 0, "fields": []}
+        collection.documents.import_.side_effect = lambda payload, params: (
+            import_response([True] * (payload.count(b"\n") + 1))
+        )
+
+        stats = index_documents(client, iter([make_arrow_table()]), batch_size=3)
+
+        assert stats["total_indexed"] == 4
+        assert stats["batch_sizes"] == [3, 1]
+
+
+class TestIndexDocuments:
+    """Tests for index_documents with a mocked Typesense client."""
+
+    @staticmethod
+    def make_client(num_documents: int = 0) -> MagicMock:
+        client = MagicMock()
+        collection = client.collections.__getitem__.return_value
+        collection.retrieve.return_value = {
+            "num_documents": num_documents,
+            "fields": [],
+        }
+        collection.documents.import_.side_effect = lambda payload, params: (
+            import_response([True] * len(parse_payload(payload)))
+        )
+        return client
+
+    def test_accepts_iterator_of_dataframes(self):
+        """Chunks from an iterator are batched and imported lazily."""
+        df = make_dataframe()
+        chunks = iter([df.iloc[:3], df.iloc[3:]])
+        client = self.make_client()
+
+        stats = index_documents(client, chunks, batch_size=2)
+
+        import_ = client.collections.__getitem__.return_value.documents.import_
+        sizes = [len(parse_payload(call.args[0])) for call in import_.call_args_list]
+        assert sizes == [2, 1, 1]
+        assert stats["total_processed"] == 4
+        assert stats["total_indexed"] == 4
+        assert stats["errors"] == 0
+
+    def test_empty_iterator(self):
+        """An exhausted iterator indexes nothing."""
+        client = self.make_client()
+        stats = index_documents(client, iter([]))
+        assert stats["total_processed"] == 0
+
+    def test_process_pool_preparation(self):
+        """Worker processes produce the same payloads, in order when requested."""
+        df = pd.concat([make_dataframe()] * 5, ignore_index=True)
+        payloads = {}
+        for workers, ordered in [(1, True), (2, True), (2, False)]:
+            client = self.make_client()
+            stats = index_documents(
+                client, df, batch_size=3, workers=workers, ordered=ordered
+            )
+            import_ = client.collections.__getitem__.return_value.documents.import_
+            payloads[(workers, ordered)] = [
+                call.args[0] for call in import_.call_args_list
+            ]
+            assert stats["total_indexed"] == 20
+
+        assert payloads[(2, True)] == payloads[(1, True)]
+        assert sorted(payloads[(2, False)]) == sorted(payloads[(1, True)])
+
+    def test_concurrent_imports(self):
+        """Imports run on worker threads and stats account for every batch."""
+        df = pd.concat([make_dataframe()] * 5, ignore_index=True)
+        client = self.make_client()
+        threads = set()
+        in_flight = []
+        lock = threading.Lock()
+        active = 0
+
+        def import_(payload, params):
+            nonlocal active
+            docs = parse_payload(payload)
+            with lock:
+                active += 1
+                in_flight.append(active)
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            if docs[0]["id"] == "a1":
+                return import_response([True] + [False] * (len(docs) - 1))
+            return import_response([True] * len(docs))
+
+        import_mock = client.collections.__getitem__.return_value.documents.import_
+        import_mock.side_effect = import_
+
+        stats = index_documents(client, df, batch_size=3, concurrency=3)
+
+        assert import_mock.call_count == 7
+        assert stats["total_processed"] == 20
+        # Batches starting at rows 0 and 12 begin with "a1" and have 2 failures
+        assert stats["errors"] == 4
+        assert stats["total_indexed"] == 20 - 4
+        assert max(in_flight) <= 3
+        assert all(name != threading.main_thread().name for name in threads)
+
+    def test_payload_matches_prepared_documents(self):
+        """The JSONL payload carries exactly the prepared documents."""
+        df = make_dataframe()
+        client = self.make_client()
+
+        index_documents(client, df)
+
+        import_ = client.collections.__getitem__.return_value.documents.import_
+        payload, params = import_.call_args.args
+        assert isinstance(payload, bytes)
+        assert params == {"action": "upsert"}
+        assert parse_payload(payload) == prepare_documents(df)
+
+    def test_adaptive_batching_respects_byte_budget(self, monkeypatch):
+        """Adaptive batches are regrouped by bytes and reported in stats."""
+
+        class SmallSizer(indexer.AdaptiveBatchSizer):
+            def __init__(self, initial_docs):
+                super().__init__(initial_docs=initial_docs, target_bytes=300)
+
+        monkeypatch.setattr(indexer, "AdaptiveBatchSizer", SmallSizer)
+        df = pd.concat([make_dataframe()] * 5, ignore_index=True)
+        client = self.make_client()
+
+        stats = index_documents(client, df, batch_size=8, adaptive_batching=True)
+
+        import_ = client.collections.__getitem__.return_value.documents.import_
+        payloads = [call.args[0] for call in import_.call_args_list]
+        assert all(len(payload) <= 300 for payload in payloads)
+        assert stats["batch_sizes"] == [len(parse_payload(p)) for p in payloads]
+        assert sum(stats["batch_sizes"]) == 20
+        assert stats["total_indexed"] == 20
@@ -0,0 +1,63 @@
+"""
+Tests for typesense_dgb.jsonl
+
+Run with: python -m pytest tests/test_jsonl.py -v
+"""
+
+import json
+
+import pytest
+from typesense.exceptions import TypesenseClientError
+
+from typesense_dgb import jsonl
+from typesense_dgb.jsonl import dumps_jsonl, iter_import_failures
+
+DOCUMENTS = [
+    {"id": "1", "title": "Educação básica", "tags": ["saúde", "ensino"]},
+    {"id": "2", "published_at": 1704110400},
+]
+
+
+class TestDumpsJsonl:
+    """Tests for dumps_jsonl."""
+
+    def test_one_document_per_line(self):
+        """Each line decodes back to the original document."""
+        payload = dumps_jsonl(DOCUMENTS)
+        assert [json.loads(line) for line in payload.split(b"\n")] == DOCUMENTS
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Without orjson the payload is equivalent and UTF-8 encoded."""
+        monkeypatch.setattr(jsonl, "orjson", None)
+        payload = dumps_jsonl(DOCUMENTS)
+
+        assert "Educação".encode() in payload
+        assert [json.loads(line) for line in payload.split(b"\n")] == DOCUMENTS
+
+
+class TestIterImportFailures:
+    """Tests for iter_import_failures."""
+
+    def test_yields_only_failures_with_position(self):
+        """Success lines are skipped; failures keep their batch position."""
+        response = "\n".join(
+            [
+                '{"success":true}',
+                '{"success":false,"error":"Bad JSON.","document":"{}"}',
+                '{"success": true}',
+                '{"success":false,"error":"Field missing"}',
+            ]
+        )
+        failures = list(iter_import_failures(response))
+
+        assert [position for position, _ in failures] == [1, 3]
+        assert failures[1][1]["error"] == "Field missing"
+
+    def test_accepts_bytes(self):
+        """Raw bytes responses are decoded."""
+        assert list(iter_import_failures(b'{"success":true}')) == []
+
+    def test_invalid_line_raises(self):
+        """Malformed lines raise the typesense client error."""
+        with pytest.raises(TypesenseClientError):
+            list(iter_import_failures("not json"))
@@ -0,0 +1,93 @@
+"""
+Tests for typesense_dgb.metrics
+
+Run with: python -m pytest tests/test_metrics.py -v
+"""
+
+import json
+
+import pandas as pd
+
+from typesense_dgb.collection import create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.metrics import PipelineMetrics
+from typesense_dgb.retry import RetryPolicy
+
+
+def test_stages_accumulate_time_and_documents():
+    metrics = PipelineMetrics()
+
+    with metrics.stage("process", docs=10):
+        pass
+    with metrics.stage("process") as stage:
+        stage["docs"] = 5
+    metrics.record("prepare", 0.5, docs=100)
+
+    summary = metrics.summary()
+    assert summary["stages"]["process"]["calls"] == 2
+    assert summary["stages"]["process"]["docs"] == 15
+    assert summary["stages"]["prepare"]["docs_per_second"] == 200.0
+
+
+def test_stage_is_recorded_when_block_raises():
+    metrics = PipelineMetrics()
+
+    try:
+        with metrics.stage("download"):
+            raise RuntimeError("falhou")
+    except RuntimeError:
+        pass
+
+    assert metrics.summary()["stages"]["download"]["calls"] == 1
+
+
+def test_batch_latency_and_prometheus_output():
+    metrics = PipelineMetrics()
+    for latency in [0.1, 0.2, 0.3, 0.4]:
+        metrics.observe_batch(docs=10, num_bytes=1000, latency=latency, retries=1)
+
+    summary = metrics.summary()
+    assert summary["counters"]["bytes_sent"] == 4000
+    assert summary["counters"]["retries"] == 4
+    assert summary["batch_latency"]["p50"] == 0.3
+    assert summary["batch_latency"]["max"] == 0.4
+    assert summary["stages"]["import"]["docs"] == 40
+    assert json.loads(metrics.to_json())["counters"] == summary["counters"]
+
+    text = metrics.to_prometheus()
+    assert 'typesense_dgb_load_stage_documents{stage="import"} 40' in text
+    assert "typesense_dgb_load_bytes_sent_total 4000" in text
+    assert "typesense_dgb_load_batch_latency_seconds_count 4" in text
+    assert text.endswith("\n")
+
+
+def test_index_documents_records_stages():
+    df = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(25)],
+            "published_at_ts": [1704110400] * 25,
+            "title": ["Notícia"] * 25,
+        }
+    )
+    metrics = PipelineMetrics()
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        create_collection(client)
+        server.inject_failure(503, count=1, path="/documents/import")
+        index_documents(
+            client,
+            df,
+            batch_size=10,
+            retry_policy=RetryPolicy(base_delay=0),
+            metrics=metrics,
+        )
+
+    summary = metrics.summary()
+    assert {"prepare", "serialize", "import"} <= set(summary["stages"])
+    assert summary["stages"]["prepare"]["docs"] == 25
+    assert summary["counters"]["batches"] == 3
+    assert summary["counters"]["retries"] == 1
+    assert summary["counters"]["transport_failures"] == 1
+    assert summary["counters"]["bytes_sent"] > sum(server.import_batches)
@@ -0,0 +1,82 @@
+"""
+Tests for typesense_dgb.profiling
+
+Run with: python -m pytest tests/test_profiling.py -v
+"""
+
+import pandas as pd
+import pytest
+
+from typesense_dgb.collection import create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.metrics import PipelineMetrics
+from typesense_dgb.profiling import CpuProfiler, MemoryProfiler, create_profiler
+
+
+def make_dataframe(num_docs: int = 30) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(num_docs)],
+            "published_at_ts": [1704110400] * num_docs,
+            "title": ["Notícia " * 20] * num_docs,
+        }
+    )
+
+
+def run_load(metrics: PipelineMetrics) -> None:
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        create_collection(client)
+        index_documents(client, make_dataframe(), batch_size=10, metrics=metrics)
+
+
+def test_cpu_profile_reports_stages(tmp_path):
+    metrics = PipelineMetrics()
+    profiler = create_profiler("cpu", metrics, top=5)
+
+    profiler.start()
+    run_load(metrics)
+    profiler.stop()
+
+    assert isinstance(profiler, CpuProfiler)
+    assert {"prepare", "serialize", "import"} <= set(profiler.stage_seconds())
+    paths = profiler.dump(tmp_path)
+    assert [path.name for path in paths] == ["load_data.pstats", "load_data_cpu.txt"]
+    assert "prepare" in paths[1].read_text()
+
+
+def test_memory_profile_attributes_allocations_to_stages(tmp_path):
+    metrics = PipelineMetrics()
+    profiler = create_profiler("memory", metrics, top=3)
+
+    profiler.start()
+    with metrics.stage("process"):
+        data = [bytearray(1024) for _ in range(2000)]
+    run_load(metrics)
+    profiler.stop()
+
+    assert isinstance(profiler, MemoryProfiler)
+    assert profiler.stages["process"]["peak"] >= 2000 * 1024
+    assert profiler.stages["prepare"]["events"] == 3
+    assert "serialize" not in profiler.stages
+    top_line = max(profiler.stages["process"]["lines"].items(), key=lambda i: i[1][0])
+    assert "test_profiling.py" in top_line[0]
+    report = profiler.dump(tmp_path)[0].read_text()
+    assert report.startswith("Profile de memória por etapa:")
+    del data
+
+
+def test_memory_profile_ignores_stages_before_start():
+    metrics = PipelineMetrics()
+    profiler = MemoryProfiler(metrics)
+
+    with metrics.stage("process"):
+        pass
+
+    assert profiler.stages == {}
+
+
+def test_unknown_profile_kind():
+    with pytest.raises(ValueError):
+        create_profiler("gpu", PipelineMetrics())
@@ -0,0 +1,121 @@
+"""
+Tests for typesense_dgb.reload and the alias helpers in typesense_dgb.collection
+
+Run with: python -m pytest tests/test_reload.py -v
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb import reload as reload_module
+from typesense_dgb.collection import (
+    cleanup_collection_versions,
+    versioned_collection_name,
+)
+from typesense_dgb.reload import blue_green_reload
+
+
+def make_client(collections: list[str], alias_target: str | None) -> MagicMock:
+    """Cliente falso com coleções existentes e um alias 'news' opcional."""
+    client = MagicMock()
+    client.collections.retrieve.return_value = [{"name": n} for n in collections]
+    client.collections.__getitem__.return_value.retrieve.return_value = {
+        "num_documents": 100
+    }
+
+    def retrieve_alias():
+        if alias_target is None:
+            raise ObjectNotFound(404, "Not found")
+        return {"collection_name": alias_target}
+
+    client.aliases.__getitem__.return_value.retrieve.side_effect = retrieve_alias
+    return client
+
+
+@pytest.fixture
+def fake_indexing(monkeypatch):
+    """Substitui criação, indexação e validação da nova coleção."""
+    calls = {}
+    monkeypatch.setattr(reload_module, "create_collection", MagicMock())
+    monkeypatch.setattr(
+        reload_module,
+        "index_documents",
+        MagicMock(return_value={"total_indexed": 100, "errors": 0}),
+    )
+    validate = MagicMock(return_value=True)
+    monkeypatch.setattr(reload_module, "validate_collection", validate)
+    calls["validate"] = validate
+    return calls
+
+
+def test_versioned_collection_name():
+    assert (
+        versioned_collection_name("news", datetime(2024, 10, 23, 8, 5, 9))
+        == "news_20241023080509"
+    )
+
+
+def test_cleanup_keeps_current_target():
+    versions = ["news_20240101000000", "news_20240201000000", "news_20240301000000"]
+    client = make_client(versions + ["other"], alias_target="news_20240101000000")
+
+    removed = cleanup_collection_versions(client, "news", keep=1)
+
+    assert removed == ["news_20240201000000"]
+    client.collections.__getitem__.assert_called_with("news_20240201000000")
+
+
+def test_blue_green_swaps_alias_after_validation(fake_indexing):
+    client = make_client(["news_20240101000000"], alias_target="news_20240101000000")
+
+    stats = blue_green_reload(client, pd.DataFrame(), alias="news", keep_versions=2)
+
+    assert stats["swapped"] is True
+    assert stats["previous_collection"] == "news_20240101000000"
+    client.aliases.upsert.assert_called_once_with(
+        "news", {"collection_name": stats["collection_name"]}
+    )
+    # 90% dos 100 documentos servidos hoje
+    assert fake_indexing["validate"].call_args.args[2] == 90
+
+
+def test_blue_green_keeps_alias_when_validation_fails(fake_indexing):
+    fake_indexing["validate"].return_value = False
+    client = make_client(["news_20240101000000"], alias_target="news_20240101000000")
+
+    stats = blue_green_reload(client, pd.DataFrame(), alias="news")
+
+    assert stats["swapped"] is False
+    client.aliases.upsert.assert_not_called()
+    client.collections.__getitem__.assert_called_with(stats["collection_name"])
+    client.collections.__getitem__.return_value.delete.assert_called_once()
+
+
+def test_blue_green_removes_new_collection_when_import_fails(fake_indexing):
+    reload_module.index_documents.side_effect = RuntimeError("import falhou")
+    client = make_client(["news_20240101000000"], alias_target="news_20240101000000")
+
+    with pytest.raises(RuntimeError, match="import falhou"):
+        blue_green_reload(client, pd.DataFrame(), alias="news")
+
+    new_collection = reload_module.create_collection.call_args.args[1]
+    assert new_collection != "news_20240101000000"
+    client.aliases.upsert.assert_not_called()
+    client.collections.__getitem__.assert_called_with(new_collection)
+    client.collections.__getitem__.return_value.delete.assert_called_once()
+    fake_indexing["validate"].assert_not_called()
+
+
+def test_blue_green_replaces_legacy_collection(fake_indexing):
+    client = make_client(["news"], alias_target=None)
+
+    stats = blue_green_reload(client, pd.DataFrame(), alias="news", replace_legacy=True)
+
+    assert stats["swapped"] is True
+    assert stats["previous_collection"] is None
+    client.collections.__getitem__.assert_any_call("news")
+    client.collections.__getitem__.return_value.delete.assert_called_once()
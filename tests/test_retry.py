@@ -0,0 +1,234 @@
+"""
+Tests for typesense_dgb.retry and retries in index_documents
+
+Run with: python -m pytest tests/test_retry.py -v
+"""
+
+import asyncio
+import io
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from typesense.exceptions import ServiceUnavailable
+
+from typesense_dgb.indexer import index_documents, index_documents_async
+from typesense_dgb.retry import RetryPolicy, split_failures, write_dead_letters
+
+
+def make_client(import_side_effect) -> MagicMock:
+    client = MagicMock()
+    collection = client.collections.__getitem__.return_value
+    collection.retrieve.return_value = {"num_documents": 0, "fields": []}
+    collection.documents.import_.side_effect = import_side_effect
+    return client
+
+
+class FakeAsyncClient:
+    """Cliente assíncrono falso com o mesmo import_ de make_client."""
+
+    def __init__(self, import_side_effect) -> None:
+        self.import_side_effect = import_side_effect
+
+    async def retrieve_collection(self, name: str) -> dict:
+        return {"num_documents": 0, "fields": []}
+
+    async def import_documents_raw(self, name: str, payload: bytes, params: dict):
+        return self.import_side_effect(payload, params)
+
+
+def make_dataframe(size: int = 4) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(size)],
+            "published_at_ts": [1704110400] * size,
+        }
+    )
+
+
+def ids_in(payload: bytes) -> list[str]:
+    return [json.loads(line)["id"] for line in payload.split(b"\n")]
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy and helpers."""
+
+    def test_backoff_is_bounded_by_exponential_ceiling(self):
+        """Jittered delay never exceeds base * 2^(n-1) nor max_delay."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt in range(1, 8):
+            ceiling = min(5.0, 2 ** (attempt - 1))
+            assert all(0 <= policy.backoff(attempt) <= ceiling for _ in range(20))
+
+    def test_is_retryable(self):
+        """Server-side and rate-limit codes are transient; 4xx are permanent."""
+        assert not RetryPolicy.is_retryable({"success": False})
+        assert not RetryPolicy.is_retryable({"success": False, "code": "x"})
+        assert RetryPolicy.is_retryable({"success": False, "code": 503})
+        assert RetryPolicy.is_retryable({"success": False, "code": 429})
+        assert not RetryPolicy.is_retryable({"success": False, "code": 400})
+
+    def test_split_failures(self):
+        """Failed positions map back to their payload lines."""
+        payload = b'{"id":"a"}\n{"id":"b"}\n{"id":"c"}'
+        retryable, permanent = split_failures(
+            payload, [(0, {"code": 503}), (2, {"code": 400})]
+        )
+        assert retryable == [(b'{"id":"a"}', {"code": 503})]
+        assert permanent == [(b'{"id":"c"}', {"code": 400})]
+
+    def test_write_dead_letters(self):
+        """Each rejected document is written with its error."""
+        output = io.StringIO()
+        write_dead_letters(output, [(b'{"id":"a"}', {"error": "x", "code": 400})])
+        assert json.loads(output.getvalue()) == {
+            "error": "x",
+            "code": 400,
+            "document": {"id": "a"},
+        }
+
+
+class TestIndexDocumentsRetry:
+    """Tests for retries and dead letters in index_documents."""
+
+    def test_transport_error_retries_whole_batch(self):
+        """A 503 on the first attempt resends the same payload."""
+        calls = []
+
+        def import_(payload, params):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise ServiceUnavailable(503, "Not Ready")
+            return "\n".join('{"success":true}' for _ in ids_in(payload))
+
+        client = make_client(import_)
+        stats = index_documents(
+            client, make_dataframe(), retry_policy=RetryPolicy(base_delay=0)
+        )
+
+        assert len(calls) == 2
+        assert calls[0] == calls[1]
+        assert stats["retries"] == 1
+        assert stats["total_indexed"] == 4
+
+    def test_transport_error_without_policy_aborts(self):
+        """Without a retry policy the error propagates as before."""
+        client = make_client(ServiceUnavailable(503, "Not Ready"))
+        with pytest.raises(ServiceUnavailable):
+            index_documents(client, make_dataframe())
+
+    def test_other_errors_are_raised_without_retry(self):
+        """Only transport errors are retried; anything else propagates."""
+        client = make_client(ValueError("bug"))
+        with pytest.raises(ValueError, match="bug"):
+            index_documents(
+                client, make_dataframe(), retry_policy=RetryPolicy(base_delay=0)
+            )
+        import_ = client.collections.__getitem__.return_value.documents.import_
+        assert import_.call_count == 1
+
+    def test_lines_without_code_are_not_retried(self):
+        """Failures without a numeric code go straight to the errors."""
+        calls = []
+
+        def import_(payload, params):
+            calls.append(payload)
+            return "\n".join('{"success":false}' for _ in ids_in(payload))
+
+        stats = index_documents(
+            make_client(import_),
+            make_dataframe(2),
+            retry_policy=RetryPolicy(base_delay=0),
+        )
+
+        assert len(calls) == 1
+        assert (stats["retries"], stats["errors"]) == (0, 2)
+
+    def test_partial_failure_resubmits_only_failed_lines(self, tmp_path):
+        """Transient lines are resent; permanent rejects go to the dead letter."""
+        calls = []
+
+        def import_(payload, params):
+            calls.append(ids_in(payload))
+            results = []
+            for doc_id in ids_in(payload):
+                if doc_id == "id1" and len(calls) == 1:
+                    results.append('{"success":false,"code":503,"error":"busy"}')
+                elif doc_id == "id2":
+                    results.append('{"success":false,"code":400,"error":"schema"}')
+                else:
+                    results.append('{"success":true}')
+            return "\n".join(results)
+
+        dead_letter = tmp_path / "rejected.jsonl"
+        client = make_client(import_)
+        stats = index_documents(
+            client,
+            make_dataframe(),
+            retry_policy=RetryPolicy(base_delay=0),
+            dead_letter_path=str(dead_letter),
+        )
+
+        assert calls == [["id0", "id1", "id2", "id3"], ["id1"]]
+        assert stats["total_indexed"] == 3
+        assert stats["errors"] == 1
+        assert stats["dead_lettered"] == 1
+        rejected = [json.loads(line) for line in dead_letter.read_text().splitlines()]
+        assert [record["document"]["id"] for record in rejected] == ["id2"]
+
+    def test_retries_are_bounded(self):
+        """Lines still failing after max_retries are counted as errors."""
+        calls = []
+
+        def import_(payload, params):
+            calls.append(payload)
+            return "\n".join('{"success":false,"code":503}' for _ in ids_in(payload))
+
+        client = make_client(import_)
+        stats = index_documents(
+            client,
+            make_dataframe(2),
+            retry_policy=RetryPolicy(max_retries=2, base_delay=0),
+        )
+
+        assert len(calls) == 3
+        assert stats["retries"] == 2
+        assert stats["errors"] == 2
+        assert stats["total_indexed"] == 0
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_sync_and_async_share_retry_decisions(self, use_async):
+        """Transport errors, transient lines and exhaustion behave the same."""
+        calls = []
+
+        def import_(payload, params):
+            calls.append(ids_in(payload))
+            if len(calls) == 1:
+                raise ServiceUnavailable(503, "Not Ready")
+            return "\n".join(
+                (
+                    '{"success":false,"code":503}'
+                    if doc_id == "id1"
+                    else '{"success":true}'
+                )
+                for doc_id in ids_in(payload)
+            )
+
+        policy = RetryPolicy(max_retries=3, base_delay=0)
+        if use_async:
+            stats = asyncio.run(
+                index_documents_async(
+                    FakeAsyncClient(import_), make_dataframe(), retry_policy=policy
+                )
+            )
+        else:
+            stats = index_documents(
+                make_client(import_), make_dataframe(), retry_policy=policy
+            )
+
+        all_ids = ["id0", "id1", "id2", "id3"]
+        assert calls == [all_ids, all_ids, ["id1"], ["id1"]]
+        assert stats["retries"] == 3
+        assert stats["errors"] == 1
+        assert stats["total_indexed"] == 3
@@ -0,0 +1,222 @@
+"""
+Tests for typesense_dgb.search
+
+Run with: python -m pytest tests/test_search.py -v
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from typesense.exceptions import (
+    ObjectNotFound,
+    ServiceUnavailable,
+    TypesenseClientError,
+)
+
+from typesense_dgb.collection import COLLECTION_NAME, create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.search import (
+    CachedSearchClient,
+    MultiSearchExecutor,
+    SearchCache,
+    cache_key,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(search=None) -> MagicMock:
+    client = MagicMock()
+    documents = client.collections.__getitem__.return_value.documents
+    documents.search.side_effect = search or (lambda params: {"found": 1})
+    return client
+
+
+def search_calls(client: MagicMock) -> int:
+    return client.collections.__getitem__.return_value.documents.search.call_count
+
+
+def test_cache_key_normalizes_params():
+    key = cache_key("news", {"q": "  Saúde  Pública", "per_page": 10, "page": None})
+
+    assert key == cache_key("news", {"per_page": "10", "q": "saúde pública"})
+    assert cache_key("news", {"facet_by": "agency, category"}) == cache_key(
+        "news", {"facet_by": ["agency", "category"]}
+    )
+    assert cache_key("news", {"query_by": "title,content"}) != cache_key(
+        "news", {"query_by": "content,title"}
+    )
+    assert key != cache_key("other", {"q": "saúde pública", "per_page": 10})
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = SearchCache(max_entries=2, ttl=10, clock=clock)
+    cache.put(("news", (("q", "a"),)), "a")
+    cache.put(("news", (("q", "b"),)), "b")
+
+    assert cache.get(("news", (("q", "a"),))) == "a"
+    cache.put(("news", (("q", "c"),)), "c")
+    assert cache.get(("news", (("q", "b"),))) is None
+    assert cache.evictions == 1
+
+    clock.now = 10
+    assert cache.get(("news", (("q", "a"),))) is None
+    assert len(cache) == 1
+
+
+def test_repeated_searches_hit_the_cache():
+    client = make_client()
+    search = CachedSearchClient(client, clock=FakeClock())
+
+    first = search.search({"q": "*", "facet_by": "agency"})
+    second = search.search({"facet_by": "agency", "q": "*"})
+
+    assert first is second
+    assert search_calls(client) == 1
+    assert search.stats == {"hits": 1, "misses": 1}
+
+
+def test_identical_concurrent_searches_are_coalesced():
+    release = threading.Event()
+
+    def slow_search(params):
+        release.wait(timeout=5)
+        return {"found": 3}
+
+    client = make_client(slow_search)
+    search = CachedSearchClient(client)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(search.search({"q": "saúde"})))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while search.stats["coalesced"] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert search_calls(client) == 1
+    assert results == [{"found": 3}] * 5
+
+
+def test_errors_are_shared_but_not_cached():
+    calls = []
+
+    def failing_search(params):
+        calls.append(params)
+        if len(calls) == 1:
+            raise RuntimeError("timeout")
+        return {"found": 0}
+
+    search = CachedSearchClient(make_client(failing_search))
+
+    with pytest.raises(RuntimeError):
+        search.search({"q": "*"})
+    assert search.search({"q": "*"}) == {"found": 0}
+
+
+def test_index_documents_invalidates_caches():
+    df = pd.DataFrame({"unique_id": ["a"], "published_at_ts": [1704110400]})
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        create_collection(client)
+        search = CachedSearchClient(client, collection_name=COLLECTION_NAME)
+        assert search.search({"q": "*"})["found"] == 0
+
+        index_documents(client, df)
+
+        assert len(search.cache) == 0
+        assert search.search({"q": "*"})["found"] == 1
+
+
+def index_agencies(client, agencies: list[str]) -> None:
+    create_collection(client)
+    df = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(len(agencies))],
+            "published_at_ts": [1704110400] * len(agencies),
+            "agency": agencies,
+        }
+    )
+    index_documents(client, df)
+
+
+def test_multi_search_executor_batches_and_maps_results():
+    agencies = [f"orgao{i}" for i in range(12)]
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        index_agencies(client, agencies[::2])
+        server.requests.clear()
+
+        with MultiSearchExecutor(client, max_per_request=5, concurrency=2) as executor:
+            futures = {
+                agency: executor.submit(
+                    {"q": "*", "filter_by": f"agency:={agency}", "per_page": 0}
+                )
+                for agency in agencies
+            }
+
+        assert server.requests == {"POST /multi_search": 3}
+        assert executor.requests == 3
+        assert {agency: f.result()["found"] for agency, f in futures.items()} == {
+            agency: 1 - i % 2 for i, agency in enumerate(agencies)
+        }
+
+
+def test_multi_search_executor_errors_are_per_search():
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        index_agencies(client, ["saude"])
+        executor = MultiSearchExecutor(client)
+
+        results = executor.execute(
+            [{"q": "*"}, {"q": "*", "collection": "missing"}], return_exceptions=True
+        )
+
+        assert results[0]["found"] == 1
+        assert isinstance(results[1], ObjectNotFound)
+        with pytest.raises(ObjectNotFound):
+            executor.execute([{"q": "*", "collection": "missing"}])
+
+
+def test_multi_search_executor_request_failure_fails_its_batch():
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        index_agencies(client, ["saude"])
+        server.inject_failure(503, count=1, path="/multi_search")
+
+        results = MultiSearchExecutor(client, max_per_request=2, concurrency=1).execute(
+            [{"q": "*"}] * 3, return_exceptions=True
+        )
+
+        assert sum(isinstance(result, ServiceUnavailable) for result in results) == 2
+        assert sum(isinstance(result, dict) for result in results) == 1
+
+
+def test_multi_search_executor_short_response_fails_missing_searches():
+    client = MagicMock()
+    client.multi_search.perform.return_value = {"results": [{"found": 1}]}
+
+    with MultiSearchExecutor(client) as executor:
+        futures = [executor.submit({"q": "*"}) for _ in range(3)]
+
+    assert all(future.done() for future in futures)
+    assert futures[0].result() == {"found": 1}
+    for future in futures[1:]:
+        with pytest.raises(TypesenseClientError, match="1 respostas para 3 buscas"):
+            future.result(timeout=0)
@@ -0,0 +1,133 @@
+"""
+Tests for typesense_dgb.stats
+
+Run with: python -m pytest tests/test_stats.py -v
+"""
+
+import pandas as pd
+from datasets import Dataset
+
+from typesense_dgb import dataset as dataset_module
+from typesense_dgb.collection import create_collection
+from typesense_dgb.dataset import download_and_process_dataset
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.stats import (
+    TOTAL_FIELD,
+    NewsStats,
+    collection_stats,
+    get_stats,
+    read_stats_json,
+    write_stats,
+    write_stats_json,
+)
+
+
+def make_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "unique_id": ["a", "b", "c", "d"],
+            "published_at_ts": [1704110400, 1704110400, 1717200000, 1717200000],
+            "agency": ["saude", "saude", "mec", None],
+            "published_year": [2024.0, 2024.0, 2024.0, None],
+            "published_month": [1, 1, 6, 6],
+            "published_week": [202401, 202401, 202422, 202422],
+        }
+    )
+
+
+def test_counts_match_facet_values():
+    stats = NewsStats()
+    df = make_df()
+    stats.add(df.iloc[:2])
+    stats.add(df.iloc[2:])
+
+    assert stats.documents == 4
+    assert stats.top("agency") == {"saude": 2, "mec": 1}
+    assert stats.top("published_year") == {"2024": 3}
+    assert stats.top("published_week", limit=1) == {"202401": 2}
+
+
+def test_write_and_read_snapshot():
+    stats = NewsStats()
+    stats.add(make_df())
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        write_stats(client, stats)
+        assert get_stats(client, "agency") == {"saude": 2, "mec": 1}
+        assert get_stats(client, "agency", limit=1) == {"saude": 2}
+        assert get_stats(client, TOTAL_FIELD) == {"total": 4}
+
+        # Valores que saem do snapshot são removidos na gravação seguinte
+        newer = NewsStats()
+        newer.add(make_df().iloc[2:])
+        write_stats(client, newer)
+        assert get_stats(client, "agency") == {"mec": 1}
+        assert get_stats(client, TOTAL_FIELD) == {"total": 2}
+
+
+def test_collection_stats_match_pipeline_stats():
+    dirty = pd.DataFrame(
+        {
+            "unique_id": ["e", "f", "g"],
+            "published_at_ts": [1717200000] * 3,
+            "agency": ["  saude ", "", "   "],
+            "category": [" Notícias", "", None],
+            "published_year": [2024, 0, -1],
+            "published_month": [0, 6, None],
+            "published_week": [202422, 0, 202422],
+        }
+    )
+    df = pd.concat([make_df(), dirty], ignore_index=True)
+    stats = NewsStats()
+    stats.add(df)
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        create_collection(client)
+        index_documents(client, df)
+        from_collection = collection_stats(client)
+
+    assert server.requests["POST /multi_search"] == 1
+    assert from_collection.documents == stats.documents
+    assert stats.top("agency") == {"saude": 3, "mec": 1}
+    assert stats.top("published_year") == {"2024": 4}
+    for field in [
+        "agency",
+        "category",
+        "published_year",
+        "published_month",
+        "published_week",
+    ]:
+        assert from_collection.top(field) == stats.top(field)
+
+
+def test_json_round_trip(tmp_path):
+    stats = NewsStats()
+    stats.add(make_df())
+    write_stats_json(stats, tmp_path / "news_stats.json")
+
+    loaded = read_stats_json(tmp_path / "news_stats.json")
+    assert loaded.to_dict() == stats.to_dict()
+
+
+def test_pipeline_counts_streamed_chunks(monkeypatch):
+    records = {
+        "unique_id": [f"id{i}" for i in range(5)],
+        "published_at": ["2024-01-02T10:00:00-03:00"] * 3
+        + ["2024-06-03T10:00:00-03:00"] * 2,
+        "extracted_at": ["2024-06-03 10:00:00"] * 5,
+        "agency": ["saude", "mec", "saude", "saude", "mec"],
+    }
+    dataset = Dataset.from_dict(records)
+    monkeypatch.setattr(dataset_module, "load_dataset", lambda *args, **kwargs: dataset)
+    stats = NewsStats()
+
+    chunks = download_and_process_dataset(stream=True, chunk_size=2, stats=stats)
+    assert stats.documents == 0
+    list(chunks)
+
+    assert stats.documents == 5
+    assert stats.top("agency") == {"saude": 3, "mec": 2}
+    assert stats.top("published_month") == {"1": 3, "6": 2}
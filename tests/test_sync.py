@@ -0,0 +1,181 @@
+"""
+Tests for typesense_dgb.sync
+
+Run with: python -m pytest tests/test_sync.py -v
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from typesense_dgb import indexer as indexer_module
+from typesense_dgb import sync as sync_module
+from typesense_dgb.collection import create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.sync import SyncManifest, sync_documents
+
+
+def make_client(num_documents: int = 10) -> MagicMock:
+    client = MagicMock()
+    collection = client.collections.__getitem__.return_value
+    collection.retrieve.return_value = {"num_documents": num_documents, "fields": []}
+    collection.documents.import_.side_effect = lambda payload, params: "\n".join(
+        '{"success":true}' for _ in payload.split(b"\n")
+    )
+    collection.documents.delete.return_value = {"num_deleted": 1}
+    return client
+
+
+def make_dataframe(titles: dict[str, str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "unique_id": list(titles),
+            "title": list(titles.values()),
+            "published_at_ts": [1704110400] * len(titles),
+        }
+    )
+
+
+def imported_ids(client: MagicMock) -> list[str]:
+    import_ = client.collections.__getitem__.return_value.documents.import_
+    return [
+        json.loads(line)["id"]
+        for call in import_.call_args_list
+        for line in call.args[0].split(b"\n")
+    ]
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "manifest.sqlite")
+
+
+def test_first_sync_sends_everything(manifest_path):
+    client = make_client()
+
+    stats = sync_documents(
+        client, make_dataframe({"a": "A", "b": "B"}), manifest_path=manifest_path
+    )
+
+    assert sorted(imported_ids(client)) == ["a", "b"]
+    assert stats["changed"] == 2
+    with SyncManifest(manifest_path) as manifest:
+        assert len(manifest) == 2
+
+
+def test_second_sync_sends_only_delta(manifest_path):
+    sync_documents(
+        make_client(),
+        make_dataframe({"a": "A", "b": "B", "c": "C"}),
+        manifest_path=manifest_path,
+    )
+    client = make_client()
+
+    stats = sync_documents(
+        client,
+        make_dataframe({"a": "A", "b": "B corrigido", "d": "D"}),
+        manifest_path=manifest_path,
+        max_delete_ratio=1.0,
+    )
+
+    assert sorted(imported_ids(client)) == ["b", "d"]
+    assert (stats["changed"], stats["unchanged"], stats["deleted"]) == (2, 1, 1)
+    delete = client.collections.__getitem__.return_value.documents.delete
+    delete.assert_called_once_with({"filter_by": "id:[`c`]"})
+
+
+def test_deletes_skipped_above_ratio(manifest_path):
+    sync_documents(
+        make_client(), make_dataframe({"a": "A", "b": "B"}), manifest_path=manifest_path
+    )
+    client = make_client()
+
+    stats = sync_documents(
+        client, make_dataframe({"a": "A"}), manifest_path=manifest_path
+    )
+
+    assert stats["deleted"] == 0
+    client.collections.__getitem__.return_value.documents.delete.assert_not_called()
+    with SyncManifest(manifest_path) as manifest:
+        assert "b" in manifest.fingerprints()
+
+
+def test_rejected_documents_are_resent(manifest_path):
+    client = make_client()
+    client.collections.__getitem__.return_value.documents.import_.side_effect = (
+        lambda payload, params: '{"success":true}\n'
+        '{"success":false,"error":"bad","code":400}'
+    )
+
+    sync_documents(
+        client, make_dataframe({"a": "A", "b": "B"}), manifest_path=manifest_path
+    )
+
+    with SyncManifest(manifest_path) as manifest:
+        assert list(manifest.fingerprints()) == ["a"]
+
+
+def test_empty_collection_resets_manifest(manifest_path):
+    data = make_dataframe({"a": "A"})
+    sync_documents(make_client(), data, manifest_path=manifest_path)
+    client = make_client(num_documents=0)
+
+    sync_documents(client, data, manifest_path=manifest_path)
+
+    assert imported_ids(client) == ["a"]
+
+
+def test_changed_documents_are_prepared_once(manifest_path, monkeypatch):
+    prepare = MagicMock(wraps=indexer_module.prepare_documents)
+    monkeypatch.setattr(indexer_module, "prepare_documents", prepare)
+    client = make_client()
+
+    sync_documents(
+        client, make_dataframe({"a": "A", "b": "B"}), manifest_path=manifest_path
+    )
+
+    assert sorted(imported_ids(client)) == ["a", "b"]
+    prepare.assert_not_called()
+
+
+def test_fallback_keeps_generated_ids(manifest_path, monkeypatch):
+    data = make_dataframe({"a": "A", "b": "B"})
+    data.loc[1, "unique_id"] = None
+    sync_documents(make_client(), data, manifest_path=manifest_path)
+    with SyncManifest(manifest_path) as manifest:
+        assert sorted(manifest.fingerprints()) == ["a", "doc_1"]
+
+    def broken_prepare(batch):
+        raise ValueError("sem fingerprint")
+
+    monkeypatch.setattr(sync_module, "prepare_documents", broken_prepare)
+    client = make_client()
+
+    stats = sync_documents(
+        client, data, manifest_path=manifest_path, max_delete_ratio=1.0
+    )
+
+    assert sorted(imported_ids(client)) == ["a", "doc_1"]
+    assert stats["deleted"] == 0
+    client.collections.__getitem__.return_value.documents.delete.assert_not_called()
+
+
+def test_ids_with_backticks_are_deleted_exactly(manifest_path):
+    titles = {"keep": "K", "a": "A", "x`,`y": "X", "x": "X", "y": "Y"}
+
+    with FakeTypesenseServer() as server:
+        client = server.client()
+        create_collection(client)
+        sync_documents(client, make_dataframe(titles), manifest_path=manifest_path)
+
+        stats = sync_documents(
+            client,
+            make_dataframe({"keep": "K", "x": "X", "y": "Y"}),
+            manifest_path=manifest_path,
+            max_delete_ratio=1.0,
+        )
+
+        assert stats["deleted"] == 2
+        assert sorted(server.collections["news"].documents) == ["keep", "x", "y"]
@@ -0,0 +1,126 @@
+"""
+Tests for typesense_dgb.temporal
+
+Run with: python -m pytest tests/test_temporal.py -v
+"""
+
+import pytest
+from typesense.exceptions import RequestMalformed
+
+from benchmarks.synthetic import generate_raw_dataframe
+from typesense_dgb.collection import COLLECTION_SCHEMA, create_collection
+from typesense_dgb.fake_server import FakeTypesenseServer
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.temporal import (
+    build_filter,
+    month_range,
+    monthly_counts,
+    week_range,
+    weekly_counts,
+    yearly_counts,
+)
+from typesense_dgb.utils import add_derived_columns, parse_dates
+
+SEARCH = "GET /collections/{name}/documents/search"
+MULTI_SEARCH = "POST /multi_search"
+
+
+@pytest.fixture(scope="module")
+def processed():
+    raw = generate_raw_dataframe(300, seed=2, content_words=10, mixed_date_rate=0)
+    return add_derived_columns(parse_dates(raw))
+
+
+def load(processed, schema=None):
+    server = FakeTypesenseServer().start()
+    client = server.client()
+    create_collection(client, schema=schema)
+    index_documents(client, processed)
+    server.requests.clear()
+    return server, client
+
+
+def expected_counts(processed, column, keys, agency=None):
+    df = processed if agency is None else processed[processed["agency"] == agency]
+    counts = df[column].value_counts()
+    return {key: int(counts.get(key, 0)) for key in keys}
+
+
+def test_week_and_month_ranges():
+    assert week_range(202451, 202502) == [202451, 202452, 202501, 202502]
+    assert week_range(202052, 202101) == [202052, 202053, 202101]
+    assert month_range(202411, 202502) == [202411, 202412, 202501, 202502]
+    with pytest.raises(ValueError):
+        week_range(202410, 202401)
+    with pytest.raises(ValueError):
+        month_range(202413, 202501)
+
+
+def test_build_filter():
+    assert build_filter({"agency": "mec", "published_year": [2024, 2025]}) == (
+        "agency:=`mec` && published_year:[2024,2025]"
+    )
+    assert build_filter("agency:=mec", "published_week:>202401") == (
+        "agency:=mec && published_week:>202401"
+    )
+    assert build_filter(None) == ""
+
+
+def test_weekly_counts_use_one_faceted_search(processed):
+    server, client = load(processed)
+    try:
+        counts = weekly_counts(client, None, 202401, 202452, {"agency": "mec"})
+    finally:
+        server.stop()
+
+    assert list(counts) == week_range(202401, 202452)
+    assert counts == expected_counts(processed, "published_week", counts, "mec")
+    assert sum(counts.values()) > 0
+    assert server.requests == {SEARCH: 1}
+
+
+def test_weekly_counts_fall_back_to_range_queries(processed):
+    schema = {
+        **COLLECTION_SCHEMA,
+        "fields": [
+            field
+            for field in COLLECTION_SCHEMA["fields"]
+            if field["name"] != "published_week"
+        ],
+    }
+    server, client = load(processed, schema)
+    try:
+        counts = weekly_counts(client, "*", 202340, 202452)
+    finally:
+        server.stop()
+
+    assert len(counts) == 65
+    assert counts == expected_counts(processed, "published_week", counts)
+    assert server.requests == {SEARCH: 1, MULTI_SEARCH: 2}
+
+
+def test_weekly_counts_do_not_fall_back_on_bad_filters(processed):
+    server, client = load(processed)
+    try:
+        with pytest.raises(RequestMalformed):
+            weekly_counts(client, "*", 202401, 202452, "agency saude")
+    finally:
+        server.stop()
+
+    assert server.requests == {SEARCH: 1}
+
+
+def test_monthly_and_yearly_counts(processed):
+    server, client = load(processed)
+    try:
+        months = monthly_counts(client, None, 202306, 202503)
+        years = yearly_counts(client, "*", 2019, 2026)
+    finally:
+        server.stop()
+
+    year_month = processed["published_year"] * 100 + processed["published_month"]
+    expected_months = year_month.value_counts()
+    assert months == {m: int(expected_months.get(m, 0)) for m in months}
+    assert len(months) == 22
+    assert years == expected_counts(processed, "published_year", range(2019, 2027))
+    assert server.requests == {MULTI_SEARCH: 1, SEARCH: 1}
@@ -0,0 +1,119 @@
+"""
+Tests for typesense_dgb.utils
+
+Run with: python -m pytest tests/test_utils.py -v
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from typesense_dgb.utils import (
+    calculate_published_week,
+    calculate_published_week_series,
+    datetime_to_timestamp_series,
+)
+
+
+def timestamp_per_row(values: pd.Series) -> pd.Series:
+    """Reference per-row conversion previously used by the dataset pipeline."""
+    return values.apply(lambda x: int(x.timestamp()) if pd.notna(x) else 0)
+
+
+class TestCalculatePublishedWeekSeries:
+    """Tests for the vectorized calculate_published_week_series."""
+
+    def test_matches_scalar_function(self):
+        """Every value must match the scalar function, day by day."""
+        start = int(datetime(2018, 12, 20, tzinfo=timezone.utc).timestamp())
+        # Passo de 7h para cobrir todos os dias e horários ao longo de 8 anos
+        timestamps = pd.Series(np.arange(start, start + 8 * 366 * 86400, 7 * 3600))
+
+        result = calculate_published_week_series(timestamps)
+        expected = timestamps.apply(calculate_published_week)
+
+        assert result.tolist() == expected.tolist()
+
+    def test_iso_year_rollover(self):
+        """Dec 30-31 2024 belong to week 1 of 2025."""
+        timestamps = pd.Series(
+            [
+                int(datetime(2024, 12, 29, tzinfo=timezone.utc).timestamp()),
+                int(datetime(2024, 12, 30, tzinfo=timezone.utc).timestamp()),
+                int(datetime(2024, 12, 31, tzinfo=timezone.utc).timestamp()),
+            ]
+        )
+        result = calculate_published_week_series(timestamps)
+        assert result.tolist() == [202452, 202501, 202501]
+
+    def test_invalid_values_are_null(self):
+        """NaN, None, zero and negative timestamps become null."""
+        timestamps = pd.Series([0, -1, np.nan, None, 1729641600.5])
+        result = calculate_published_week_series(timestamps)
+
+        assert str(result.dtype) == "Int64"
+        assert result.isna().tolist() == [True, True, True, True, False]
+        assert result.iloc[4] == calculate_published_week(1729641600.5)
+
+    def test_preserves_index(self):
+        """Index and name of the input Series are kept."""
+        timestamps = pd.Series([1704110400, 0], index=[7, 9], name="ts")
+        result = calculate_published_week_series(timestamps)
+
+        assert result.index.tolist() == [7, 9]
+        assert result.name == "ts"
+
+    def test_numpy_array_input(self):
+        """Plain NumPy arrays are accepted."""
+        result = calculate_published_week_series(np.array([1704110400, 1729641600]))
+        assert result.tolist() == [202401, 202443]
+
+
+class TestDatetimeToTimestampSeries:
+    """Regression tests for the vectorized timestamp conversion."""
+
+    def test_mixed_naive_and_aware_values(self):
+        """Mixed date-only, naive and tz-aware values match the per-row path."""
+        values = pd.Series(
+            [
+                pd.Timestamp("2024-01-15"),
+                pd.Timestamp("2024-01-15 10:30:00"),
+                pd.Timestamp("2024-01-15 10:30:00", tz="America/Sao_Paulo"),
+                datetime(2025, 3, 1, 12, tzinfo=timezone.utc),
+                pd.Timestamp("2023-12-31 23:59:59.900", tz="UTC"),
+                pd.NaT,
+                None,
+            ],
+            dtype=object,
+        )
+
+        result = datetime_to_timestamp_series(values)
+
+        assert result.tolist() == timestamp_per_row(values).tolist()
+        assert result.iloc[-1] == 0
+        assert result.iloc[-2] == 0
+
+    def test_parsed_string_columns(self):
+        """Columns parsed with pd.to_datetime keep the same semantics."""
+        raw_columns = [
+            ["2024-01-15", "2024-02-29", None, "not a date"],
+            ["2024-01-15T10:30:00-03:00", "2024-06-01T00:00:00-03:00", None],
+            [date(2024, 1, 15), date(2024, 12, 31), None],
+        ]
+
+        for raw in raw_columns:
+            values = pd.to_datetime(pd.Series(raw), errors="coerce")
+            result = datetime_to_timestamp_series(values)
+            assert result.tolist() == timestamp_per_row(values).tolist(), raw
+
+    def test_preserves_index_and_dtype(self):
+        """Output is int64 and aligned with the input index."""
+        values = pd.Series(
+            pd.to_datetime(["2024-01-01", None]), index=[3, 5], name="published_at"
+        )
+        result = datetime_to_timestamp_series(values)
+
+        assert result.dtype == np.int64
+        assert result.index.tolist() == [3, 5]
+        assert result.tolist() == [1704067200, 0]